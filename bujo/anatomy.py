@@ -0,0 +1,36 @@
+import argparse
+from typing import List
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from src.diagnostics.pdf_anatomy import main as anatomy_main
+from src.infrastructure.pdf_adapter import FPDFAdapter
+
+
+def page_kinds(target_year: int = 2026, total_weeks: int = 53) -> List[str]:
+    """`kind.method` of every journal page, from the page plan (nothing drawn)."""
+    pdf = FPDFAdapter(format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT))
+    calendar_model = journal.calendar_for(target_year, total_weeks)
+    journal_map = NavigationSpine(pdf).initialize_links(calendar_model)
+    jobs = journal.plan_pages(
+        calendar_model, journal_map, journal.grid_input_from_config()
+    )
+    return [f"{job.kind}.{job.method}" for job in jobs]
+
+
+def _add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--weeks", type=int, default=53)
+
+
+def main(argv=None):
+    anatomy_main(
+        argv,
+        default_path=journal.OUTPUT_PATH,
+        page_kinds=lambda args: page_kinds(args.year, args.weeks),
+        add_arguments=_add_arguments,
+    )
+
+
+if __name__ == "__main__":
+    main()
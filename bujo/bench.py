@@ -0,0 +1,104 @@
+import os
+from typing import Any, Callable
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from src.diagnostics.microbench import BenchSink, Cases, bench_main
+from src.infrastructure.pdf_adapter import FPDFAdapter
+from src.workers.grid_worker import GridCalculator
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+
+
+def _document() -> FPDFAdapter:
+    pdf = FPDFAdapter(
+        format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT),
+        compress_level=config.COMPRESSION_LEVEL,
+        output_threads=config.OUTPUT_THREADS,
+    )
+    journal.load_fonts(pdf)
+    return pdf
+
+
+def grid_calculate(align_mode: str):
+    def prepare(sink: BenchSink) -> Callable[[], Any]:
+        grid_input = journal.grid_input_from_config().model_copy(
+            update={"align_mode": align_mode}
+        )
+        calculator = GridCalculator()
+        return lambda: calculator.calculate(grid_input)
+
+    return prepare
+
+
+def spine(sink: BenchSink) -> Callable[[], Any]:
+    calendar_model = journal.calendar_for(2026, 53)
+    pdf = _document()
+    return lambda: NavigationSpine(pdf).initialize_links(calendar_model)
+
+
+def page(kind: str, method: str):
+    """
+    One page of the given layout per call, drawn into a planned journal
+    after a warm-up page: the steady-state cost inside a build.
+    """
+
+    def prepare(sink: BenchSink) -> Callable[[], Any]:
+        pdf = _document()
+        calendar_model = journal.calendar_for(2026, 53)
+        journal_map = NavigationSpine(pdf).initialize_links(calendar_model)
+        jobs = journal.plan_pages(
+            calendar_model, journal_map, journal.grid_input_from_config()
+        )
+        job = next(j for j in jobs if (j.kind, j.method) == (kind, method))
+        workers = journal.make_workers(pdf)
+        return lambda: journal.render_page(workers, job)
+
+    return prepare
+
+
+def output(sink: BenchSink) -> Callable[[], Any]:
+    pdf = journal.build(None)
+    path = sink.path("output.pdf")
+
+    def run():
+        # output() serializes once per document: time the same serialization
+        # through output_bytes(), compressing every page like a first output
+        pdf._streams.clear()
+        with open(path, "wb") as f:
+            f.write(pdf.output_bytes())
+
+    return run
+
+
+def build(sink: BenchSink) -> Callable[[], Any]:
+    path = sink.path("bujo.pdf")
+    return lambda: journal.build(path)
+
+
+CASES: Cases = {
+    "grid.calculate[center]": grid_calculate("CENTER"),
+    "grid.calculate[absolute]": grid_calculate("ABSOLUTE"),
+    "spine.initialize_links": spine,
+    "page.daily": page("daily", "draw_page"),
+    "page.weekly.action_plan": page("weekly", "draw_action_plan"),
+    "page.monthly.timeline": page("monthly", "draw_timeline"),
+    "page.index.daily_logs": page("index", "draw_daily_logs"),
+    "adapter.output": output,
+    "build.journal": build,
+}
+
+
+def main(argv=None):
+    bench_main(
+        "bujo",
+        CASES,
+        BASELINE_PATH,
+        argv,
+        description="Time the grid calculator, link spine, one page per layout, "
+        "PDF output and the full journal build, and compare with a baseline.",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import sys
+import time
+from typing import List
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from bujo.workers.monthly_worker import MonthlyLogic
+from src.diagnostics.layout_check import (
+    LayoutCheckInput,
+    LayoutChecker,
+    LayoutIssue,
+    LayoutReport,
+    format_layout_report,
+)
+from src.infrastructure.layout_recorder import LayoutRecorder
+from src.workers.grid_worker import GridCalculator
+
+
+def _truncations(jobs: List[journal.PageJob]) -> List[LayoutIssue]:
+    # Days past the last grid row are never drawn, so no box shows them
+    issues = []
+    logic = MonthlyLogic()
+    calculator = GridCalculator()
+    for page, job in enumerate(jobs, start=1):
+        if job.method != "draw_timeline":
+            continue
+        grid = calculator.calculate(job.data.grid_input)
+        output = logic.process(job.data, grid)
+        if output.days_shown < job.data.days_in_month:
+            issues.append(
+                LayoutIssue(
+                    page=page,
+                    page_kind=f"{job.kind}.{job.method}",
+                    kind="truncated",
+                    detail=f"timeline shows {output.days_shown} of "
+                    f"{job.data.days_in_month} days",
+                )
+            )
+    return issues
+
+
+def check(target_year: int = 2026, total_weeks: int = 53) -> LayoutReport:
+    """Lays out every page of the plan headlessly and checks the boxes."""
+    pdf = LayoutRecorder(format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT))
+    journal.load_fonts(pdf)
+    calendar_model = journal.calendar_for(target_year, total_weeks)
+    journal_map = NavigationSpine(pdf).initialize_links(calendar_model)
+    jobs = journal.plan_pages(
+        calendar_model, journal_map, journal.grid_input_from_config()
+    )
+    workers = journal.make_workers(pdf)
+    for job in jobs:
+        journal.render_page(workers, job)
+
+    report = LayoutChecker().process(
+        LayoutCheckInput(
+            width=config.CANVAS_WIDTH,
+            height=config.CANVAS_HEIGHT,
+            boxes=pdf.boxes,
+            page_kinds=[f"{job.kind}.{job.method}" for job in jobs],
+        )
+    )
+    report.issues = sorted(
+        report.issues + _truncations(jobs), key=lambda issue: issue.page
+    )
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check every journal page for clipped, overflowing, "
+        "overlapping or truncated elements without writing a PDF."
+    )
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--weeks", type=int, default=53)
+    parser.add_argument("--limit", type=int, default=40, help="Issues to list.")
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON.")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    report = check(args.year, args.weeks)
+    seconds = time.perf_counter() - t0
+    print(format_layout_report(report, args.limit))
+    print(f"Checked in {seconds:.2f} s")
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(report.model_dump_json(indent=2))
+    if not report.ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,19 @@ CANVAS_HEIGHT = 2160
 DPI = 229
 GRID_SIZE = 45
 DOT_RADIUS = 1
+GUIDE_EVERY = 5  # --draft: one guide line per 5 grid cells
+GRID_STYLE = "dots"  # dots | lined | squared | isometric | cornell | hex
+GRID_LINE_WIDTH = 1  # stroked styles
+GRID_SHARED = True  # one form XObject for every page instead of inline copies
+GRID_MASK = True  # no dots under titles, nav links and instruction blocks
+GRID_MASK_PADDING = 10  # clearance around masked areas
+GRID_MASK_TOOLBAR = False  # also leave the toolbar strip blank
+
+# --- Output ---
+COMPRESSION_LEVEL = 6  # zlib level for page streams: 1 fastest .. 9 smallest
+OUTPUT_THREADS = None  # threads deflating page streams; None: one per CPU
+CONTENT_DEDUP = True  # move operator runs repeated across pages into shared forms
+LINK_LINT = True  # check link areas for overlaps, off-page and dead targets
 
 # --- Layout ---
 TOOLBAR_BUFFER = 120  # Buffer for the reMarkable toolbar (left or right)
@@ -76,6 +89,15 @@ Y_HEADER_INSTRUCTIONS = Y_HEADER_SUBTITLE + int(SIZE_H2 * 1.2)
 Y_NAV_LINKS = 60
 X_NAV_LINKS_RIGHT = CANVAS_WIDTH - 280
 
+# --- Mini Calendar (daily pages: the month, days linked, today highlighted) ---
+MINI_CALENDAR = False  # opt-in: about +28% file size, +22% build time on a year
+MINI_CALENDAR_CELL_W = 50
+MINI_CALENDAR_CELL_H = 40
+MINI_CALENDAR_X = CANVAS_WIDTH - 60 - 7 * MINI_CALENDAR_CELL_W  # left edge
+MINI_CALENDAR_Y = 290  # below the nav links
+SIZE_MINI_CALENDAR = SIZE_TINY
+COLOR_MINI_CALENDAR_TODAY = (215, 215, 215)
+
 # --- Text Content ---
 TEXT_TIMELINE = (
     "This page is your Timeline. Though it can be used as a traditional calendar "
@@ -103,3 +125,20 @@ TEXT_REFLECTION = (
     "Migrate only relevant Actions into the next week's Action Plan. "
     "Enact any insight from your reflection into the action plan."
 )
+
+# --- Memory Budgets (MB, checked by `python -m bujo.main --memory-profile`) ---
+# Keys are phase-name globs; "peak" is the tracemalloc high-water mark above the
+# phase start, "retained" is what the phase still holds when it ends.
+MEMORY_BUDGETS = {
+    "phases": {
+        "fonts": {"peak_mb": 4, "retained_mb": 4},
+        "spine": {"peak_mb": 2, "retained_mb": 2},
+        "index": {"peak_mb": 4, "retained_mb": 4},
+        "content:*": {"peak_mb": 8, "retained_mb": 8},
+        # Post-passes keep only their reports and the hoisted forms
+        "lint": {"peak_mb": 4, "retained_mb": 1},
+        "dedup": {"peak_mb": 8, "retained_mb": 2},
+        "output": {"peak_mb": 16},
+    },
+    "rss_peak_mb": 300,
+}
@@ -0,0 +1,153 @@
+import calendar
+from datetime import date, timedelta
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class CalendarInput(BaseModel):
+    start_date: date
+    total_weeks: int
+    target_year: int
+
+
+class CalendarModel(BaseModel):
+    start_date: date
+    total_weeks: int
+    target_year: int
+
+    # Per-day arrays, index = (week_num - 1) * 7 + day_offset
+    day_keys: List[Tuple[int, int, int]]  # (year, month, day)
+    day_weekdays: List[int]  # Monday == 0
+    day_titles: List[str]  # "%A"
+    day_subtitles: List[str]  # "%B %d"
+
+    # Per-week arrays, index = week_num - 1
+    week_mondays: List[date]
+    week_iso_numbers: List[int]
+    week_index_labels: List[str]  # "W1: Dec 29 - Jan 04"
+    week_date_strs: List[str]  # "Dec 29 - Jan 04, 2026"
+    week_month_starts: List[Optional[int]]  # month index opened by this week
+
+    # Per-month arrays, index = position in `months`
+    months: List[Tuple[int, int]]  # (year, month), target year onwards
+    month_index: Dict[Tuple[int, int], int]
+    month_names: List[str]
+    month_lengths: List[int]
+    month_first_weekdays: List[int]
+    month_prev_keys: List[Optional[Tuple[int, int]]]
+    month_next_keys: List[Optional[Tuple[int, int]]]
+
+    # (year, month) -> (first weekday, days) for every month a day falls in,
+    # including the partial months at either end of the span
+    month_shapes: Dict[Tuple[int, int], Tuple[int, int]]
+
+    def day_index(self, week_num: int, day_offset: int) -> int:
+        return (week_num - 1) * 7 + day_offset
+
+
+# --- SECTION B: PURE LOGIC ---
+class CalendarLogic:
+    """
+    Builds every date-derived value the journal needs in a single linear pass.
+    Models are cached per (start_date, total_weeks, target_year), so the spine,
+    the main loop and the workers all read the same arrays.
+    """
+
+    _cache: Dict[Tuple[date, int, int], CalendarModel] = {}
+
+    def process(self, data: CalendarInput) -> CalendarModel:
+        key = (data.start_date, data.total_weeks, data.target_year)
+        model = self._cache.get(key)
+        if model is None:
+            model = self._build(data)
+            self._cache[key] = model
+        return model
+
+    def _build(self, data: CalendarInput) -> CalendarModel:
+        # calendar.month_name & co. call strftime on every lookup: snapshot them once
+        day_names = list(calendar.day_name)
+        month_names = list(calendar.month_name)
+        month_abbrs = list(calendar.month_abbr)
+
+        day_keys = []
+        day_weekdays = []
+        day_titles = []
+        day_subtitles = []
+
+        week_mondays = []
+        week_iso_numbers = []
+        week_index_labels = []
+        week_date_strs = []
+        week_month_starts = []
+
+        months = []
+        month_index = {}
+        month_shapes = {}
+
+        first_ordinal = data.start_date.toordinal()
+        first_weekday = data.start_date.weekday()
+
+        for week in range(data.total_weeks):
+            monday = date.fromordinal(first_ordinal + week * 7)
+            sunday = monday + timedelta(days=6)
+
+            m_key = (monday.year, monday.month)
+            opens_month = None
+            if monday.year >= data.target_year and m_key not in month_index:
+                opens_month = len(months)
+                month_index[m_key] = opens_month
+                months.append(m_key)
+
+            week_mondays.append(monday)
+            week_iso_numbers.append(monday.isocalendar()[1])
+            week_month_starts.append(opens_month)
+
+            monday_label = f"{month_abbrs[monday.month]} {monday.day:02d}"
+            sunday_label = f"{month_abbrs[sunday.month]} {sunday.day:02d}"
+            week_index_labels.append(f"W{week + 1}: {monday_label} - {sunday_label}")
+            week_date_strs.append(f"{monday_label} - {sunday_label}, {sunday.year}")
+
+            for day_offset in range(7):
+                day_date = date.fromordinal(first_ordinal + week * 7 + day_offset)
+                weekday = (first_weekday + day_offset) % 7
+                day_keys.append((day_date.year, day_date.month, day_date.day))
+                if day_date.day == 1 or not month_shapes:
+                    month_shapes[(day_date.year, day_date.month)] = calendar.monthrange(
+                        day_date.year, day_date.month
+                    )
+                day_weekdays.append(weekday)
+                day_titles.append(day_names[weekday])
+                day_subtitles.append(
+                    f"{month_names[day_date.month]} {day_date.day:02d}"
+                )
+
+        month_lengths = []
+        month_first_weekdays = []
+        for key in months:
+            first_weekday_of_month, days_in_month = month_shapes[key]
+            month_first_weekdays.append(first_weekday_of_month)
+            month_lengths.append(days_in_month)
+
+        return CalendarModel(
+            start_date=data.start_date,
+            total_weeks=data.total_weeks,
+            target_year=data.target_year,
+            day_keys=day_keys,
+            day_weekdays=day_weekdays,
+            day_titles=day_titles,
+            day_subtitles=day_subtitles,
+            week_mondays=week_mondays,
+            week_iso_numbers=week_iso_numbers,
+            week_index_labels=week_index_labels,
+            week_date_strs=week_date_strs,
+            week_month_starts=week_month_starts,
+            months=months,
+            month_index=month_index,
+            month_names=[month_names[m] for _, m in months],
+            month_lengths=month_lengths,
+            month_first_weekdays=month_first_weekdays,
+            month_prev_keys=([None] + months[:-1]) if months else [],
+            month_next_keys=(months[1:] + [None]) if months else [],
+            month_shapes=month_shapes,
+        )
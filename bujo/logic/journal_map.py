@@ -1,6 +1,7 @@
-from datetime import date, timedelta
 from pydantic import BaseModel
 from typing import Dict, List, Tuple, Optional
+from bujo.logic.calendar_model import CalendarModel
+from src.diagnostics.tracer import traced
 
 
 class JournalMap(BaseModel):
@@ -23,7 +24,8 @@ class NavigationSpine:
         self.pdf = pdf_interface
         self.journal_map = JournalMap()
 
-    def initialize_links(self, start_date: date, total_weeks: int, target_year: int):
+    @traced("spine.initialize_links")
+    def initialize_links(self, calendar_model: CalendarModel):
         # Pass 1: Calculate Page Numbers and Create Links
 
         current_page = 1
@@ -33,25 +35,14 @@ class NavigationSpine:
         self.pdf.set_link(self.journal_map.index_link, page=current_page)
         current_page += 2
 
-        current_date = start_date
-        unique_months = []
-        for i in range(total_weeks):
-            d = start_date + timedelta(weeks=i)
-            if d.year < target_year:
-                continue
-            m_key = (d.year, d.month)
-            if m_key not in unique_months:
-                unique_months.append(m_key)
-
-        # We need to simulate the loop to get exact page numbers
-        month_idx = 0
-        last_month_key = None
-
-        for week_num in range(1, total_weeks + 1):
-            monday = start_date + timedelta(weeks=week_num - 1)
-            m_key = (monday.year, monday.month)
-
-            if m_key != last_month_key and m_key in unique_months:
+        day_keys = calendar_model.day_keys
+
+        for week_num in range(1, calendar_model.total_weeks + 1):
+            month_idx = calendar_model.week_month_starts[week_num - 1]
+
+            if month_idx is not None:
+                m_key = calendar_model.months[month_idx]
+
                 # Monthly Timeline
                 self.journal_map.month_timeline_links[m_key] = self.pdf.add_link()
                 self.pdf.set_link(
@@ -66,8 +57,6 @@ class NavigationSpine:
                 )
                 current_page += 1
 
-                last_month_key = m_key
-
             # Weekly Action Plan
             self.journal_map.week_action_links[week_num] = self.pdf.add_link()
             self.pdf.set_link(
@@ -76,9 +65,8 @@ class NavigationSpine:
             current_page += 1
 
             # Daily Pages
-            for day_offset in range(7):
-                day_date = monday + timedelta(days=day_offset)
-                d_key = (day_date.year, day_date.month, day_date.day)
+            first_day = calendar_model.day_index(week_num, 0)
+            for d_key in day_keys[first_day : first_day + 7]:
                 self.journal_map.day_links[d_key] = self.pdf.add_link()
                 self.pdf.set_link(self.journal_map.day_links[d_key], page=current_page)
                 current_page += 1
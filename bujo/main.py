@@ -1,21 +1,72 @@
+import argparse
+import hashlib
 import os
-import calendar
+import sys
+from contextlib import nullcontext
 from datetime import date, timedelta
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
 import bujo.config as config
+from src.infrastructure.content_dedup import format_dedup
+from src.infrastructure.incremental_pdf import PagePlan, environment_digest, write_plan
 from src.infrastructure.pdf_adapter import FPDFAdapter
+from src.infrastructure.remarkable_templates import TemplateCollector
+from src.infrastructure.watch import config_snapshot
 from bujo.logic.journal_map import NavigationSpine
+from bujo.logic.calendar_model import CalendarLogic, CalendarInput
 from src.workers.grid_worker import GridInput
-from bujo.workers.daily_worker import DailyWorker, DailyInput
+from bujo.workers.daily_worker import DailyWorker, DailyInput, MiniCalendarInput
 from bujo.workers.weekly_worker import WeeklyWorker, WeeklyInput
 from bujo.workers.monthly_worker import MonthlyWorker, MonthlyInput
 from bujo.workers.index_worker import IndexWorker, IndexInput
-
-
-def main():
-    # 1. Setup PDF
-    pdf = FPDFAdapter(format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT))
-
-    # Load Fonts
+from src.diagnostics.memory_profiler import (
+    MemoryBudgetExceeded,
+    MemoryProfiler,
+    format_report,
+    load_budget,
+)
+from src.diagnostics.cpu_profiler import CpuProfiler, format_profile
+from src.diagnostics.link_lint import format_link_report
+from src.diagnostics.tracer import Tracer, format_trace_summary, span
+
+OUTPUT_PATH = "output/bujo_2026.pdf"
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# What draws a page besides its planned input (bujo.update compares digests)
+RENDER_SOURCES = (
+    "bujo/main.py",
+    "bujo/workers",
+    "src/workers",
+    "src/layout",
+    "src/infrastructure/pdf_adapter.py",
+    "src/infrastructure/content_dedup.py",
+)
+
+
+def _no_phase(name: str):
+    return nullcontext()
+
+
+class PageJob(BaseModel):
+    """One page of the plan: `workers[kind].<method>(data)` draws it."""
+
+    kind: str  # "index" | "monthly" | "weekly" | "daily"
+    method: str
+    phase: str  # profiling phase: "index" or "content:YYYY-MM"
+    data: Any
+
+    @property
+    def date(self) -> str:
+        data = self.data
+        if self.kind == "index":
+            return data.start_date.isoformat()
+        if self.kind == "monthly":
+            return f"{data.year}-{data.month:02d}"
+        if self.kind == "weekly":
+            return data.date_str
+        return data.day_date.isoformat()
+
+
+def load_fonts(pdf: FPDFAdapter):
     if os.path.exists(config.FONT_REGULAR):
         pdf.add_font(config.FONT_NAME, "", config.FONT_REGULAR)
     if os.path.exists(config.FONT_BOLD):
@@ -23,99 +74,145 @@ def main():
     if os.path.exists(config.FONT_ITALIC):
         pdf.add_font(config.FONT_NAME, "I", config.FONT_ITALIC)
 
-    # 2. Date Logic
-    target_year = 2026
+
+def calendar_for(target_year: int, total_weeks: int):
     jan_one = date(target_year, 1, 1)
     start_date = jan_one - timedelta(days=jan_one.weekday())
-    total_weeks = 53
+    return CalendarLogic().process(
+        CalendarInput(
+            start_date=start_date, total_weeks=total_weeks, target_year=target_year
+        )
+    )
 
-    # 3. Navigation Spine (Pass 1: Create Links and assign destinations)
-    spine = NavigationSpine(pdf)
-    journal_map = spine.initialize_links(start_date, total_weeks, target_year)
 
-    # 4. Initialize Workers
-    grid_input = GridInput(
+def grid_input_from_config(draft: bool = False) -> GridInput:
+    return GridInput(
         canvas_width=config.CANVAS_WIDTH,
         canvas_height=config.CANVAS_HEIGHT,
         grid_size=config.GRID_SIZE,
         toolbar_buffer=config.TOOLBAR_BUFFER,
         dot_radius=config.DOT_RADIUS,
+        draft=draft,
+        guide_every=config.GUIDE_EVERY,
+        style=config.GRID_STYLE,
+        line_width=config.GRID_LINE_WIDTH,
+        shared=config.GRID_SHARED,
     )
 
-    daily_worker = DailyWorker(pdf)
-    weekly_worker = WeeklyWorker(pdf)
-    monthly_worker = MonthlyWorker(pdf)
-    index_worker = IndexWorker(pdf)
 
-    # 5. Generation Loop
+def make_workers(pdf: FPDFAdapter) -> Dict[str, Any]:
+    return {
+        "index": IndexWorker(pdf),
+        "monthly": MonthlyWorker(pdf),
+        "weekly": WeeklyWorker(pdf),
+        "daily": DailyWorker(pdf),
+    }
+
+
+def render_page(workers: Dict[str, Any], job: PageJob):
+    worker = workers[job.kind]
+    with span(f"{job.kind} page", method=job.method, date=job.date) as page_span:
+        getattr(worker, job.method)(job.data)
+        page_span.set("page", worker.pdf.page_no())
 
-    # --- A. Index Pages ---
-    unique_months = []
-    for i in range(total_weeks):
-        d = start_date + timedelta(weeks=i)
-        if d.year < target_year:
-            continue
-        m_key = (d.year, d.month)
-        if m_key not in unique_months:
-            unique_months.append(m_key)
 
+def _phase_blocks(jobs: List[PageJob]):
+    blocks = []
+    for job in jobs:
+        if not blocks or blocks[-1][0] != job.phase:
+            blocks.append((job.phase, []))
+        blocks[-1][1].append(job)
+    return blocks
+
+
+def plan_pages(calendar_model, journal_map, grid_input: GridInput) -> List[PageJob]:
+    """
+    Every page of the journal in output order, as worker inputs.
+    Pure: the watch mode re-plans after a config change and re-renders only
+    the pages whose job changed.
+    """
+    total_weeks = calendar_model.total_weeks
+    jobs = []
+
+    # --- A. Index Pages ---
     month_links = [
-        (calendar.month_name[m[1]], journal_map.month_timeline_links[m])
-        for m in unique_months
+        (calendar_model.month_names[i], journal_map.month_timeline_links[m])
+        for i, m in enumerate(calendar_model.months)
     ]
 
-    week_links = []
-    for w in range(1, total_weeks + 1):
-        monday = start_date + timedelta(weeks=w - 1)
-        sunday = monday + timedelta(days=6)
-        label = f"W{w}: {monday.strftime('%b %d')} - {sunday.strftime('%b %d')}"
-        week_links.append((label, journal_map.week_action_links[w]))
+    week_links = [
+        (calendar_model.week_index_labels[w - 1], journal_map.week_action_links[w])
+        for w in range(1, total_weeks + 1)
+    ]
 
     daily_links_data = []
-    for year, month in unique_months:
-        month_name = calendar.month_name[month]
-        days_in_month = calendar.monthrange(year, month)[1]
-        days = []
-        for day in range(1, days_in_month + 1):
-            days.append((day, journal_map.day_links[(year, month, day)]))
-        daily_links_data.append((month_name, year, days))
+    for i, (year, month) in enumerate(calendar_model.months):
+        days = [
+            (day, journal_map.day_links.get((year, month, day)))
+            for day in range(1, calendar_model.month_lengths[i] + 1)
+        ]
+        daily_links_data.append(
+            (
+                calendar_model.month_names[i],
+                year,
+                calendar_model.month_first_weekdays[i],
+                days,
+            )
+        )
 
     index_input = IndexInput(
-        start_date=start_date,
+        start_date=calendar_model.start_date,
         total_weeks=total_weeks,
         grid_input=grid_input,
         month_links=month_links,
         week_links=week_links,
         daily_links=daily_links_data,
     )
+    for method in ("draw_months_and_weeks", "draw_daily_logs"):
+        jobs.append(
+            PageJob(kind="index", method=method, phase="index", data=index_input)
+        )
 
-    index_worker.draw_months_and_weeks(index_input)
-    index_worker.draw_daily_logs(index_input)
+    # One mini calendar per month, shared by that month's daily pages
+    mini_calendars: Dict[Tuple[int, int], MiniCalendarInput] = {}
+
+    def mini_calendar(year: int, month: int) -> Optional[MiniCalendarInput]:
+        if not config.MINI_CALENDAR:
+            return None
+        if (year, month) not in mini_calendars:
+            first_weekday, days = calendar_model.month_shapes[(year, month)]
+            mini_calendars[(year, month)] = MiniCalendarInput(
+                year=year,
+                month=month,
+                first_weekday=first_weekday,
+                day_links=[
+                    journal_map.day_links.get((year, month, day))
+                    for day in range(1, days + 1)
+                ],
+                x=config.MINI_CALENDAR_X,
+                y=config.MINI_CALENDAR_Y,
+                cell_w=config.MINI_CALENDAR_CELL_W,
+                cell_h=config.MINI_CALENDAR_CELL_H,
+            )
+        return mini_calendars[(year, month)]
 
     # --- B. Content Pages ---
-    last_month_key = None
-
+    # A new phase starts at every week that opens a new month
+    phase = None
     for week_num in range(1, total_weeks + 1):
-        current_monday = start_date + timedelta(weeks=week_num - 1)
-        month_key = (current_monday.year, current_monday.month)
+        current_monday = calendar_model.week_mondays[week_num - 1]
+        month_idx = calendar_model.week_month_starts[week_num - 1]
+        if month_idx is not None or phase is None:
+            phase = f"content:{current_monday.year}-{current_monday.month:02d}"
 
         # Monthly Pages
-        if month_key != last_month_key and month_key in unique_months:
-            month_name = calendar.month_name[current_monday.month]
-            days_in_month = calendar.monthrange(
-                current_monday.year, current_monday.month
-            )[1]
-
-            prev_month_key = (
-                unique_months[unique_months.index(month_key) - 1]
-                if unique_months.index(month_key) > 0
-                else None
-            )
-            next_month_key = (
-                unique_months[unique_months.index(month_key) + 1]
-                if unique_months.index(month_key) < len(unique_months) - 1
-                else None
-            )
+        if month_idx is not None:
+            month_key = calendar_model.months[month_idx]
+            month_name = calendar_model.month_names[month_idx]
+            days_in_month = calendar_model.month_lengths[month_idx]
+            first_weekday = calendar_model.month_first_weekdays[month_idx]
+            prev_month_key = calendar_model.month_prev_keys[month_idx]
+            next_month_key = calendar_model.month_next_keys[month_idx]
 
             nav_links = [
                 ("Index", journal_map.index_link),
@@ -124,20 +221,26 @@ def main():
             ]
 
             day_links = [
-                journal_map.day_links[(current_monday.year, current_monday.month, d)]
+                journal_map.day_links.get((month_key[0], month_key[1], d))
                 for d in range(1, days_in_month + 1)
             ]
 
-            monthly_worker.draw_timeline(
-                MonthlyInput(
-                    month_name=month_name,
-                    month=current_monday.month,
-                    year=current_monday.year,
-                    days_in_month=days_in_month,
-                    instructions=config.TEXT_TIMELINE,
-                    nav_links=nav_links,
-                    grid_input=grid_input,
-                    day_links=day_links,
+            jobs.append(
+                PageJob(
+                    kind="monthly",
+                    method="draw_timeline",
+                    phase=phase,
+                    data=MonthlyInput(
+                        month_name=month_name,
+                        month=month_key[1],
+                        year=month_key[0],
+                        days_in_month=days_in_month,
+                        first_weekday=first_weekday,
+                        instructions=config.TEXT_TIMELINE,
+                        nav_links=nav_links,
+                        grid_input=grid_input,
+                        day_links=day_links,
+                    ),
                 )
             )
 
@@ -147,26 +250,27 @@ def main():
                 ("Next month", journal_map.month_action_links.get(next_month_key)),
             ]
 
-            monthly_worker.draw_action_plan(
-                MonthlyInput(
-                    month_name=month_name,
-                    month=current_monday.month,
-                    year=current_monday.year,
-                    days_in_month=days_in_month,
-                    instructions=config.TEXT_MONTHLY_ACTION,
-                    nav_links=nav_links_action,
-                    grid_input=grid_input,
-                    day_links=[],
+            jobs.append(
+                PageJob(
+                    kind="monthly",
+                    method="draw_action_plan",
+                    phase=phase,
+                    data=MonthlyInput(
+                        month_name=month_name,
+                        month=month_key[1],
+                        year=month_key[0],
+                        days_in_month=days_in_month,
+                        first_weekday=first_weekday,
+                        instructions=config.TEXT_MONTHLY_ACTION,
+                        nav_links=nav_links_action,
+                        grid_input=grid_input,
+                        day_links=[],
+                    ),
                 )
             )
 
-            last_month_key = month_key
-
         # Weekly Action Plan
-        week_end = current_monday + timedelta(days=6)
-        date_str = (
-            f"{current_monday.strftime('%b %d')} - {week_end.strftime('%b %d, %Y')}"
-        )
+        date_str = calendar_model.week_date_strs[week_num - 1]
 
         nav_links_week = [
             ("Index", journal_map.index_link),
@@ -174,46 +278,277 @@ def main():
             ("Next week", journal_map.week_action_links.get(week_num + 1)),
         ]
 
-        weekly_worker.draw_action_plan(
-            WeeklyInput(
-                date_str=date_str,
-                nav_links=nav_links_week,
-                grid_input=grid_input,
-                instructions=config.TEXT_ACTION_PLAN,
+        jobs.append(
+            PageJob(
+                kind="weekly",
+                method="draw_action_plan",
+                phase=phase,
+                data=WeeklyInput(
+                    date_str=date_str,
+                    nav_links=nav_links_week,
+                    grid_input=grid_input,
+                    instructions=config.TEXT_ACTION_PLAN,
+                ),
             )
         )
 
         # Daily Pages
         for day_offset in range(7):
-            day_date = current_monday + timedelta(days=day_offset)
-
-            m_key = (day_date.year, day_date.month)
+            day_idx = calendar_model.day_index(week_num, day_offset)
+            year, month, day = calendar_model.day_keys[day_idx]
 
             nav_links_day = [
                 ("Index", journal_map.index_link),
-                ("Monthly log", journal_map.month_timeline_links.get(m_key)),
+                ("Monthly log", journal_map.month_timeline_links.get((year, month))),
                 ("Weekly log", journal_map.week_action_links[week_num]),
             ]
 
-            daily_worker.draw_page(
-                DailyInput(
-                    day_date=day_date, nav_links=nav_links_day, grid_input=grid_input
+            jobs.append(
+                PageJob(
+                    kind="daily",
+                    method="draw_page",
+                    phase=phase,
+                    data=DailyInput(
+                        day_date=current_monday + timedelta(days=day_offset),
+                        title=calendar_model.day_titles[day_idx],
+                        subtitle=calendar_model.day_subtitles[day_idx],
+                        nav_links=nav_links_day,
+                        grid_input=grid_input,
+                        mini_calendar=mini_calendar(year, month),
+                    ),
                 )
             )
 
         # Weekly Reflection
-        weekly_worker.draw_reflection(
-            WeeklyInput(
-                date_str=date_str,
-                nav_links=nav_links_week,
-                grid_input=grid_input,
-                instructions=config.TEXT_REFLECTION,
+        jobs.append(
+            PageJob(
+                kind="weekly",
+                method="draw_reflection",
+                phase=phase,
+                data=WeeklyInput(
+                    date_str=date_str,
+                    nav_links=nav_links_week,
+                    grid_input=grid_input,
+                    instructions=config.TEXT_REFLECTION,
+                ),
             )
         )
 
-    # 6. Output
-    pdf.output("output/bujo_2026.pdf")
-    print("PDF Generated: output/bujo_2026.pdf")
+    return jobs
+
+
+def page_plan(pdf: FPDFAdapter, jobs: List[PageJob], draft: bool = False) -> PagePlan:
+    """
+    The plan bujo.update compares against the one recorded with the file:
+    one signature per page (kind, method and input) and the link targets,
+    under a digest of config, drawing code and fonts.
+    """
+    values = config_snapshot(config)
+    values["draft"] = draft
+    fonts = [
+        path
+        for path in (config.FONT_REGULAR, config.FONT_BOLD, config.FONT_ITALIC)
+        if os.path.exists(path)
+    ]
+    sources = [os.path.join(_ROOT, path) for path in RENDER_SOURCES]
+    return PagePlan(
+        environment=environment_digest(sources + fonts, values),
+        pages=[
+            hashlib.sha1(
+                f"{job.kind}.{job.method}:{job.data.model_dump_json()}".encode()
+            ).hexdigest()
+            for job in jobs
+        ],
+        links=pdf.link_targets(),
+    )
+
+
+def build(
+    output_path: Optional[str] = OUTPUT_PATH,
+    target_year: int = 2026,
+    total_weeks: int = 53,
+    profiler: Optional[MemoryProfiler] = None,
+    draft: bool = False,
+    templates: Optional[TemplateCollector] = None,
+) -> FPDFAdapter:
+    """
+    Builds the journal and writes it to `output_path` (None: keep it in
+    memory). With `templates`, paper and grid are collected as device
+    templates instead of drawn, for a slim PDF (see bujo.templates).
+    """
+    phase = profiler.phase if profiler is not None else _no_phase
+
+    # 1. Setup PDF
+    pdf = FPDFAdapter(
+        format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT),
+        draft=draft,
+        compress_level=config.COMPRESSION_LEVEL,
+        output_threads=config.OUTPUT_THREADS,
+        # Slim exports are never patched by bujo.update
+        object_streams=templates is not None,
+    )
+    if profiler is not None:
+        profiler.track_pages(pdf.page_no)
+
+    # Load Fonts
+    with phase("fonts"), span("fonts"):
+        load_fonts(pdf)
+
+    # 2. Date Logic
+    calendar_model = calendar_for(target_year, total_weeks)
+
+    # 3. Navigation Spine (Pass 1: Create Links and assign destinations)
+    with phase("spine"), span("spine"):
+        spine = NavigationSpine(pdf)
+        journal_map = spine.initialize_links(calendar_model)
+
+    # 4. Initialize Workers
+    grid_input = grid_input_from_config(draft)
+    workers = make_workers(pdf)
+    for worker in workers.values():
+        worker.templates = templates
+
+    # 5. Generation Loop
+    # Jobs are grouped per opened month so each block is one profiling phase
+    jobs = plan_pages(calendar_model, journal_map, grid_input)
+    for block_label, block_jobs in _phase_blocks(jobs):
+        with phase(block_label), span(block_label, pages=len(block_jobs)):
+            for job in block_jobs:
+                render_page(workers, job)
+
+    # 6. Link areas: overlaps, off-page or empty areas, dead targets
+    if config.LINK_LINT:
+        with phase("lint"), span("lint"):
+            pdf.lint_links()
+
+    # 7. Operator runs repeated across pages become shared form XObjects
+    if config.CONTENT_DEDUP:
+        with phase("dedup"), span("dedup"):
+            pdf.hoist_repeated_content()
+
+    # 8. Output (skipped by the watch mode, which writes through output_bytes())
+    if output_path is not None:
+        with phase("output"), span("output", path=output_path):
+            pdf.output(output_path)
+        # Lets bujo.update redraw only the pages a later plan changes
+        if templates is None:
+            write_plan(output_path, page_plan(pdf, jobs, draft))
+
+    return pdf
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the bullet journal PDF.")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Report peak/retained memory per build phase (tracemalloc + RSS).",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        metavar="JSON",
+        help="Budget file overriding config.MEMORY_BUDGETS; exits 1 on violation.",
+    )
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Fast layout build: core fonts, guide lines instead of dots, no compression.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay running and re-render the pages affected by edits to config.py "
+        "or the font directory.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="JSON",
+        help="Write a Chrome trace-event timeline of the build (chrome://tracing, "
+        "Perfetto) and print the slowest spans.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "sample"],
+        help="Profile the build's CPU time (cProfile, or a low-overhead stack "
+        "sampler) and print it per module group: our workers against fpdf2, "
+        "pypdf and pydantic.",
+    )
+    parser.add_argument(
+        "--profile-out",
+        metavar="PREFIX",
+        help="With --profile: where PREFIX.pstats and PREFIX.collapsed.txt go "
+        "(default: the output path, .pdf replaced by -profile).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        from bujo.watch import watch
+
+        watch(args.output, draft=args.draft)
+        return
+
+    if args.trace:
+        tracer = Tracer()
+        tracer.start()
+        try:
+            with span("build", draft=args.draft):
+                build(args.output, draft=args.draft)
+        finally:
+            tracer.stop()
+        tracer.write(args.trace)
+        print(f"PDF Generated: {args.output}")
+        print(format_trace_summary(tracer.summary()))
+        print(f"Trace written to {args.trace}")
+        return
+
+    if args.profile:
+        profiler = CpuProfiler(args.profile)
+        profiler.start()
+        try:
+            build(args.output, draft=args.draft)
+        finally:
+            profiler.stop()
+        paths = profiler.write(
+            args.profile_out or os.path.splitext(args.output)[0] + "-profile"
+        )
+        print(f"PDF Generated: {args.output}")
+        print(format_profile(profiler.report()))
+        print(f"Profile written to {', '.join(paths)}")
+        return
+
+    if not (args.memory_profile or args.memory_budget):
+        pdf = build(args.output, draft=args.draft)
+        print(f"PDF Generated: {args.output}")
+        print(pdf.glyph_cache_summary())
+        if pdf.dedup_report is not None:
+            print(format_dedup(pdf.dedup_report))
+        if pdf.link_report is not None:
+            print(format_link_report(pdf.link_report))
+        return
+
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        pdf = build(args.output, profiler=profiler, draft=args.draft)
+        print(f"PDF Generated: {args.output}")
+        print(pdf.glyph_cache_summary())
+        if pdf.dedup_report is not None:
+            print(format_dedup(pdf.dedup_report))
+        if pdf.link_report is not None:
+            print(format_link_report(pdf.link_report))
+        report = profiler.report()
+    finally:
+        profiler.stop()
+    print(format_report(report))
+
+    budget = load_budget(args.memory_budget, config.MEMORY_BUDGETS)
+    try:
+        profiler.check(report, budget)
+    except MemoryBudgetExceeded as e:
+        print(f"Memory budget exceeded: {e}")
+        sys.exit(1)
+    print("Memory budgets OK")
 
 
 if __name__ == "__main__":
@@ -336,69 +336,8 @@ class BulletJournal(FPDF):
             y += 35 * SCALE
 
 
-# 1. Setup PDF
-pdf = BulletJournal(orientation="P", unit="pt", format=(PDF_W, PDF_H))
-pdf.set_auto_page_break(False)
-
-# --- Smart Font Loading ---
-pdf.active_font = "Helvetica"
-pdf.has_italic = True
-
-# Check if the static folder exists
-if not os.path.exists(FONT_DIR):
-    print(
-        f"Warning: Folder '{FONT_DIR}' not found. Please create it or unzip your fonts there."
-    )
-
-# Try to load fonts from the static directory
-if os.path.exists(FONT_REGULAR) and os.path.exists(FONT_BOLD):
-    try:
-        # uni=True is deprecated in newer fpdf2 versions
-        pdf.add_font(FONT_NAME, "", FONT_REGULAR)
-        pdf.add_font(FONT_NAME, "B", FONT_BOLD)
-
-        # Check for Italic
-        if os.path.exists(FONT_ITALIC):
-            pdf.add_font(FONT_NAME, "I", FONT_ITALIC)
-            pdf.has_italic = True
-        else:
-            pdf.has_italic = False
-
-        pdf.active_font = FONT_NAME
-        print(f"Success: Using custom font {FONT_REGULAR}")
-    except Exception as e:
-        print(f"Error loading font: {e}. Falling back to Helvetica.")
-else:
-    print(f"Font file '{FONT_REGULAR}' not found. Using Helvetica.")
-
-
-# 2. Date Logic
-target_year = 2026
-jan_one = date(target_year, 1, 1)
-start_date = jan_one - timedelta(days=jan_one.weekday())
-
-# 3. Generation Loop
-total_weeks = 53
-
-# --- A. Index Pages (Reserved) ---
-index_page_idx = pdf.page_no() + 1
-for _ in range(2):  # Reserve 2 pages for Index
-    pdf.add_page()
-    pdf.draw_background()
-    pdf.draw_dot_grid()
-
-# --- B. Data Structures for Navigation ---
-months_data = {}  # month_key -> {'timeline_idx': int, 'action_idx': int, 'next_link_id': link_id}
-weeks_data = {}  # week_num -> {'action_idx': int, 'reflection_idx': int, 'next_link_id': link_id}
-# Pre-calculate months to handle 'Next month' links correctly
-unique_months = []
-for i in range(total_weeks):
-    d = start_date + timedelta(weeks=i)
-    if d.year < target_year:
-        continue
-    m_key = (d.year, d.month)
-    if m_key not in unique_months:
-        unique_months.append(m_key)
+OUTPUT_PATH = "bujo_custom_font.pdf"
+
 TEXT_TIMELINE = (
     "This page is your Timeline. Though it can be used as a traditional calendar "
     "by adding upcoming events, it’s recommended to use the Timeline to log "
@@ -426,180 +365,262 @@ TEXT_REFLECTION = (
     "Enact any insight from your reflection into the action plan."
 )
 
-last_month_key = None
-prev_month_timeline_link_id = None
-prev_month_action_link_id = None
-
-for week_num in range(1, total_weeks + 1):
-    current_monday = start_date + timedelta(weeks=week_num - 1)
-    month_key = (current_monday.year, current_monday.month)
-
-    # Check if we need to insert a new Monthly Log
-    if month_key != last_month_key and month_key in unique_months:
-        month_name = calendar.month_name[current_monday.month]
-        days_in_month = calendar.monthrange(current_monday.year, current_monday.month)[
-            1
-        ]
-
-        # If there was a previous month, point its 'Next' links to this month's pages
-        if prev_month_timeline_link_id is not None:
-            pdf.set_link(prev_month_timeline_link_id, page=pdf.page_no() + 1)
-        if prev_month_action_link_id is not None:
-            pdf.set_link(prev_month_action_link_id, page=pdf.page_no() + 2)
-
-        prev_month_key = last_month_key
-        prev_month_data = months_data.get(prev_month_key)
-
-        # Timeline Page
-        timeline_idx = pdf.page_no() + 1
-        pdf.set_link(
-            pdf.get_month_link(current_monday.year, current_monday.month),
-            page=timeline_idx,
+
+def build(
+    output_path=OUTPUT_PATH,
+    target_year=2026,
+    total_weeks=53,
+    font_regular=FONT_REGULAR,
+    font_bold=FONT_BOLD,
+    font_italic=FONT_ITALIC,
+    log=print,
+):
+    """
+    Builds the journal the way the original single-file script did.
+    Nothing runs at import time, so the parity harness can load this module
+    next to `bujo.main` and time both builds.
+    """
+    # 1. Setup PDF
+    pdf = BulletJournal(orientation="P", unit="pt", format=(PDF_W, PDF_H))
+    pdf.set_auto_page_break(False)
+
+    # --- Smart Font Loading ---
+    pdf.active_font = "Helvetica"
+    pdf.has_italic = True
+
+    # Check if the static folder exists
+    font_dir = os.path.dirname(font_regular)
+    if not os.path.exists(font_dir):
+        log(
+            f"Warning: Folder '{font_dir}' not found. "
+            "Please create it or unzip your fonts there."
         )
 
-        # Only create 'Next month' links if there is a next month
-        is_last_month = month_key == unique_months[-1]
-        next_month_timeline_link_id = pdf.add_link() if not is_last_month else None
-        next_month_action_link_id = pdf.add_link() if not is_last_month else None
-
-        pdf.draw_timeline(
-            month_name,
-            current_monday.month,
-            current_monday.year,
-            days_in_month,
-            TEXT_TIMELINE,
-            [
-                ("Index", pdf.link_to_page(index_page_idx)),
-                (
-                    "Prev month",
-                    pdf.link_to_page(
-                        prev_month_data["timeline_idx"] if prev_month_data else None
+    # Try to load fonts from the static directory
+    if os.path.exists(font_regular) and os.path.exists(font_bold):
+        try:
+            # uni=True is deprecated in newer fpdf2 versions
+            pdf.add_font(FONT_NAME, "", font_regular)
+            pdf.add_font(FONT_NAME, "B", font_bold)
+
+            # Check for Italic
+            if os.path.exists(font_italic):
+                pdf.add_font(FONT_NAME, "I", font_italic)
+                pdf.has_italic = True
+            else:
+                pdf.has_italic = False
+
+            pdf.active_font = FONT_NAME
+            log(f"Success: Using custom font {font_regular}")
+        except Exception as e:
+            log(f"Error loading font: {e}. Falling back to Helvetica.")
+    else:
+        log(f"Font file '{font_regular}' not found. Using Helvetica.")
+
+    # 2. Date Logic
+    jan_one = date(target_year, 1, 1)
+    start_date = jan_one - timedelta(days=jan_one.weekday())
+
+    # 3. Generation Loop
+
+    # --- A. Index Pages (Reserved) ---
+    index_page_idx = pdf.page_no() + 1
+    for _ in range(2):  # Reserve 2 pages for Index
+        pdf.add_page()
+        pdf.draw_background()
+        pdf.draw_dot_grid()
+
+    # --- B. Data Structures for Navigation ---
+    months_data = {}  # month_key -> {'timeline_idx': int, 'action_idx': int, 'next_link_id': link_id}
+    weeks_data = {}  # week_num -> {'action_idx': int, 'reflection_idx': int, 'next_link_id': link_id}
+    # Pre-calculate months to handle 'Next month' links correctly
+    unique_months = []
+    for i in range(total_weeks):
+        d = start_date + timedelta(weeks=i)
+        if d.year < target_year:
+            continue
+        m_key = (d.year, d.month)
+        if m_key not in unique_months:
+            unique_months.append(m_key)
+    last_month_key = None
+    prev_month_timeline_link_id = None
+    prev_month_action_link_id = None
+
+    for week_num in range(1, total_weeks + 1):
+        current_monday = start_date + timedelta(weeks=week_num - 1)
+        month_key = (current_monday.year, current_monday.month)
+
+        # Check if we need to insert a new Monthly Log
+        if month_key != last_month_key and month_key in unique_months:
+            month_name = calendar.month_name[current_monday.month]
+            days_in_month = calendar.monthrange(current_monday.year, current_monday.month)[
+                1
+            ]
+
+            # If there was a previous month, point its 'Next' links to this month's pages
+            if prev_month_timeline_link_id is not None:
+                pdf.set_link(prev_month_timeline_link_id, page=pdf.page_no() + 1)
+            if prev_month_action_link_id is not None:
+                pdf.set_link(prev_month_action_link_id, page=pdf.page_no() + 2)
+
+            prev_month_key = last_month_key
+            prev_month_data = months_data.get(prev_month_key)
+
+            # Timeline Page
+            timeline_idx = pdf.page_no() + 1
+            pdf.set_link(
+                pdf.get_month_link(current_monday.year, current_monday.month),
+                page=timeline_idx,
+            )
+
+            # Only create 'Next month' links if there is a next month
+            is_last_month = month_key == unique_months[-1]
+            next_month_timeline_link_id = pdf.add_link() if not is_last_month else None
+            next_month_action_link_id = pdf.add_link() if not is_last_month else None
+
+            pdf.draw_timeline(
+                month_name,
+                current_monday.month,
+                current_monday.year,
+                days_in_month,
+                TEXT_TIMELINE,
+                [
+                    ("Index", pdf.link_to_page(index_page_idx)),
+                    (
+                        "Prev month",
+                        pdf.link_to_page(
+                            prev_month_data["timeline_idx"] if prev_month_data else None
+                        ),
                     ),
-                ),
-                ("Next month", next_month_timeline_link_id),
-            ],
-        )
+                    ("Next month", next_month_timeline_link_id),
+                ],
+            )
+
+            # Action Plan Page
+            action_idx = pdf.page_no() + 1
+            pdf.draw_monthly_action_plan(
+                month_name,
+                TEXT_MONTHLY_ACTION,
+                [
+                    ("Index", pdf.link_to_page(index_page_idx)),
+                    (
+                        "Prev month",
+                        pdf.link_to_page(
+                            prev_month_data["action_idx"] if prev_month_data else None
+                        ),
+                    ),
+                    ("Next month", next_month_action_link_id),
+                ],
+            )
+
+            months_data[month_key] = {
+                "timeline_idx": timeline_idx,
+                "action_idx": action_idx,
+            }
+
+            last_month_key = month_key
+            prev_month_timeline_link_id = next_month_timeline_link_id
+            prev_month_action_link_id = next_month_action_link_id
+
+        # --- Week Generation ---
+        week_end = current_monday + timedelta(days=6)
+        date_str = f"{current_monday.strftime('%b %d')} - {week_end.strftime('%b %d, %Y')}"
 
-        # Action Plan Page
-        action_idx = pdf.page_no() + 1
-        pdf.draw_monthly_action_plan(
-            month_name,
-            TEXT_MONTHLY_ACTION,
+        # We'll use placeholders for week navigation since we don't know page numbers yet
+        prev_week_idx = weeks_data[week_num - 1]["action_idx"] if week_num > 1 else None
+
+        # For 'Next week', we need to use a link ID because the page doesn't exist yet
+        next_week_link_id = pdf.add_link() if week_num < total_weeks else None
+
+        if week_num > 1:
+            # Point the previous week's 'Next' link to this week's Action Plan
+            pdf.set_link(weeks_data[week_num - 1]["next_link_id"], page=pdf.page_no() + 1)
+
+        # --- A. Action Plan ---
+        week_action_idx = pdf.page_no() + 1
+        pdf.set_link(pdf.get_week_link(week_num), page=week_action_idx)
+        pdf.add_page()
+        pdf.draw_background()
+        pdf.draw_dot_grid()
+
+        pdf.draw_instruction_block(
+            title="Action Plan: Week", date_subtitle=date_str, instructions=TEXT_ACTION_PLAN
+        )
+        pdf.draw_navigation_links(
             [
                 ("Index", pdf.link_to_page(index_page_idx)),
-                (
-                    "Prev month",
-                    pdf.link_to_page(
-                        prev_month_data["action_idx"] if prev_month_data else None
-                    ),
-                ),
-                ("Next month", next_month_action_link_id),
-            ],
+                ("Prev week", pdf.link_to_page(prev_week_idx)),
+                ("Next week", next_week_link_id),
+            ]
         )
 
-        months_data[month_key] = {
-            "timeline_idx": timeline_idx,
-            "action_idx": action_idx,
-        }
+        # --- B. Daily Pages ---
+        for day_offset in range(7):
+            day_date = current_monday + timedelta(days=day_offset)
+            day_month_key = (day_date.year, day_date.month)
+            # Use the month data for the specific day, safely
+            day_month_data = months_data.get(day_month_key) or months_data.get(month_key)
+
+            pdf.add_page()
+            pdf.draw_background()
+            pdf.draw_dot_grid()
+
+            # Set the link destination from the Monthly Log
+            link_id = pdf.get_day_link(day_date.year, day_date.month, day_date.day)
+            pdf.set_link(link_id, page=pdf.page_no())
+
+            # Header
+            pdf.set_font(pdf.active_font, size=60 * SCALE)
+            pdf.set_xy(MARGIN_LEFT, 80 * SCALE)
+            pdf.cell(0, 70 * SCALE, f"{day_date.strftime('%A')}")
 
-        last_month_key = month_key
-        prev_month_timeline_link_id = next_month_timeline_link_id
-        prev_month_action_link_id = next_month_action_link_id
-
-    # --- Week Generation ---
-    week_end = current_monday + timedelta(days=6)
-    date_str = f"{current_monday.strftime('%b %d')} - {week_end.strftime('%b %d, %Y')}"
-
-    # We'll use placeholders for week navigation since we don't know page numbers yet
-    prev_week_idx = weeks_data[week_num - 1]["action_idx"] if week_num > 1 else None
-
-    # For 'Next week', we need to use a link ID because the page doesn't exist yet
-    next_week_link_id = pdf.add_link() if week_num < total_weeks else None
-
-    if week_num > 1:
-        # Point the previous week's 'Next' link to this week's Action Plan
-        pdf.set_link(weeks_data[week_num - 1]["next_link_id"], page=pdf.page_no() + 1)
-
-    # --- A. Action Plan ---
-    week_action_idx = pdf.page_no() + 1
-    pdf.set_link(pdf.get_week_link(week_num), page=week_action_idx)
-    pdf.add_page()
-    pdf.draw_background()
-    pdf.draw_dot_grid()
-
-    pdf.draw_instruction_block(
-        title="Action Plan: Week", date_subtitle=date_str, instructions=TEXT_ACTION_PLAN
-    )
-    pdf.draw_navigation_links(
-        [
-            ("Index", pdf.link_to_page(index_page_idx)),
-            ("Prev week", pdf.link_to_page(prev_week_idx)),
-            ("Next week", next_week_link_id),
-        ]
-    )
-
-    # --- B. Daily Pages ---
-    for day_offset in range(7):
-        day_date = current_monday + timedelta(days=day_offset)
-        day_month_key = (day_date.year, day_date.month)
-        # Use the month data for the specific day, safely
-        day_month_data = months_data.get(day_month_key) or months_data.get(month_key)
+            pdf.set_font(pdf.active_font, size=40 * SCALE)
+            pdf.set_xy(MARGIN_LEFT, 150 * SCALE)
+            pdf.cell(0, 40 * SCALE, f"{day_date.strftime('%B %d')}")
 
+            # Navigation Links
+            nav_links = [
+                ("Index", pdf.link_to_page(index_page_idx)),
+                ("Weekly log", pdf.link_to_page(week_action_idx)),
+            ]
+            if day_month_data:
+                nav_links.insert(
+                    1, ("Monthly log", pdf.link_to_page(day_month_data["timeline_idx"]))
+                )
+
+            pdf.draw_navigation_links(nav_links)
+
+        # --- C. Reflection ---
+        week_reflection_idx = pdf.page_no() + 1
         pdf.add_page()
         pdf.draw_background()
         pdf.draw_dot_grid()
 
-        # Set the link destination from the Monthly Log
-        link_id = pdf.get_day_link(day_date.year, day_date.month, day_date.day)
-        pdf.set_link(link_id, page=pdf.page_no())
-
-        # Header
-        pdf.set_font(pdf.active_font, size=60 * SCALE)
-        pdf.set_xy(MARGIN_LEFT, 80 * SCALE)
-        pdf.cell(0, 70 * SCALE, f"{day_date.strftime('%A')}")
-
-        pdf.set_font(pdf.active_font, size=40 * SCALE)
-        pdf.set_xy(MARGIN_LEFT, 150 * SCALE)
-        pdf.cell(0, 40 * SCALE, f"{day_date.strftime('%B %d')}")
-
-        # Navigation Links
-        nav_links = [
-            ("Index", pdf.link_to_page(index_page_idx)),
-            ("Weekly log", pdf.link_to_page(week_action_idx)),
-        ]
-        if day_month_data:
-            nav_links.insert(
-                1, ("Monthly log", pdf.link_to_page(day_month_data["timeline_idx"]))
-            )
+        pdf.draw_instruction_block(
+            title="Reflection: Week", date_subtitle=None, instructions=TEXT_REFLECTION
+        )
+        pdf.draw_navigation_links(
+            [
+                ("Index", pdf.link_to_page(index_page_idx)),
+                ("Prev week", pdf.link_to_page(prev_week_idx)),
+                ("Next week", next_week_link_id),
+            ]
+        )
+
+        weeks_data[week_num] = {
+            "action_idx": week_action_idx,
+            "reflection_idx": week_reflection_idx,
+            "next_link_id": next_week_link_id,
+        }
+
+    # 4. Draw Index Content
+    pdf.draw_index_content(start_date, total_weeks, index_page_idx)
+
+    # 5. Output
+    pdf.output(output_path)
+    return pdf
+
 
-        pdf.draw_navigation_links(nav_links)
-
-    # --- C. Reflection ---
-    week_reflection_idx = pdf.page_no() + 1
-    pdf.add_page()
-    pdf.draw_background()
-    pdf.draw_dot_grid()
-
-    pdf.draw_instruction_block(
-        title="Reflection: Week", date_subtitle=None, instructions=TEXT_REFLECTION
-    )
-    pdf.draw_navigation_links(
-        [
-            ("Index", pdf.link_to_page(index_page_idx)),
-            ("Prev week", pdf.link_to_page(prev_week_idx)),
-            ("Next week", next_week_link_id),
-        ]
-    )
-
-    weeks_data[week_num] = {
-        "action_idx": week_action_idx,
-        "reflection_idx": week_reflection_idx,
-        "next_link_id": next_week_link_id,
-    }
-
-# 4. Draw Index Content
-pdf.draw_index_content(start_date, total_weeks, index_page_idx)
-
-# 5. Output
-pdf.output("bujo_custom_font.pdf")
-print("PDF Generated.")
+if __name__ == "__main__":
+    build()
+    print("PDF Generated.")
@@ -0,0 +1,131 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import bujo.config as config
+from src.diagnostics.memory_profiler import MB, _current_rss_mb
+from src.diagnostics.parity import (
+    BuildStats,
+    ParityInput,
+    ParityLogic,
+    format_parity,
+)
+from src.diagnostics.pdf_inspect import PdfInspector
+
+
+def _timed_build(kind: str, output_path: str, target_year: int) -> dict:
+    """Runs in a fresh process so imports, caches and RSS are not shared."""
+    if kind == "legacy":
+        import bujo.main_legacy as legacy
+
+        def run():
+            legacy.build(
+                output_path,
+                target_year=target_year,
+                font_regular=config.FONT_REGULAR,
+                font_bold=config.FONT_BOLD,
+                font_italic=config.FONT_ITALIC,
+                log=lambda message: None,
+            )
+
+    else:
+        import bujo.main as modular
+
+        def run():
+            modular.build(output_path, target_year=target_year)
+
+    rss_start = _current_rss_mb()
+    t0 = time.perf_counter()
+    run()
+    wall = time.perf_counter() - t0
+    # ru_maxrss is in KB on Linux
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / MB
+    return {"wall_s": wall, "rss_start_mb": rss_start, "rss_peak_mb": rss_peak}
+
+
+def measure(kind: str, output_path: str, target_year: int, repeat: int) -> BuildStats:
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with ctx.Pool(1) as pool:
+            runs.append(pool.apply(_timed_build, (kind, output_path, target_year)))
+    return BuildStats(
+        name=kind,
+        wall_s=min(r["wall_s"] for r in runs),
+        rss_start_mb=min(r["rss_start_mb"] for r in runs),
+        rss_peak_mb=max(r["rss_peak_mb"] for r in runs),
+        size_bytes=os.path.getsize(output_path),
+        pages=0,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the legacy and modular journals side by side and "
+        "compare structure, time, memory and size."
+    )
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--repeat", type=int, default=1, help="Best-of-N wall time.")
+    parser.add_argument(
+        "--out-dir", help="Keep both PDFs here (default: a temporary directory)."
+    )
+    parser.add_argument(
+        "--op-tolerance",
+        type=float,
+        default=0.0,
+        help="Allowed relative difference in operators per page.",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        metavar="RATIO",
+        help="Exit 1 if modular wall time exceeds legacy wall time times RATIO.",
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="Exit 1 on any structural difference."
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = args.out_dir or tmp
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {
+            kind: os.path.join(out_dir, f"bujo_{args.year}_{kind}.pdf")
+            for kind in ("legacy", "modular")
+        }
+        stats = {
+            kind: measure(kind, path, args.year, args.repeat)
+            for kind, path in paths.items()
+        }
+        inspector = PdfInspector()
+        summaries = {kind: inspector.process(path) for kind, path in paths.items()}
+
+    for kind, summary in summaries.items():
+        stats[kind].pages = len(summary.pages)
+    report = ParityLogic().process(
+        ParityInput(
+            reference=summaries["legacy"],
+            candidate=summaries["modular"],
+            op_tolerance=args.op_tolerance,
+        )
+    )
+    print(format_parity(stats["legacy"], stats["modular"], report))
+
+    failed = False
+    if args.strict and not report.ok:
+        print("Structural parity failed")
+        failed = True
+    if args.max_slowdown is not None:
+        ratio = stats["modular"].wall_s / stats["legacy"].wall_s
+        if ratio > args.max_slowdown:
+            print(f"Modular build is {ratio:.2f}x legacy (limit {args.max_slowdown})")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import os
+import re
+import shutil
+import sys
+import time
+from typing import List, Optional
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from src.diagnostics.preview_diff import diff_previews, format_preview_diff
+from src.infrastructure.raster_preview import RasterPreview, encode_png
+
+OUTPUT_DIR = os.path.join("output", "preview")
+
+
+def preview_name(job: journal.PageJob) -> str:
+    """File name of a page's preview: stable while the plan keeps the page."""
+    label = re.sub(r"[^\w.-]+", "_", job.date).strip("_")
+    return f"{label}-{job.kind}-{job.method.replace('draw_', '')}.png"
+
+
+def select_jobs(
+    jobs: List[journal.PageJob], months: List[str], index: bool
+) -> List[journal.PageJob]:
+    """Pages of the given YYYY-MM blocks and/or the index; the first month if none."""
+    phases = {f"content:{month}" for month in months}
+    if index:
+        phases.add("index")
+    if not phases:
+        phases.add(next(job.phase for job in jobs if job.phase != "index"))
+    known = {job.phase for job in jobs}
+    missing = sorted(p.split(":", 1)[1] for p in phases - known if ":" in p)
+    if missing:
+        raise ValueError(f"No month block in the plan for {', '.join(missing)}")
+    return [job for job in jobs if job.phase in phases]
+
+
+def render_previews(
+    out_dir: str,
+    months: Optional[List[str]] = None,
+    index: bool = False,
+    everything: bool = False,
+    scale: float = 0.5,
+    target_year: int = 2026,
+    total_weeks: int = 53,
+) -> List[str]:
+    """Draws the selected pages into PNGs in `out_dir`; returns their paths."""
+    pdf = RasterPreview(
+        format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT), scale=scale
+    )
+    journal.load_fonts(pdf)
+    calendar_model = journal.calendar_for(target_year, total_weeks)
+    journal_map = NavigationSpine(pdf).initialize_links(calendar_model)
+    jobs = journal.plan_pages(
+        calendar_model, journal_map, journal.grid_input_from_config()
+    )
+    if not everything:
+        jobs = select_jobs(jobs, months or [], index)
+    workers = journal.make_workers(pdf)
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for job in jobs:
+        journal.render_page(workers, job)
+        canvas = pdf.finish_page()
+        path = os.path.join(out_dir, preview_name(job))
+        with open(path, "wb") as f:
+            f.write(encode_png(canvas.width, canvas.height, canvas.pixels))
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Draw journal pages as wireframe PNGs without building the PDF: "
+        "shapes and the grid as drawn, text as measured boxes, links outlined."
+    )
+    parser.add_argument(
+        "--month",
+        action="append",
+        default=[],
+        metavar="YYYY-MM",
+        help="Month block to draw (repeatable; default: the first one).",
+    )
+    parser.add_argument("--index", action="store_true", help="Draw the index pages.")
+    parser.add_argument("--all", action="store_true", help="Draw every page.")
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--weeks", type=int, default=53)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=0.5,
+        help="Preview pixels per point (default 0.5: 810x1080).",
+    )
+    parser.add_argument("--out", default=OUTPUT_DIR, help="PNG directory.")
+    parser.add_argument(
+        "--compare",
+        metavar="DIR",
+        help="Previews to compare with (e.g. from the base commit): writes diff "
+        "images to OUT/diff and exits 1 when any page changed.",
+    )
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if os.path.isdir(args.out):
+        # Stale pages would show up as unchanged or added in a comparison
+        for name in os.listdir(args.out):
+            if name.endswith(".png"):
+                os.remove(os.path.join(args.out, name))
+    paths = render_previews(
+        args.out, args.month, args.index, args.all, args.scale, args.year, args.weeks
+    )
+    seconds = time.perf_counter() - t0
+    print(f"{len(paths)} previews written to {args.out} in {seconds:.2f} s")
+
+    if args.compare:
+        diff_dir = os.path.join(args.out, "diff")
+        shutil.rmtree(diff_dir, ignore_errors=True)
+        report = diff_previews(args.compare, args.out, diff_dir)
+        print(format_preview_diff(report))
+        if not report.ok:
+            print(f"Diff images written to {diff_dir}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
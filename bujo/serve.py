@@ -0,0 +1,197 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from src.infrastructure.fork_server import (
+    ForkServer,
+    LatencyPercentiles,
+    LatencyStats,
+    fork_request,
+    format_latency,
+)
+from src.infrastructure.pdf_adapter import FPDFAdapter
+
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), "bujo-build.sock")
+
+Template = Tuple[FPDFAdapter, List[journal.PageJob]]
+
+
+class WarmJournal:
+    """
+    Everything a build needs before its first page, prepared once in the
+    server: documents with the fonts registered and the link spine laid out,
+    the planned pages, and workers whose grid geometry and instruction
+    layouts are already computed. Each forked child draws into its own
+    copy-on-write copy of a template and writes it out; a year or draft mode
+    that was not prepared is set up in the child.
+    """
+
+    def __init__(self, years: List[int], total_weeks: int, drafts: List[bool]):
+        self.year = years[0]
+        self.total_weeks = total_weeks
+        self.templates: Dict[Tuple[int, int, bool], Template] = {
+            (year, total_weeks, draft): self.template(year, total_weeks, draft)
+            for year in years
+            for draft in drafts
+        }
+        self.workers = {draft: self._warm_workers(draft) for draft in drafts}
+
+    @staticmethod
+    def template(year: int, total_weeks: int, draft: bool) -> Template:
+        pdf = FPDFAdapter(
+            format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT),
+            draft=draft,
+            compress_level=config.COMPRESSION_LEVEL,
+            output_threads=config.OUTPUT_THREADS,
+        )
+        journal.load_fonts(pdf)
+        calendar_model = journal.calendar_for(year, total_weeks)
+        journal_map = NavigationSpine(pdf).initialize_links(calendar_model)
+        grid_input = journal.grid_input_from_config(draft)
+        return pdf, journal.plan_pages(calendar_model, journal_map, grid_input)
+
+    def _warm_workers(self, draft: bool) -> Dict[str, Any]:
+        # One page of every layout on a scratch document fills the caches
+        scratch, jobs = self.template(self.year, self.total_weeks, draft)
+        workers = journal.make_workers(scratch)
+        seen = set()
+        for job in jobs:
+            if (job.kind, job.method) not in seen:
+                seen.add((job.kind, job.method))
+                journal.render_page(workers, job)
+        return workers
+
+    def build(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs in the forked child: render the pages, write the file."""
+        t0 = time.perf_counter()
+        output = request.get("output")
+        if not output:
+            raise ValueError("request needs an 'output' path")
+        year = int(request.get("year", self.year))
+        total_weeks = int(request.get("weeks", self.total_weeks))
+        draft = bool(request.get("draft", False))
+
+        key = (year, total_weeks, draft)
+        pdf, jobs = self.templates.get(key) or self.template(*key)
+        workers = self.workers.get(draft) or journal.make_workers(pdf)
+        for worker in workers.values():
+            worker.bind(pdf)
+        for job in jobs:
+            journal.render_page(workers, job)
+        link_issues = len(pdf.lint_links().issues) if config.LINK_LINT else None
+        if config.CONTENT_DEDUP:
+            pdf.hoist_repeated_content()
+        pdf.output(output)
+        return {
+            "output": output,
+            "pages": pdf.page_no(),
+            "link_issues": link_issues,
+            "seconds": time.perf_counter() - t0,
+        }
+
+
+def serve(
+    socket_path: str = SOCKET_PATH,
+    years: Sequence[int] = (2026,),
+    total_weeks: int = 53,
+    drafts: Sequence[bool] = (False,),
+    max_children: Optional[int] = None,
+):
+    t0 = time.perf_counter()
+    warm = WarmJournal(list(years), total_weeks, list(drafts))
+    print(f"Warmed up in {time.perf_counter() - t0:.2f} s")
+    ForkServer(socket_path, warm.build, max_children=max_children).serve()
+
+
+def _client(args) -> int:
+    if args.command == "stats":
+        reply = fork_request(args.socket, {"command": "stats"})
+        print(format_latency(LatencyStats(**reply.result)))
+        return 0
+    if args.command == "stop":
+        fork_request(args.socket, {"command": "stop"})
+        print("Server stopping")
+        return 0
+
+    request = {
+        "output": os.path.abspath(args.output),
+        "weeks": args.weeks,
+        "draft": args.draft,
+    }
+    if args.year is not None:
+        request["year"] = args.year
+    latencies = []
+    failed = 0
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        reply = fork_request(args.socket, request)
+        latencies.append(time.perf_counter() - t0)
+        if not reply.ok:
+            failed += 1
+            print(f"Build failed: {reply.error}")
+            continue
+        result = reply.result
+        print(
+            f"PDF Generated: {result['output']} ({result['pages']} pages, "
+            f"rendered in {result['seconds'] * 1000:.0f} ms, "
+            f"{latencies[-1] * 1000:.0f} ms round trip)"
+        )
+        if result.get("link_issues"):
+            print(f"{result['link_issues']} link issues: run bujo.main for details")
+    if args.repeat > 1:
+        print(format_latency(LatencyPercentiles().process(latencies, failed)))
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Fork server for low-latency journal builds: one warm process "
+        "forks a child per build request received on a Unix socket."
+    )
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", help="Warm up and serve build requests.")
+    start.add_argument(
+        "--years", nargs="+", type=int, default=[2026], help="Years to prepare."
+    )
+    start.add_argument("--weeks", type=int, default=53)
+    start.add_argument(
+        "--draft", action="store_true", help="Prepare draft builds as well."
+    )
+    start.add_argument(
+        "--max-children",
+        type=int,
+        help="Builds running at once (default: CPU count).",
+    )
+
+    build = commands.add_parser("build", help="Ask a running server for a build.")
+    build.add_argument("--output", default=journal.OUTPUT_PATH)
+    build.add_argument("--year", type=int, help="Default: the first prepared year.")
+    build.add_argument("--weeks", type=int, default=53)
+    build.add_argument("--draft", action="store_true")
+    build.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Send the request N times and print round-trip percentiles.",
+    )
+
+    commands.add_parser("stats", help="Print the server's latency percentiles.")
+    commands.add_parser("stop", help="Stop the server after running builds finish.")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        drafts = [False, True] if args.draft else [False]
+        serve(args.socket, args.years, args.weeks, drafts, args.max_children)
+        return
+    sys.exit(_client(args))
+
+
+if __name__ == "__main__":
+    main()
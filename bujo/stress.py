@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import tempfile
+import bujo.config as config
+from src.diagnostics.scaling import ScalingFitter, format_scaling, measure_case
+
+
+def build_case(output_path: str, years: int = 1, grid_size: int = 45) -> int:
+    """One stress build, run in a fresh process by `measure_case`."""
+    import bujo.main as journal
+
+    config.GRID_SIZE = grid_size
+    config.SIZE_MONTHLY_TIMELINE_DAY = int(grid_size * 0.7 * config.FONT_SCALE)
+    pdf = journal.build(output_path, total_weeks=52 * years + 1)
+    return pdf.page_no()
+
+
+def grid_cells(grid_size: int) -> int:
+    return (config.CANVAS_WIDTH // grid_size) * (config.CANVAS_HEIGHT // grid_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the journal at growing sizes and fail when build "
+        "time, peak memory, file size or operator count grows super-linearly."
+    )
+    parser.add_argument("--years", nargs="+", type=int, default=[1, 5, 10])
+    parser.add_argument("--grid-sizes", nargs="+", type=int, default=[45, 30, 15])
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed growth exponent above 1 (default 0.15).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Builds per case; time and memory are their medians (default 3).",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write the reports as JSON.")
+    args = parser.parse_args(argv)
+
+    target = "bujo.stress:build_case"
+    fitter = ScalingFitter()
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stress.pdf")
+        samples = [
+            measure_case(
+                target, f"years={y}", path, {"years": y}, repeats=args.repeats
+            )
+            for y in args.years
+        ]
+        reports.append(fitter.process("years", "pages", samples, args.tolerance))
+
+        samples = [
+            measure_case(
+                target,
+                f"grid={g}",
+                path,
+                {"grid_size": g},
+                scale=grid_cells(g),
+                repeats=args.repeats,
+            )
+            for g in args.grid_sizes
+        ]
+        reports.append(
+            fitter.process("grid size", "grid cells", samples, args.tolerance)
+        )
+
+    print("\n\n".join(format_scaling(r) for r in reports))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write("[" + ",".join(r.model_dump_json() for r in reports) + "]")
+
+    failed = [
+        f"{r.group}: {f.metric}" for r in reports for f in r.fits if f.super_linear
+    ]
+    if failed:
+        print(f"Super-linear growth: {', '.join(failed)}")
+        sys.exit(1)
+    print("Scaling OK")
+
+
+if __name__ == "__main__":
+    main()
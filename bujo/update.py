@@ -0,0 +1,148 @@
+import argparse
+import os
+import time
+from datetime import timedelta
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from src.infrastructure.incremental_pdf import (
+    IncrementalWriter,
+    PlanAligner,
+    UpdateReport,
+    read_plan,
+    write_plan,
+)
+from src.infrastructure.pdf_adapter import FPDFAdapter
+
+WEEKS_PER_PLAN = 53
+
+
+def weeks_through(first_year: int, target_year: int) -> int:
+    """Weeks from the first Monday of `first_year`'s plan to the end of
+    `target_year`'s plan."""
+    start = journal.calendar_for(first_year, 1).start_date
+    last = journal.calendar_for(target_year, 1).start_date
+    return (last - start) // timedelta(weeks=1) + WEEKS_PER_PLAN
+
+
+def update_journal(
+    path: str,
+    target_year: int = 2026,
+    total_weeks: int = WEEKS_PER_PLAN,
+    draft: bool = False,
+) -> UpdateReport:
+    """
+    Brings `path` up to date with the journal's current plan by appending an
+    incremental update. The pages are planned first and compared with the
+    plan recorded next to the file (see journal.page_plan): only changed
+    and new pages are drawn, and nothing at all when no page changed.
+    Without a usable record (another config, drawing code or link layout)
+    the whole journal is rebuilt and compared page by page.
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"{path} does not exist: build it first")
+    with open(path, "rb") as f:
+        data = f.read()
+
+    pdf = FPDFAdapter(
+        format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT),
+        draft=draft,
+        compress_level=config.COMPRESSION_LEVEL,
+        output_threads=config.OUTPUT_THREADS,
+    )
+    journal.load_fonts(pdf)
+    calendar_model = journal.calendar_for(target_year, total_weeks)
+    journal_map = NavigationSpine(pdf).initialize_links(calendar_model)
+    grid_input = journal.grid_input_from_config(draft)
+    jobs = journal.plan_pages(calendar_model, journal_map, grid_input)
+    plan = journal.page_plan(pdf, jobs, draft)
+
+    recorded = read_plan(path, data)
+    alignment = (
+        PlanAligner().process(recorded, plan) if recorded is not None else None
+    )
+    if alignment is None:
+        rebuilt = journal.build(None, target_year, total_weeks, draft=draft)
+        report = IncrementalWriter(path).update(rebuilt.output_bytes())
+    elif not (alignment.replaced or alignment.added or alignment.dropped):
+        return UpdateReport(
+            path=path,
+            original_bytes=len(data),
+            appended_bytes=0,
+            pages=len(jobs),
+            kept=len(jobs),
+            replaced=0,
+            added=0,
+            dropped=0,
+            objects=0,
+        )
+    else:
+        # Kept pages stay blank: the update section never reads them
+        changed = {j for j, _ in alignment.replaced} | set(alignment.added)
+        workers = journal.make_workers(pdf)
+        for j, job in enumerate(jobs):
+            if j in changed:
+                journal.render_page(workers, job)
+            else:
+                pdf.add_page()
+        if config.CONTENT_DEDUP:
+            pdf.hoist_repeated_content()
+        report = IncrementalWriter(path).update(pdf.output_bytes(), alignment)
+    write_plan(path, plan)
+    return report
+
+
+def extend_journal(
+    path: str, first_year: int, target_year: int, draft: bool = False
+) -> UpdateReport:
+    """
+    Appends the weeks of `target_year` to a journal that starts in
+    `first_year`. The index pages and the pages whose next-week or
+    next-month links now lead into the new year are replaced in place.
+    """
+    if target_year <= first_year:
+        raise ValueError(f"target year {target_year} must follow {first_year}")
+    weeks = weeks_through(first_year, target_year)
+    return update_journal(path, first_year, weeks, draft=draft)
+
+
+def format_update(report: UpdateReport) -> str:
+    if not report.appended_bytes:
+        return f"{report.path}: no page changed, nothing written"
+    return (
+        f"{report.path}: {report.pages} pages ({report.kept} kept, "
+        f"{report.replaced} replaced, {report.added} added, {report.dropped} "
+        f"dropped); appended {report.objects} objects, "
+        f"{report.appended_bytes / 1024:.0f} KB to "
+        f"{report.original_bytes / 1024:.0f} KB"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Update a generated journal in place by appending an "
+        "incremental-update section: the original bytes stay untouched and "
+        "only changed or new pages are written."
+    )
+    parser.add_argument("path", nargs="?", default=journal.OUTPUT_PATH)
+    parser.add_argument("--year", type=int, default=2026, help="First year.")
+    parser.add_argument("--weeks", type=int, default=WEEKS_PER_PLAN)
+    parser.add_argument(
+        "--extend-to",
+        type=int,
+        metavar="YEAR",
+        help="Append the weeks of YEAR (and any year in between).",
+    )
+    parser.add_argument("--draft", action="store_true")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.extend_to is not None:
+        report = extend_journal(args.path, args.year, args.extend_to, args.draft)
+    else:
+        report = update_journal(args.path, args.year, args.weeks, args.draft)
+    print(f"{format_update(report)} in {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
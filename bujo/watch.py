@@ -0,0 +1,151 @@
+import inspect
+import time
+from typing import Dict, List, Set
+import bujo.config as config
+import bujo.main as journal
+from bujo.logic.journal_map import NavigationSpine
+from src.infrastructure.pdf_adapter import FPDFAdapter
+from src.infrastructure.watch import (
+    FileWatcher,
+    RebuildReport,
+    atomic_write,
+    config_references,
+    reload_config,
+    watch_loop,
+)
+
+# Changing any of these needs a new document: page size or embedded fonts
+FULL_REBUILD_NAMES = {
+    "CANVAS_WIDTH",
+    "CANVAS_HEIGHT",
+    "FONT_NAME",
+    "FONT_DIR",
+    "FONT_REGULAR",
+    "FONT_BOLD",
+    "FONT_ITALIC",
+}
+# Only change how pages are written: re-output without redrawing anything
+OUTPUT_NAMES = {"COMPRESSION_LEVEL", "OUTPUT_THREADS"}
+
+
+class JournalSession:
+    """
+    Keeps a built journal in memory (fonts parsed, calendar and link spine
+    computed, every page's worker input planned) and brings it up to date
+    after an edit by re-rendering only the pages that can have changed:
+    those whose planned input differs, and every page of a kind whose worker
+    reads a changed config constant.
+    """
+
+    def __init__(
+        self, output_path: str, target_year: int, total_weeks: int, draft: bool
+    ):
+        self.output_path = output_path
+        self.target_year = target_year
+        self.total_weeks = total_weeks
+        self.draft = draft
+        self.full_build()
+
+    def full_build(self):
+        self.pdf = FPDFAdapter(
+            format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT), draft=self.draft
+        )
+        journal.load_fonts(self.pdf)
+        self.calendar_model = journal.calendar_for(self.target_year, self.total_weeks)
+        self.journal_map = NavigationSpine(self.pdf).initialize_links(
+            self.calendar_model
+        )
+        self.workers = journal.make_workers(self.pdf)
+        self.jobs = self._plan()
+        for job in self.jobs:
+            journal.render_page(self.workers, job)
+        if config.LINK_LINT:
+            self.pdf.lint_links()
+        self.config_reads = self._config_reads()
+        self.write()
+
+    def write(self):
+        self.pdf.compress_level = config.COMPRESSION_LEVEL
+        self.pdf.output_threads = config.OUTPUT_THREADS
+        atomic_write(self.output_path, self.pdf.output_bytes())
+
+    def _plan(self) -> List[journal.PageJob]:
+        grid_input = journal.grid_input_from_config(self.draft)
+        return journal.plan_pages(self.calendar_model, self.journal_map, grid_input)
+
+    def _config_reads(self) -> Dict[str, Set[str]]:
+        # Worker classes read config at draw time; base classes count too
+        reads = {}
+        for kind, worker in self.workers.items():
+            modules = {
+                inspect.getmodule(cls)
+                for cls in type(worker).__mro__
+                if cls is not object
+            }
+            reads[kind] = config_references(modules)
+        return reads
+
+    def apply(self, paths: List[str]) -> RebuildReport:
+        t0 = time.perf_counter()
+        fonts_changed = any(not path.endswith(".py") for path in paths)
+        changed = reload_config(config)
+        jobs = self._plan()
+        same_pages = [(j.kind, j.method) for j in jobs] == [
+            (j.kind, j.method) for j in self.jobs
+        ]
+        if fonts_changed or FULL_REBUILD_NAMES & set(changed) or not same_pages:
+            self.full_build()
+            return self._report(
+                paths, changed, sorted(self.workers), len(self.jobs), True, t0
+            )
+
+        kinds = {
+            kind for kind, names in self.config_reads.items() if names & set(changed)
+        }
+        # Recorded blocks were drawn from the old values
+        self.pdf.clear_replays()
+        redrawn = set()
+        pages = set()
+        for page_no, (old, new) in enumerate(zip(self.jobs, jobs), start=1):
+            if new.kind in kinds or new.data != old.data:
+                self.pdf.redraw_page(page_no)
+                journal.render_page(self.workers, new)
+                redrawn.add(new.kind)
+                pages.add(page_no)
+        self.jobs = jobs
+        if pages:
+            # Blocks recorded from the old values that no page draws any more
+            self.pdf.prune_shared_blocks()
+            if config.LINK_LINT:
+                self.pdf.lint_links(pages)
+        if pages or OUTPUT_NAMES & set(changed):
+            self.write()
+        return self._report(paths, changed, sorted(redrawn), len(pages), False, t0)
+
+    def _report(self, paths, changed, kinds, pages, full, t0) -> RebuildReport:
+        lint = self.pdf.link_report if config.LINK_LINT and pages else None
+        return RebuildReport(
+            paths=paths,
+            changed_names=changed,
+            kinds=kinds,
+            pages=pages,
+            full=full,
+            seconds=time.perf_counter() - t0,
+            link_issues=len(lint.issues) if lint is not None else None,
+        )
+
+
+def watch(
+    output_path: str = journal.OUTPUT_PATH,
+    target_year: int = 2026,
+    total_weeks: int = 53,
+    draft: bool = False,
+):
+    t0 = time.perf_counter()
+    session = JournalSession(output_path, target_year, total_weeks, draft)
+    print(
+        f"Built {len(session.jobs)} pages in {time.perf_counter() - t0:.2f} s: "
+        f"{output_path}"
+    )
+    watcher = FileWatcher([config.__file__, config.FONT_DIR])
+    watch_loop(watcher, session.apply)
@@ -1,22 +1,104 @@
+from typing import Dict, List, Sequence, Tuple
 from src.infrastructure.interfaces import PDFInterface
+from src.layout.layout_manager import LayoutManager, Region, ToolbarSide
 from src.workers.grid_worker import GridWorker, GridInput
 import bujo.config as config
 
 
+def header_region(margin_left: float, title_h: float, subtitle_h: float = 0) -> Region:
+    """Title (and subtitle) band, from the margin to the nav link column."""
+    if subtitle_h:
+        bottom = config.Y_HEADER_SUBTITLE + subtitle_h
+    else:
+        bottom = config.Y_HEADER_TITLE + title_h
+    return Region(
+        x=margin_left,
+        y=config.Y_HEADER_TITLE,
+        w=config.X_NAV_LINKS_RIGHT - margin_left,
+        h=bottom - config.Y_HEADER_TITLE,
+    )
+
+
+def nav_region(links: Sequence, start_x: float, start_y: float) -> Region:
+    # Sized for every slot, so pages of a kind share one mask
+    return Region(
+        x=start_x,
+        y=start_y,
+        w=config.CANVAS_WIDTH - start_x,
+        h=len(links) * (config.LINE_HEIGHT_NAV_LINKS + 10),
+    )
+
+
 class BaseWorker:
     def __init__(self, pdf: PDFInterface):
         self.pdf = pdf
         self.grid_worker = GridWorker(pdf)
+        # (instructions, font size, line height) -> (y_start, text height)
+        self._instruction_layouts: Dict[Tuple[str, int, int], Tuple[float, float]] = {}
+        # Set to a TemplateCollector to export paper and grid as device
+        # templates instead of drawing them
+        self.templates = None
+
+    def bind(self, pdf: PDFInterface):
+        """
+        Draws on another document from now on. Grid geometry and instruction
+        layouts stay cached: they depend on config and font metrics only.
+        """
+        self.pdf = pdf
+        self.grid_worker.pdf = pdf
+
+    def draw_common_elements(
+        self, grid_input: GridInput, exclusions: Sequence[Region] = ()
+    ):
+        # Grid, minus the areas this page draws over
+        if config.GRID_MASK:
+            grid_input = grid_input.model_copy(
+                update={"exclusions": self._grid_exclusions(grid_input, exclusions)}
+            )
+        if self.templates is not None:
+            return self._template_background(grid_input)
 
-    def draw_common_elements(self, grid_input: GridInput):
         # Background
         self.pdf.set_fill_color(*config.COLOR_PAPER)
         self.pdf.rect(0, 0, config.CANVAS_WIDTH, config.CANVAS_HEIGHT, "F")
 
-        # Grid
         grid_output = self.grid_worker.draw_grid(grid_input, config.COLOR_DOTS)
         return grid_output
 
+    def _template_background(self, grid_input: GridInput):
+        # The page stays transparent: paper and grid go to the template
+        grid_output = self.grid_worker.calculate(grid_input)
+        self.templates.add_page(
+            self.pdf.page_no(),
+            type(self).__name__.replace("Worker", "").lower(),
+            (grid_input.model_dump_json(), config.COLOR_PAPER, config.COLOR_DOTS),
+            self.grid_worker.geometry(grid_input, grid_output),
+            config.COLOR_PAPER,
+            config.COLOR_DOTS,
+            grid_input.line_width,
+        )
+        return grid_output
+
+    def _grid_exclusions(
+        self, grid_input: GridInput, exclusions: Sequence[Region]
+    ) -> List[Region]:
+        p = config.GRID_MASK_PADDING
+        regions = [
+            Region(x=r.x - p, y=r.y - p, w=r.w + 2 * p, h=r.h + 2 * p)
+            for r in exclusions
+        ]
+        if config.GRID_MASK_TOOLBAR:
+            safe_zone = LayoutManager.calculate_safe_zone(
+                config.CANVAS_WIDTH,
+                config.CANVAS_HEIGHT,
+                grid_input.toolbar_buffer,
+                ToolbarSide.LEFT,
+            )
+            regions += LayoutManager.toolbar_regions(
+                safe_zone, config.CANVAS_WIDTH, config.CANVAS_HEIGHT
+            )
+        return regions
+
     def draw_navigation_links(self, links, font_name, start_x, start_y):
         self.pdf.set_font(font_name, size=config.SIZE_NAV_LINKS)
         self.pdf.set_text_color(*config.COLOR_TEXT)
@@ -42,16 +124,41 @@ class BaseWorker:
             self.pdf.set_xy(margin_left, config.Y_HEADER_SUBTITLE)
             self.pdf.cell(0, config.SIZE_INSTRUCT_SUBTITLE, subtitle)
 
-        # Instructions (Bottom)
+        # Instructions (Bottom): identical on every page of a kind, so drawn
+        # once and replayed
         if instructions:
-            self._set_instruction_font()
-            self.pdf.set_text_color(*config.COLOR_INSTRUCT)
+            self.pdf.replay(
+                ("instructions", instructions),
+                lambda: self._draw_instructions(instructions),
+            )
 
-            line_height = config.LINE_HEIGHT_INSTRUCT_TEXT
-            margin = 80
-            width = config.CANVAS_WIDTH - margin * 2
+        # Reset color
+        self.pdf.set_text_color(*config.COLOR_TEXT)
 
-            # Calculate height
+    def instruction_region(self, instructions: str) -> Region:
+        """Separator, bolt and text of the bottom instruction block."""
+        margin = 80
+        y_start, h = self._instruction_layout(instructions)
+        return Region(
+            x=margin,
+            y=y_start - 20,
+            w=config.CANVAS_WIDTH - margin * 2,
+            h=h + 20,
+        )
+
+    def _instruction_layout(self, instructions: str) -> Tuple[float, float]:
+        # Measuring needs the instruction font; set it on every call so the
+        # graphics state after this doesn't depend on the cache
+        self._set_instruction_font()
+        key = (
+            instructions,
+            config.SIZE_INSTRUCT_TEXT,
+            config.LINE_HEIGHT_INSTRUCT_TEXT,
+        )
+        layout = self._instruction_layouts.get(key)
+        if layout is None:
+            line_height = config.LINE_HEIGHT_INSTRUCT_TEXT
+            width = config.CANVAS_WIDTH - 80 * 2
             lines = self.pdf.multi_cell(
                 width - 60,
                 line_height,
@@ -60,36 +167,42 @@ class BaseWorker:
                 output="LINES",
             )
             h = len(lines) * line_height
-
-            y_start = config.CANVAS_HEIGHT - h - 100
-
-            # Draw horizontal line
-            self.pdf.set_text_color(*config.COLOR_DOTS)  # Using dot color for line
-            self.pdf.line(
-                margin, y_start - 20, config.CANVAS_WIDTH - margin, y_start - 20
+            layout = self._instruction_layouts[key] = (
+                config.CANVAS_HEIGHT - h - 100,
+                h,
             )
-
-            # Draw lightning bolt (simple polygon)
-            self.pdf.set_fill_color(*config.COLOR_TEXT)
-            bx, by = margin, y_start
-            self.pdf.polygon(
-                [
-                    (bx + 10, by),
-                    (bx, by + 20),
-                    (bx + 8, by + 20),
-                    (bx + 2, by + 40),
-                    (bx + 15, by + 15),
-                    (bx + 7, by + 15),
-                    (bx + 12, by),
-                ],
-                style="F",
-            )
-
-            self.pdf.set_xy(margin + 40, y_start)
-            self.pdf.multi_cell(width - 40, line_height, instructions, align="L")
-
-        # Reset color
-        self.pdf.set_text_color(*config.COLOR_TEXT)
+        return layout
+
+    def _draw_instructions(self, instructions):
+        y_start, _ = self._instruction_layout(instructions)
+        self.pdf.set_text_color(*config.COLOR_INSTRUCT)
+
+        line_height = config.LINE_HEIGHT_INSTRUCT_TEXT
+        margin = 80
+        width = config.CANVAS_WIDTH - margin * 2
+
+        # Draw horizontal line
+        self.pdf.set_text_color(*config.COLOR_DOTS)  # Using dot color for line
+        self.pdf.line(margin, y_start - 20, config.CANVAS_WIDTH - margin, y_start - 20)
+
+        # Draw lightning bolt (simple polygon)
+        self.pdf.set_fill_color(*config.COLOR_TEXT)
+        bx, by = margin, y_start
+        self.pdf.polygon(
+            [
+                (bx + 10, by),
+                (bx, by + 20),
+                (bx + 8, by + 20),
+                (bx + 2, by + 40),
+                (bx + 15, by + 15),
+                (bx + 7, by + 15),
+                (bx + 12, by),
+            ],
+            style="F",
+        )
+
+        self.pdf.set_xy(margin + 40, y_start)
+        self.pdf.multi_cell(width - 40, line_height, instructions, align="L")
 
     def _set_instruction_font(self):
         # Try to use Italic if available, else Regular
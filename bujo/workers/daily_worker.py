@@ -1,17 +1,47 @@
+import calendar
 from pydantic import BaseModel
 from src.infrastructure.interfaces import PDFInterface
-from bujo.workers.base_worker import BaseWorker
+from bujo.workers.base_worker import BaseWorker, header_region, nav_region
+from src.layout.layout_manager import Region
 from src.workers.grid_worker import GridInput
 from datetime import date
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import bujo.config as config
 
+# "M", "T", ... Monday first, like the journal weeks
+WEEKDAY_INITIALS = [name[0] for name in calendar.day_abbr]
+
 
 # --- SECTION A: DATA CONTRACTS ---
+class MiniCalendarInput(BaseModel):
+    """One month; every daily page of the month shares the same instance."""
+
+    year: int
+    month: int
+    first_weekday: int  # Monday == 0
+    day_links: List[Optional[int]]  # one per day of the month
+    x: float  # top-left corner of the weekday initials row
+    y: float
+    cell_w: float
+    cell_h: float
+
+
+class MiniCalendarOutput(BaseModel):
+    label_xs: List[float]  # weekday initials
+    label_y: float
+    day_xs: List[float]  # cell origins, index = day - 1
+    day_ys: List[float]
+    link_areas: List[Tuple[float, float, float, float]]  # (x, y, w, h) per day
+    region: Region  # six weeks, whatever the month: one grid mask for all
+
+
 class DailyInput(BaseModel):
     day_date: date
+    title: str  # Pre-rendered weekday, e.g. "Monday"
+    subtitle: str  # Pre-rendered date, e.g. "January 05"
     nav_links: List[Tuple[str, Optional[int]]]  # (label, link_id)
     grid_input: GridInput
+    mini_calendar: Optional[MiniCalendarInput] = None
 
 
 class DailyOutput(BaseModel):
@@ -33,33 +63,142 @@ class DailyLogic:
         )
 
 
+class MiniCalendarLogic:
+    """Cell positions and link areas of a month: weekday initials, then weeks."""
+
+    def process(self, data: MiniCalendarInput) -> MiniCalendarOutput:
+        day_xs = []
+        day_ys = []
+        for i in range(len(data.day_links)):
+            row, column = divmod(data.first_weekday + i, 7)
+            day_xs.append(data.x + column * data.cell_w)
+            day_ys.append(data.y + (row + 1) * data.cell_h)
+        return MiniCalendarOutput(
+            label_xs=[data.x + column * data.cell_w for column in range(7)],
+            label_y=data.y,
+            day_xs=day_xs,
+            day_ys=day_ys,
+            link_areas=[
+                (x, y, data.cell_w, data.cell_h) for x, y in zip(day_xs, day_ys)
+            ],
+            region=Region(x=data.x, y=data.y, w=7 * data.cell_w, h=7 * data.cell_h),
+        )
+
+
 # --- SECTION C: WORKFLOW ---
 class DailyWorker(BaseWorker):
     def __init__(self, pdf: PDFInterface):
         super().__init__(pdf)
         self.logic = DailyLogic()
+        self.mini_calendar_logic = MiniCalendarLogic()
+        # Month and geometry -> layout: computed once per month
+        self._mini_calendars: Dict[tuple, MiniCalendarOutput] = {}
 
     def draw_page(self, data: DailyInput):
         output = self.logic.process(data)
+        mini_calendar = None
+        if data.mini_calendar is not None:
+            mini_calendar = self._mini_calendar_layout(data.mini_calendar)
 
         self.pdf.add_page()
 
         # Common elements (Background + Grid)
-        self.draw_common_elements(data.grid_input)
+        self.draw_common_elements(
+            data.grid_input,
+            [
+                header_region(
+                    data.grid_input.toolbar_buffer,
+                    config.LINE_HEIGHT_DAILY_TITLE,
+                    config.LINE_HEIGHT_DAILY_SUBTITLE,
+                ),
+                nav_region(data.nav_links, output.nav_start_x, output.nav_start_y),
+            ]
+            + ([mini_calendar.region] if mini_calendar is not None else []),
+        )
 
         # Header
         self.pdf.set_text_color(*config.COLOR_TEXT)
         self.pdf.set_font(config.FONT_NAME, "B", size=config.SIZE_DAILY_TITLE)
         self.pdf.set_xy(data.grid_input.toolbar_buffer, output.title_y)
-        self.pdf.cell(0, config.LINE_HEIGHT_DAILY_TITLE, data.day_date.strftime("%A"))
+        self.pdf.cell(0, config.LINE_HEIGHT_DAILY_TITLE, data.title)
 
         self.pdf.set_font(config.FONT_NAME, size=config.SIZE_DAILY_SUBTITLE)
         self.pdf.set_xy(data.grid_input.toolbar_buffer, output.subtitle_y)
-        self.pdf.cell(
-            0, config.LINE_HEIGHT_DAILY_SUBTITLE, data.day_date.strftime("%B %d")
-        )
+        self.pdf.cell(0, config.LINE_HEIGHT_DAILY_SUBTITLE, data.subtitle)
 
         # Navigation Links
         self.draw_navigation_links(
             data.nav_links, config.FONT_NAME, output.nav_start_x, output.nav_start_y
         )
+
+        if mini_calendar is not None:
+            self.draw_mini_calendar(
+                data.mini_calendar, mini_calendar, data.day_date.day
+            )
+
+    def _mini_calendar_layout(self, data: MiniCalendarInput) -> MiniCalendarOutput:
+        key = (
+            data.year,
+            data.month,
+            data.first_weekday,
+            len(data.day_links),
+            data.x,
+            data.y,
+            data.cell_w,
+            data.cell_h,
+        )
+        layout = self._mini_calendars.get(key)
+        if layout is None:
+            layout = self._mini_calendars[key] = self.mini_calendar_logic.process(
+                data
+            )
+        return layout
+
+    def draw_mini_calendar(
+        self, data: MiniCalendarInput, layout: MiniCalendarOutput, today: int
+    ):
+        # Per page: the highlight under today's number and the day links.
+        # The initials and numbers are one shared block per month.
+        self.pdf.set_fill_color(*config.COLOR_MINI_CALENDAR_TODAY)
+        self.pdf.rect(
+            layout.day_xs[today - 1] + 2,
+            layout.day_ys[today - 1] + 2,
+            data.cell_w - 4,
+            data.cell_h - 4,
+            "F",
+        )
+        key = (
+            "mini_calendar",
+            data.year,
+            data.month,
+            tuple(layout.day_xs),
+            tuple(layout.day_ys),
+            config.SIZE_MINI_CALENDAR,
+            config.COLOR_INSTRUCT,
+            config.COLOR_TEXT,
+        )
+        self.pdf.use_shared(
+            self.pdf.shared_block(key, lambda: self._draw_mini_calendar(layout, data))
+        )
+        self.pdf.link_areas(layout.link_areas, data.day_links)
+
+    def _draw_mini_calendar(self, layout: MiniCalendarOutput, data: MiniCalendarInput):
+        self.pdf.set_font(config.FONT_NAME, size=config.SIZE_MINI_CALENDAR)
+        self.pdf.set_text_color(*config.COLOR_INSTRUCT)
+        self.pdf.text_cells(
+            layout.label_xs,
+            [layout.label_y] * 7,
+            data.cell_w,
+            data.cell_h,
+            WEEKDAY_INITIALS,
+            align="C",
+        )
+        self.pdf.set_text_color(*config.COLOR_TEXT)
+        self.pdf.text_cells(
+            layout.day_xs,
+            layout.day_ys,
+            data.cell_w,
+            data.cell_h,
+            [str(day) for day in range(1, len(layout.day_xs) + 1)],
+            align="C",
+        )
@@ -1,9 +1,9 @@
 from pydantic import BaseModel
 from src.infrastructure.interfaces import PDFInterface
-from bujo.workers.base_worker import BaseWorker
+from bujo.workers.base_worker import BaseWorker, header_region
+from src.layout.layout_manager import Region
 from src.workers.grid_worker import GridInput
-from datetime import date, timedelta
-import calendar
+from datetime import date
 from typing import List, Tuple, Optional
 import bujo.config as config
 
@@ -16,8 +16,8 @@ class IndexInput(BaseModel):
     month_links: List[Tuple[str, Optional[int]]]  # (name, link_id)
     week_links: List[Tuple[str, Optional[int]]]  # (label, link_id)
     daily_links: List[
-        Tuple[str, int, List[Tuple[int, Optional[int]]]]
-    ]  # (month_name, year, [(day, link_id)])
+        Tuple[str, int, int, List[Tuple[int, Optional[int]]]]
+    ]  # (month_name, year, first_weekday, [(day, link_id)])
 
 
 class IndexOutput(BaseModel):
@@ -53,7 +53,29 @@ class IndexWorker(BaseWorker):
     def draw_months_and_weeks(self, data: IndexInput):
         output = self.logic.process(data)
         self.pdf.add_page()
-        self.draw_common_elements(data.grid_input)
+        margin_left = data.grid_input.toolbar_buffer
+        section_h = int(config.SIZE_INDEX_SECTION_TITLE * 1.5)
+        half_weeks = (len(data.week_links) + 1) // 2
+        self.draw_common_elements(
+            data.grid_input,
+            [
+                self._header(data),
+                Region(
+                    x=margin_left,
+                    y=output.y_start,
+                    w=output.month_col_w,
+                    h=section_h
+                    + 10
+                    + len(data.month_links) * config.LINE_HEIGHT_INDEX_MONTH,
+                ),
+                Region(
+                    x=output.week_col1_x,
+                    y=output.y_start,
+                    w=output.week_col2_x + output.week_col_w - output.week_col1_x,
+                    h=section_h + 10 + half_weeks * config.LINE_HEIGHT_INDEX_WEEK,
+                ),
+            ],
+        )
 
         self.draw_instruction_block(
             "Index", "Months & Weeks", None, data.grid_input.toolbar_buffer
@@ -70,12 +92,14 @@ class IndexWorker(BaseWorker):
 
         self.pdf.set_font(config.FONT_NAME, size=config.SIZE_INDEX_MONTH_NAME)
         y += section_h + 10
-        for name, link in data.month_links:
-            self.pdf.set_xy(margin_left, y)
-            self.pdf.cell(
-                output.month_col_w, config.LINE_HEIGHT_INDEX_MONTH, name, link=link
-            )
-            y += config.LINE_HEIGHT_INDEX_MONTH
+        self.pdf.text_cells(
+            [margin_left] * len(data.month_links),
+            [y + i * config.LINE_HEIGHT_INDEX_MONTH for i in range(len(data.month_links))],
+            output.month_col_w,
+            config.LINE_HEIGHT_INDEX_MONTH,
+            [name for name, _ in data.month_links],
+            links=[link for _, link in data.month_links],
+        )
 
         # Weeks
         y = output.y_start
@@ -90,24 +114,52 @@ class IndexWorker(BaseWorker):
         y += section_h + 10
 
         half_weeks = (len(data.week_links) + 1) // 2
-        for i, (label, link) in enumerate(data.week_links):
+        xs, ys = [], []
+        for i in range(len(data.week_links)):
             w = i + 1
             if w <= half_weeks:
-                curr_x = week_col1_x
-                curr_y = y + (w - 1) * config.LINE_HEIGHT_INDEX_WEEK
+                xs.append(week_col1_x)
+                ys.append(y + (w - 1) * config.LINE_HEIGHT_INDEX_WEEK)
             else:
-                curr_x = week_col2_x
-                curr_y = y + (w - half_weeks - 1) * config.LINE_HEIGHT_INDEX_WEEK
-
-            self.pdf.set_xy(curr_x, curr_y)
-            self.pdf.cell(
-                output.week_col_w, config.LINE_HEIGHT_INDEX_WEEK, label, link=link
-            )
+                xs.append(week_col2_x)
+                ys.append(y + (w - half_weeks - 1) * config.LINE_HEIGHT_INDEX_WEEK)
+
+        self.pdf.text_cells(
+            xs,
+            ys,
+            output.week_col_w,
+            config.LINE_HEIGHT_INDEX_WEEK,
+            [label for label, _ in data.week_links],
+            links=[link for _, link in data.week_links],
+        )
 
     def draw_daily_logs(self, data: IndexInput):
         output = self.logic.process(data)
         self.pdf.add_page()
-        self.draw_common_elements(data.grid_input)
+        margin_left = data.grid_input.toolbar_buffer
+        month_h = (
+            config.LINE_HEIGHT_INDEX_DAILY_LOG_MONTH
+            + 5
+            + config.LINE_HEIGHT_INDEX_DAILY_LOG_DAY
+            + 5
+        )
+        self.draw_common_elements(
+            data.grid_input,
+            [
+                self._header(data),
+                # Each month: name, day numbers and underline; the gap below
+                # the underline keeps its dots
+                *(
+                    Region(
+                        x=margin_left,
+                        y=output.y_start + i * (month_h + 25),
+                        w=config.CANVAS_WIDTH - margin_left * 2,
+                        h=month_h,
+                    )
+                    for i in range(len(data.daily_links))
+                ),
+            ],
+        )
 
         self.draw_instruction_block(
             "Index", "Daily Logs", None, data.grid_input.toolbar_buffer
@@ -116,7 +168,7 @@ class IndexWorker(BaseWorker):
         y = config.Y_HEADER_SUBTITLE + config.SIZE_H2 + 40
         margin_left = data.grid_input.toolbar_buffer
 
-        for month_name, year, days in data.daily_links:
+        for month_name, year, first_weekday, days in data.daily_links:
             # Month Name
             self.pdf.set_font(
                 config.FONT_NAME, "B", size=config.SIZE_INDEX_DAILY_LOG_MONTH
@@ -130,39 +182,47 @@ class IndexWorker(BaseWorker):
             num_x = margin_left
             spacing = (config.CANVAS_WIDTH - margin_left * 2) / 31
 
-            month_num = list(calendar.month_name).index(month_name)
-
-            for day, link in days:
-                self.pdf.set_xy(num_x, y)
-                self.pdf.cell(
-                    spacing,
-                    config.LINE_HEIGHT_INDEX_DAILY_LOG_DAY,
-                    str(day),
-                    align="C",
-                    link=link,
-                )
-
-                # Draw vertical week separator after Sunday
-                try:
-                    curr_date = date(year, month_num, day)
-                    if curr_date.weekday() == 6:  # Sunday
-                        line_x = num_x + spacing
-                        self.pdf.set_draw_color(*config.COLOR_DOTS)
-                        self.pdf.set_line_width(2.0)
-                        self.pdf.line(
-                            line_x,
-                            y,
-                            line_x,
-                            y + config.LINE_HEIGHT_INDEX_DAILY_LOG_DAY,
-                        )
-                except ValueError:
-                    pass
-
+            xs = []
+            separators_x = []
+            for day, _ in days:
+                xs.append(num_x)
+                # Vertical week separator after Sunday
+                if (first_weekday + day - 1) % 7 == 6:  # Sunday
+                    separators_x.append(num_x + spacing)
                 num_x += spacing
 
+            self.pdf.text_cells(
+                xs,
+                [y] * len(days),
+                spacing,
+                config.LINE_HEIGHT_INDEX_DAILY_LOG_DAY,
+                [str(day) for day, _ in days],
+                links=[link for _, link in days],
+                align="C",
+            )
+
+            if separators_x:
+                self.pdf.set_draw_color(*config.COLOR_DOTS)
+                self.pdf.set_line_width(2.0)
+                for line_x in separators_x:
+                    self.pdf.line(
+                        line_x,
+                        y,
+                        line_x,
+                        y + config.LINE_HEIGHT_INDEX_DAILY_LOG_DAY,
+                    )
+
             y += config.LINE_HEIGHT_INDEX_DAILY_LOG_DAY + 5
             # Underline
             self.pdf.set_text_color(*config.COLOR_DOTS)
             self.pdf.line(margin_left, y, config.CANVAS_WIDTH - margin_left, y)
             y += 25
             self.pdf.set_text_color(*config.COLOR_TEXT)
+
+    @staticmethod
+    def _header(data: IndexInput) -> Region:
+        return header_region(
+            data.grid_input.toolbar_buffer,
+            config.SIZE_INSTRUCT_TITLE,
+            config.SIZE_INSTRUCT_SUBTITLE,
+        )
@@ -1,8 +1,8 @@
 from pydantic import BaseModel
 from src.infrastructure.interfaces import PDFInterface
-from bujo.workers.base_worker import BaseWorker
-from src.workers.grid_worker import GridInput
-from datetime import date
+from bujo.workers.base_worker import BaseWorker, header_region, nav_region
+from src.layout.layout_manager import Region
+from src.workers.grid_worker import GridInput, GridOutput
 from typing import List, Tuple, Optional
 import bujo.config as config
 
@@ -13,30 +13,35 @@ class MonthlyInput(BaseModel):
     month: int
     year: int
     days_in_month: int
+    first_weekday: int  # Weekday of the 1st (Monday == 0)
     instructions: str
     nav_links: List[Tuple[str, Optional[int]]]
     grid_input: GridInput
-    day_links: List[int]  # List of link IDs for each day
+    day_links: List[Optional[int]]  # List of link IDs for each day
 
 
 class MonthlyOutput(BaseModel):
     nav_start_x: int
     nav_start_y: int
     timeline_start_row: int
+    days_shown: int  # days whose row is on the grid; the rest are cut off
     v_adjust: float
 
 
 # --- SECTION B: PURE LOGIC ---
 class MonthlyLogic:
-    def process(self, data: MonthlyInput) -> MonthlyOutput:
-        # Calculate row that clears the header
+    def process(self, data: MonthlyInput, grid: GridOutput) -> MonthlyOutput:
+        # Calculate row that clears the header; `grid` is data.grid_input laid
+        # out, which the worker computes once per document
         header_end_y = config.Y_HEADER_SUBTITLE + config.SIZE_H2
-        start_row = (header_end_y // config.GRID_SIZE) + 2
+        start_row = int(header_end_y // config.GRID_SIZE) + 2
+        rows = grid.num_rows
 
         return MonthlyOutput(
             nav_start_x=config.X_NAV_LINKS_RIGHT,
             nav_start_y=config.Y_NAV_LINKS,
-            timeline_start_row=int(start_row),
+            timeline_start_row=start_row,
+            days_shown=max(0, min(data.days_in_month, rows - start_row)),
             v_adjust=1.0,
         )
 
@@ -48,47 +53,62 @@ class MonthlyWorker(BaseWorker):
         self.logic = MonthlyLogic()
 
     def draw_timeline(self, data: MonthlyInput):
-        output = self.logic.process(data)
+        # The day column sits on the grid, so lay the grid out before masking it
+        grid_output = self.grid_worker.calculate(data.grid_input)
+        output = self.logic.process(data, grid_output)
         self.pdf.add_page()
-        grid_output = self.draw_common_elements(data.grid_input)
-
-        # Days
-        self.pdf.set_font(config.FONT_NAME, size=config.SIZE_MONTHLY_TIMELINE_DAY)
 
         # Find the first dot column that respects the toolbar buffer
         num_x = next(
             x for x in grid_output.x_coords if x >= data.grid_input.toolbar_buffer
         )
 
-        for day in range(1, data.days_in_month + 1):
+        day_w = int(config.SIZE_MONTHLY_TIMELINE_DAY * 1.8)
+        exclusions = self._exclusions(data, output)
+        if output.days_shown:
+            exclusions.append(
+                self._day_column(output, grid_output.y_coords, num_x, day_w)
+            )
+        self.draw_common_elements(data.grid_input, exclusions)
+
+        # Days
+        self.pdf.set_font(config.FONT_NAME, size=config.SIZE_MONTHLY_TIMELINE_DAY)
+        day_ys = []
+        separators_y = []
+        for day in range(1, output.days_shown + 1):
             row = output.timeline_start_row + (day - 1)
-            if row >= len(grid_output.y_coords):
-                break
             y_dot = grid_output.y_coords[row]
 
-            link_id = data.day_links[day - 1]
-
-            day_w = int(config.SIZE_MONTHLY_TIMELINE_DAY * 1.8)
-            self.pdf.set_xy(
-                num_x - day_w + config.MONTHLY_TIMELINE_X_OFFSET,
+            day_ys.append(
                 y_dot
                 - (config.GRID_SIZE / 2)
                 + output.v_adjust
-                + config.MONTHLY_TIMELINE_Y_OFFSET,
+                + config.MONTHLY_TIMELINE_Y_OFFSET
             )
-            self.pdf.cell(day_w, config.GRID_SIZE, str(day), align="C", link=link_id)
 
-            # Draw week separator line if it's Sunday
-            current_date = date(data.year, data.month, day)
-            if current_date.weekday() == 6:  # Sunday
-                line_y = (
+            # Week separator line if it's Sunday
+            if (data.first_weekday + day - 1) % 7 == 6:  # Sunday
+                separators_y.append(
                     y_dot
                     + (config.GRID_SIZE / 2)
                     + config.MONTHLY_TIMELINE_Y_OFFSET
                     - 4
                 )
-                self.pdf.set_draw_color(*config.COLOR_DOTS)
-                self.pdf.set_line_width(2.0)
+
+        self.pdf.text_cells(
+            [num_x - day_w + config.MONTHLY_TIMELINE_X_OFFSET] * len(day_ys),
+            day_ys,
+            day_w,
+            config.GRID_SIZE,
+            [str(day) for day in range(1, len(day_ys) + 1)],
+            links=data.day_links[: len(day_ys)],
+            align="C",
+        )
+
+        if separators_y:
+            self.pdf.set_draw_color(*config.COLOR_DOTS)
+            self.pdf.set_line_width(2.0)
+            for line_y in separators_y:
                 self.pdf.line(
                     data.grid_input.toolbar_buffer,
                     line_y,
@@ -107,9 +127,9 @@ class MonthlyWorker(BaseWorker):
         )
 
     def draw_action_plan(self, data: MonthlyInput):
-        output = self.logic.process(data)
+        output = self.logic.process(data, self.grid_worker.calculate(data.grid_input))
         self.pdf.add_page()
-        self.draw_common_elements(data.grid_input)
+        self.draw_common_elements(data.grid_input, self._exclusions(data, output))
 
         self.draw_instruction_block(
             "Monthly Action Plan",
@@ -120,3 +140,31 @@ class MonthlyWorker(BaseWorker):
         self.draw_navigation_links(
             data.nav_links, config.FONT_NAME, output.nav_start_x, output.nav_start_y
         )
+
+    def _exclusions(self, data: MonthlyInput, output: MonthlyOutput) -> List[Region]:
+        return [
+            header_region(
+                data.grid_input.toolbar_buffer,
+                config.SIZE_INSTRUCT_TITLE,
+                config.SIZE_INSTRUCT_SUBTITLE,
+            ),
+            nav_region(data.nav_links, output.nav_start_x, output.nav_start_y),
+            self.instruction_region(data.instructions),
+        ]
+
+    @staticmethod
+    def _day_column(
+        output: MonthlyOutput,
+        y_coords: List[int],
+        num_x: int,
+        day_w: int,
+    ) -> Region:
+        # Only the rows of days_shown: a short grid cuts the column off
+        first = output.timeline_start_row
+        last = first + output.days_shown - 1
+        return Region(
+            x=num_x - day_w + config.MONTHLY_TIMELINE_X_OFFSET,
+            y=y_coords[first] - config.GRID_SIZE / 2 + config.MONTHLY_TIMELINE_Y_OFFSET,
+            w=day_w,
+            h=y_coords[last] - y_coords[first] + config.GRID_SIZE,
+        )
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from src.infrastructure.interfaces import PDFInterface
-from bujo.workers.base_worker import BaseWorker
+from bujo.workers.base_worker import BaseWorker, header_region, nav_region
 from src.workers.grid_worker import GridInput
 from typing import List, Tuple, Optional
 import bujo.config as config
@@ -36,7 +36,9 @@ class WeeklyWorker(BaseWorker):
     def draw_action_plan(self, data: WeeklyInput):
         output = self.logic.process(data)
         self.pdf.add_page()
-        self.draw_common_elements(data.grid_input)
+        self.draw_common_elements(
+            data.grid_input, self._exclusions(data, output, subtitle=True)
+        )
 
         self.draw_instruction_block(
             title="Action Plan: Week",
@@ -52,7 +54,9 @@ class WeeklyWorker(BaseWorker):
     def draw_reflection(self, data: WeeklyInput):
         output = self.logic.process(data)
         self.pdf.add_page()
-        self.draw_common_elements(data.grid_input)
+        self.draw_common_elements(
+            data.grid_input, self._exclusions(data, output, subtitle=False)
+        )
 
         self.draw_instruction_block(
             title="Reflection: Week",
@@ -64,3 +68,14 @@ class WeeklyWorker(BaseWorker):
         self.draw_navigation_links(
             data.nav_links, config.FONT_NAME, output.nav_start_x, output.nav_start_y
         )
+
+    def _exclusions(self, data: WeeklyInput, output: WeeklyOutput, subtitle: bool):
+        return [
+            header_region(
+                data.grid_input.toolbar_buffer,
+                config.SIZE_INSTRUCT_TITLE,
+                config.SIZE_INSTRUCT_SUBTITLE if subtitle else 0,
+            ),
+            nav_region(data.nav_links, output.nav_start_x, output.nav_start_y),
+            self.instruction_region(data.instructions),
+        ]
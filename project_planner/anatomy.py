@@ -0,0 +1,58 @@
+import argparse
+from typing import List, Optional
+import project_planner.config as config
+from project_planner.main import load_bundle
+from project_planner.workers.planner_worker import (
+    BundleInput,
+    BundleLogic,
+    PlannerInput,
+    PlannerLogic,
+)
+from src.diagnostics.pdf_anatomy import main as anatomy_main
+from src.workers.grid_worker import GridCalculator
+
+
+def page_kinds(
+    lab_pages: int = config.LAB_PAGES, bundle: Optional[BundleInput] = None
+) -> List[str]:
+    """HUB/MAP/LAB (and bundle INDEX) of every planner page, from the layout."""
+    logic = PlannerLogic(GridCalculator())
+    if bundle is None:
+        output = logic.process(PlannerInput(project_name="", lab_pages=lab_pages))
+        return [page.kind for page in output.pages]
+
+    layout = BundleLogic().process(bundle)
+    kinds = ["INDEX"] * len(layout.index_pages)
+    for section in layout.sections:
+        output = logic.process(
+            PlannerInput(project_name="", lab_pages=section.spec.lab_pages)
+        )
+        kinds += [page.kind for page in output.pages]
+    return kinds
+
+
+def _add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--lab-pages",
+        type=int,
+        default=config.LAB_PAGES,
+        help="LAB pages the file was built with.",
+    )
+    parser.add_argument(
+        "--bundle", metavar="JSON", help="Bundle the file was built from."
+    )
+
+
+def main(argv=None):
+    anatomy_main(
+        argv,
+        default_path=config.OUTPUT_PATH,
+        page_kinds=lambda args: page_kinds(
+            args.lab_pages, load_bundle(args.bundle) if args.bundle else None
+        ),
+        add_arguments=_add_arguments,
+    )
+
+
+if __name__ == "__main__":
+    main()
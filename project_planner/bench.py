@@ -0,0 +1,61 @@
+import contextlib
+import io
+import os
+from typing import Any, Callable
+import project_planner.config as config
+import project_planner.main as planner
+from project_planner.logic.planner_map import SpineLogic
+from project_planner.workers.planner_worker import PlannerInput, ProjectPlannerWorker
+from src.diagnostics.microbench import BenchSink, Cases, bench_main
+from src.infrastructure.pdf_adapter import FPDFAdapter
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+
+
+def draw_planner(sink: BenchSink) -> Callable[[], Any]:
+    """A project without LAB pages per call: its HUB and MAP page."""
+    pdf = FPDFAdapter(
+        format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT),
+        compress_level=config.COMPRESSION_LEVEL,
+        output_threads=config.OUTPUT_THREADS,
+    )
+    if os.path.exists(config.FONT_REGULAR):
+        pdf.add_font(config.FONT_NAME, "", config.FONT_REGULAR)
+    if os.path.exists(config.FONT_BOLD):
+        pdf.add_font(config.FONT_NAME, "B", config.FONT_BOLD)
+    page_links = SpineLogic(pdf).initialize_links(total_pages=2).page_links
+    worker = ProjectPlannerWorker(pdf)
+    data = PlannerInput(project_name="Project", lab_pages=0)
+    return lambda: worker.draw_planner(data, page_links)
+
+
+def build(sink: BenchSink) -> Callable[[], Any]:
+    # The background merge reads the generated file back
+    path = sink.path("project_planner.pdf", read_back=True)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            planner.build(path)
+
+    return run
+
+
+CASES: Cases = {
+    "page.planner[hub+map]": draw_planner,
+    "build.planner": build,
+}
+
+
+def main(argv=None):
+    bench_main(
+        "project_planner",
+        CASES,
+        BASELINE_PATH,
+        argv,
+        description="Time one planner project's pages and the full planner "
+        "build, and compare with a baseline.",
+    )
+
+
+if __name__ == "__main__":
+    main()
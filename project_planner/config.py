@@ -1,15 +1,27 @@
+import os
+
 # --- Native rM PP Specifications ---
 CANVAS_WIDTH = 1620
 CANVAS_HEIGHT = 2160
 GRID_SIZE = 45  # ~5mm at 229 DPI
 DOT_RADIUS = 1
+GUIDE_EVERY = 5  # --draft: one guide line per 5 grid cells
 
 # --- Backgrounds ---
-HUB_BACKGROUND_PDF = "/home/meteof/proj/bullet_journal/project_planner/planner.pdf"
+HUB_BACKGROUND_PDF = "project_planner/planner.pdf"
+
+# --- Output ---
+OUTPUT_PATH = "output/project_planner.pdf"
+COMPRESSION_LEVEL = 6  # zlib level for page streams: 1 fastest .. 9 smallest
+OUTPUT_THREADS = None  # threads deflating page streams; None: one per CPU
+CONTENT_DEDUP = True  # move operator runs repeated across pages into shared forms
+LINK_LINT = True  # check link areas for overlaps, off-page and dead targets
 
 # --- Layout ---
 TOOLBAR_BUFFER = 120
 RIGHT_RAIL_WIDTH = 140
+RAIL_SLOTS = 10  # buttons on the right rail; more targets page the rail
+LAB_PAGES = 8  # LAB pages after HUB and MAP (labelled 3, 4, ...)
 HUB_HEADER_RATIO = 0.25
 MAP_ARCH_RATIO = 0.60
 
@@ -17,6 +29,14 @@ MAP_ARCH_RATIO = 0.60
 HUB_TITLE_X = 40
 HUB_TITLE_Y = 100
 
+# --- Bundle (several projects in one PDF) ---
+BUNDLE_INDEX_TITLE = "Projects"
+BUNDLE_INDEX_TOP = 225  # first index row
+BUNDLE_INDEX_ROW_HEIGHT = 90  # two grid cells
+BUNDLE_BACK_Y = 40  # "<- Projects" link above the background's header box
+BUNDLE_NAME_X = 135  # project name under the background's "Project" label
+BUNDLE_NAME_Y = 175
+
 # --- MAP Page ---
 # Divider is 4cm + 3cm = 7cm from the right sidebar.
 # 1cm ~ 90px (based on 45px = 5mm grid)
@@ -31,9 +51,13 @@ COLOR_DOTS = (0, 0, 0)
 COLOR_TEXT = (40, 40, 40)
 COLOR_SIDEBAR = (245, 245, 245)
 COLOR_LINE = (180, 180, 180)
+COLOR_RAIL_ACTIVE = (225, 225, 225)
 
 # --- Fonts ---
 FONT_NAME = "Dosis"
+FONT_DIR = "fonts/Dosis/static"
+FONT_REGULAR = os.path.join(FONT_DIR, "Dosis-Regular.ttf")
+FONT_BOLD = os.path.join(FONT_DIR, "Dosis-Bold.ttf")
 # Adjust FONT_SCALE to resize all text globally (matching bujo)
 FONT_SCALE = 1.6
 
@@ -47,3 +71,17 @@ SIZE_BODY = int(20 * FONT_SCALE)
 SIZE_NAV_LINKS = SIZE_BODY_LG
 SIZE_TITLE = SIZE_H1
 SIZE_SECTION_HEADER = SIZE_H2
+
+# --- Memory Budgets (MB, checked by `python -m project_planner.main --memory-profile`) ---
+MEMORY_BUDGETS = {
+    "phases": {
+        "fonts": {"peak_mb": 4, "retained_mb": 4},
+        "spine": {"peak_mb": 1, "retained_mb": 1},
+        "pages": {"peak_mb": 16, "retained_mb": 8},
+        "lint": {"peak_mb": 2, "retained_mb": 1},
+        "dedup": {"peak_mb": 4, "retained_mb": 2},
+        "output": {"peak_mb": 16},
+        "merge": {"peak_mb": 32},
+    },
+    "rss_peak_mb": 300,
+}
@@ -1,84 +1,127 @@
+import argparse
+import json
 import os
-from pypdf import PdfReader, PdfWriter, Transformation
+import sys
+from contextlib import nullcontext
+from typing import List, Optional
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+)
+from src.infrastructure.content_dedup import format_dedup
 from src.infrastructure.pdf_adapter import FPDFAdapter
+from src.infrastructure.remarkable_templates import TemplateCollector
 import project_planner.config as config
 from project_planner.logic.planner_map import SpineLogic
-from project_planner.workers.planner_worker import ProjectPlannerWorker, PlannerInput
+from project_planner.workers.planner_worker import (
+    BundleInput,
+    BundleLogic,
+    PlannerInput,
+    ProjectPlannerWorker,
+)
+from src.diagnostics.memory_profiler import (
+    MemoryBudgetExceeded,
+    MemoryProfiler,
+    format_report,
+    load_budget,
+)
+from src.diagnostics.cpu_profiler import CpuProfiler, format_profile
+from src.diagnostics.link_lint import format_link_report
+from src.diagnostics.tracer import Tracer, format_trace_summary, span
 
 
-def main():
-    # 1. Setup PDF
-    pdf = FPDFAdapter(format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT))
+def _no_phase(name: str):
+    return nullcontext()
 
-    # Register Fonts
-    # We use paths relative to the project root as configured in common logic usually
-    # or absolute paths here
-    font_path_reg = (
-        "/home/meteof/proj/bullet_journal/fonts/Dosis/static/Dosis-Regular.ttf"
-    )
-    font_path_bold = (
-        "/home/meteof/proj/bullet_journal/fonts/Dosis/static/Dosis-Bold.ttf"
+
+def build(
+    output_path: str = config.OUTPUT_PATH,
+    profiler: Optional[MemoryProfiler] = None,
+    draft: bool = False,
+    lab_pages: int = config.LAB_PAGES,
+    bundle: Optional[BundleInput] = None,
+    templates: Optional[TemplateCollector] = None,
+) -> FPDFAdapter:
+    """
+    Builds the planner and writes it to `output_path`. With `templates`, the
+    rail background and the grid are collected as device templates instead
+    of drawn, for a slim PDF (see project_planner.templates).
+    """
+    phase = profiler.phase if profiler is not None else _no_phase
+
+    # 1. Setup PDF
+    pdf = FPDFAdapter(
+        format=(config.CANVAS_WIDTH, config.CANVAS_HEIGHT),
+        draft=draft,
+        compress_level=config.COMPRESSION_LEVEL,
+        output_threads=config.OUTPUT_THREADS,
+        object_streams=templates is not None,
     )
+    if profiler is not None:
+        profiler.track_pages(pdf.page_no)
 
-    if os.path.exists(font_path_reg):
-        pdf.add_font(config.FONT_NAME, "", font_path_reg)
-    if os.path.exists(font_path_bold):
-        pdf.add_font(config.FONT_NAME, "B", font_path_bold)
+    # Register Fonts
+    with phase("fonts"), span("fonts"):
+        if os.path.exists(config.FONT_REGULAR):
+            pdf.add_font(config.FONT_NAME, "", config.FONT_REGULAR)
+        if os.path.exists(config.FONT_BOLD):
+            pdf.add_font(config.FONT_NAME, "B", config.FONT_BOLD)
 
     # 2. Initialize Links (Pre-pass)
-    spine = SpineLogic(pdf)
-    planner_map = spine.initialize_links(total_pages=10)
+    if bundle is not None:
+        bundle = bundle.model_copy(update={"draft": draft})
+        total_pages = BundleLogic().process(bundle).total_pages
+    else:
+        planner_input = PlannerInput(
+            project_name="Project",
+            lab_pages=lab_pages,
+            draft=draft,
+        )
+        total_pages = 2 + planner_input.lab_pages
+    with phase("spine"), span("spine", pages=total_pages):
+        spine = SpineLogic(pdf)
+        planner_map = spine.initialize_links(total_pages=total_pages)
 
     # 3. Setup Worker
     worker = ProjectPlannerWorker(pdf)
+    worker.templates = templates
 
-    # 4. Define Input
-    planner_input = PlannerInput(
-        project_name="Project",
-    )
+    # 4. Generate PDF
+    with phase("pages"), span("pages"):
+        if bundle is not None:
+            hub_pages = worker.draw_bundle(bundle, planner_map.page_links)
+        else:
+            worker.draw_planner(planner_input, planner_map.page_links)
+            hub_pages = [0]
+
+    # 5. Link areas: overlaps, off-page or empty areas, dead targets
+    if config.LINK_LINT:
+        with phase("lint"), span("lint"):
+            pdf.lint_links()
 
-    # 5. Generate PDF
-    worker.draw_planner(planner_input, planner_map.page_links)
+    # 6. Operator runs repeated across pages become shared form XObjects
+    if config.CONTENT_DEDUP:
+        with phase("dedup"), span("dedup"):
+            pdf.hoist_repeated_content()
 
-    # 6. Output paths
-    output_path = "/home/meteof/proj/bullet_journal/output/project_planner.pdf"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # 7. Output paths
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
     # Save the fpdf2 generated file temporarily
     temp_gen_path = output_path.replace(".pdf", "_temp.pdf")
-    pdf.output(temp_gen_path)
+    with phase("output"), span("output", path=temp_gen_path):
+        pdf.output(temp_gen_path)
 
-    # 7. Merge Background for Page 1 (planner.pdf)
+    # 8. Merge Background under every HUB page (planner.pdf)
     background_path = config.HUB_BACKGROUND_PDF
     if os.path.exists(background_path):
         print(f"Merging background from {background_path}...")
-        writer = PdfWriter()
-        generated_reader = PdfReader(temp_gen_path)
-        background_reader = PdfReader(background_path)
-
-        # Get first page of generated PDF (this contains the right rail and links)
-        content_page = generated_reader.pages[0]
-        # Get first page of background PDF
-        bg_page = background_reader.pages[0]
-
-        # Scale background to fit canvas (1620x2160)
-        scale_factor = config.CANVAS_WIDTH / float(bg_page.mediabox.width)
-
-        # Merge background UNDER the content (links/rail)
-        # We merge bg_page INTO content_page with over=False to preserve content_page's annotations (links)
-        content_page.merge_transformed_page(
-            bg_page, Transformation().scale(scale_factor), over=False
-        )
-
-        # Add the merged page (with links and background) to writer
-        writer.add_page(content_page)
-
-        # Add remaining pages from generated PDF
-        for i in range(1, len(generated_reader.pages)):
-            writer.add_page(generated_reader.pages[i])
-
-        with open(output_path, "wb") as f_out:
-            writer.write(f_out)
+        with phase("merge"), span("merge", hub_pages=len(hub_pages)):
+            merge_background(temp_gen_path, background_path, output_path, hub_pages)
 
         # Clean up
         if os.path.exists(temp_gen_path):
@@ -86,9 +129,204 @@ def main():
         print(f"Project Planner with background generated at: {output_path}")
     else:
         # Fallback if no background
-        os.rename(temp_gen_path, output_path)
+        os.replace(temp_gen_path, output_path)
         print(f"Project Planner generated at: {output_path}")
 
+    return pdf
+
+
+def merge_background(
+    generated_path: str,
+    background_path: str,
+    output_path: str,
+    pages: Optional[List[int]] = None,
+):
+    # Incremental update: the generated pages are written back as-is and only
+    # the touched objects are appended. Copying page by page follows every
+    # link annotation into its target page, which recurses past Python's limit
+    # once the planner has a few hundred cross-linked pages.
+    writer = PdfWriter(generated_path, incremental=True)
+    # pypdf swaps each page dict for a PageObject, whose hash differs from the
+    # dict it read, so every page would be appended again: rebase the hashes
+    # so only the HUB pages changed below are
+    for page in writer.pages:
+        writer._original_hash[page.indirect_reference.idnum - 1] = page.hash_bin()
+    bg_page = PdfReader(background_path).pages[0]
+
+    # Scale background to fit canvas (1620x2160)
+    scale_factor = config.CANVAS_WIDTH / float(bg_page.mediabox.width)
+
+    # The background is imported once as a form XObject. Each HUB page gets
+    # the same one-line stream in front of its own content, so the background
+    # sits UNDER the rail and links and is stored once however many projects.
+    form = DecodedStreamObject()
+    form.set_data(bg_page.get_contents().get_data())
+    form.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): ArrayObject(bg_page.mediabox),
+            NameObject("/Matrix"): ArrayObject(
+                FloatObject(v) for v in (scale_factor, 0, 0, scale_factor, 0, 0)
+            ),
+            NameObject("/Resources"): bg_page["/Resources"].clone(writer),
+        }
+    )
+    form_ref = writer._add_object(form.flate_encode())
+    prefix = DecodedStreamObject()
+    prefix.set_data(b"q /PlannerBG Do Q\n")
+    prefix_ref = writer._add_object(prefix)
+
+    for index in pages or [0]:
+        page = writer.pages[index]
+        resources = page["/Resources"].get_object()
+        if "/XObject" not in resources:
+            resources[NameObject("/XObject")] = DictionaryObject()
+        resources["/XObject"].get_object()[NameObject("/PlannerBG")] = form_ref
+        contents = page.raw_get("/Contents")
+        if isinstance(contents, ArrayObject):
+            page[NameObject("/Contents")] = ArrayObject([prefix_ref, *contents])
+        else:
+            page[NameObject("/Contents")] = ArrayObject([prefix_ref, contents])
+
+    with open(output_path, "wb") as f_out:
+        writer.write(f_out)
+
+
+def load_bundle(path: str) -> BundleInput:
+    """{"projects": [{"name": "...", "lab_pages": 8}, ...]}"""
+    with open(path) as f:
+        return BundleInput.model_validate(json.load(f))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the project planner PDF.")
+    parser.add_argument("--output", default=config.OUTPUT_PATH)
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Report peak/retained memory per build phase (tracemalloc + RSS).",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        metavar="JSON",
+        help="Budget file overriding config.MEMORY_BUDGETS; exits 1 on violation.",
+    )
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Fast layout build: core fonts, guide lines instead of dots, no compression.",
+    )
+    parser.add_argument(
+        "--bundle",
+        metavar="JSON",
+        help="Build several projects into one PDF behind a project index.",
+    )
+    parser.add_argument(
+        "--lab-pages",
+        type=int,
+        help=f"Number of LAB pages after HUB and MAP (default {config.LAB_PAGES}).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay running and rebuild on edits to config.py, the fonts, the "
+        "background PDF or the bundle file.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="JSON",
+        help="Write a Chrome trace-event timeline of the build (chrome://tracing, "
+        "Perfetto) and print the slowest spans.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "sample"],
+        help="Profile the build's CPU time (cProfile, or a low-overhead stack "
+        "sampler) and print it per module group: our workers against fpdf2, "
+        "pypdf and pydantic.",
+    )
+    parser.add_argument(
+        "--profile-out",
+        metavar="PREFIX",
+        help="With --profile: where PREFIX.pstats and PREFIX.collapsed.txt go "
+        "(default: the output path, .pdf replaced by -profile).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        from project_planner.watch import watch
+
+        watch(args.output, args.draft, args.lab_pages, args.bundle)
+        return
+
+    bundle = load_bundle(args.bundle) if args.bundle else None
+    lab_pages = config.LAB_PAGES if args.lab_pages is None else args.lab_pages
+
+    if args.trace:
+        tracer = Tracer()
+        tracer.start()
+        try:
+            with span("build", draft=args.draft):
+                build(args.output, draft=args.draft, lab_pages=lab_pages, bundle=bundle)
+        finally:
+            tracer.stop()
+        tracer.write(args.trace)
+        print(format_trace_summary(tracer.summary()))
+        print(f"Trace written to {args.trace}")
+        return
+
+    if args.profile:
+        profiler = CpuProfiler(args.profile)
+        profiler.start()
+        try:
+            build(args.output, draft=args.draft, lab_pages=lab_pages, bundle=bundle)
+        finally:
+            profiler.stop()
+        paths = profiler.write(
+            args.profile_out or os.path.splitext(args.output)[0] + "-profile"
+        )
+        print(format_profile(profiler.report()))
+        print(f"Profile written to {', '.join(paths)}")
+        return
+
+    if not (args.memory_profile or args.memory_budget):
+        pdf = build(args.output, draft=args.draft, lab_pages=lab_pages, bundle=bundle)
+        print(pdf.glyph_cache_summary())
+        if pdf.dedup_report is not None:
+            print(format_dedup(pdf.dedup_report))
+        if pdf.link_report is not None:
+            print(format_link_report(pdf.link_report))
+        return
+
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        pdf = build(
+            args.output,
+            profiler=profiler,
+            draft=args.draft,
+            lab_pages=lab_pages,
+            bundle=bundle,
+        )
+        print(pdf.glyph_cache_summary())
+        if pdf.dedup_report is not None:
+            print(format_dedup(pdf.dedup_report))
+        if pdf.link_report is not None:
+            print(format_link_report(pdf.link_report))
+        report = profiler.report()
+    finally:
+        profiler.stop()
+    print(format_report(report))
+
+    budget = load_budget(args.memory_budget, config.MEMORY_BUDGETS)
+    try:
+        profiler.check(report, budget)
+    except MemoryBudgetExceeded as e:
+        print(f"Memory budget exceeded: {e}")
+        sys.exit(1)
+    print("Memory budgets OK")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import tempfile
+from src.diagnostics.scaling import ScalingFitter, format_scaling, measure_case
+
+
+def build_case(output_path: str, lab_pages: int = 8) -> int:
+    """One stress build, run in a fresh process by `measure_case`."""
+    import project_planner.main as planner
+
+    pdf = planner.build(output_path, lab_pages=lab_pages)
+    return pdf.page_no()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the planner with growing LAB page counts and fail "
+        "when build time, peak memory, file size or operator count grows "
+        "super-linearly."
+    )
+    parser.add_argument(
+        "--lab-pages", nargs="+", type=int, default=[10, 50, 100, 500]
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed growth exponent above 1 (default 0.15).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Builds per case; time and memory are their medians (default 3).",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stress.pdf")
+        samples = [
+            measure_case(
+                "project_planner.stress:build_case",
+                f"lab={n}",
+                path,
+                {"lab_pages": n},
+                repeats=args.repeats,
+            )
+            for n in args.lab_pages
+        ]
+    report = ScalingFitter().process("LAB pages", "pages", samples, args.tolerance)
+
+    print(format_scaling(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(report.model_dump_json())
+
+    if not report.ok:
+        failed = ", ".join(f.metric for f in report.fits if f.super_linear)
+        print(f"Super-linear growth: {failed}")
+        sys.exit(1)
+    print("Scaling OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import project_planner.config as config
+import project_planner.main as planner
+from src.infrastructure.remarkable_templates import (
+    DEVICE_SIZE,
+    TemplateCollector,
+    validate_export,
+    write_templates,
+)
+from src.layout.layout_manager import LayoutManager, ToolbarSide
+
+OUTPUT_DIR = os.path.join("output", "remarkable_planner")
+
+
+def toolbar_guides():
+    """The edge of the safe zone, where the toolbar strip ends."""
+    zone = LayoutManager.calculate_safe_zone(
+        config.CANVAS_WIDTH,
+        config.CANVAS_HEIGHT,
+        config.TOOLBAR_BUFFER,
+        ToolbarSide.LEFT,
+    )
+    return [
+        (x, 0, x, config.CANVAS_HEIGHT)
+        for x in (zone.x, zone.x + zone.w)
+        if 0 < x < config.CANVAS_WIDTH
+    ]
+
+
+def export(
+    out_dir: str = OUTPUT_DIR,
+    lab_pages: int = config.LAB_PAGES,
+    bundle=None,
+    guides: bool = False,
+):
+    """
+    Builds the planner without the rail background and grid into `out_dir`,
+    next to the templates its pages use. Returns the document and the
+    written files.
+    """
+    if (config.CANVAS_WIDTH, config.CANVAS_HEIGHT) != DEVICE_SIZE:
+        raise ValueError(
+            f"Templates are {DEVICE_SIZE[0]}x{DEVICE_SIZE[1]} device pixels; the "
+            f"canvas is {config.CANVAS_WIDTH}x{config.CANVAS_HEIGHT}"
+        )
+    collector = TemplateCollector(
+        "planner",
+        config.CANVAS_WIDTH,
+        config.CANVAS_HEIGHT,
+        guides=toolbar_guides() if guides else (),
+    )
+    os.makedirs(out_dir, exist_ok=True)
+    pdf_name = "project_planner_slim.pdf"
+    pdf = planner.build(
+        os.path.join(out_dir, pdf_name),
+        lab_pages=lab_pages,
+        bundle=bundle,
+        templates=collector,
+    )
+    paths = write_templates(
+        list(collector.templates.values()),
+        collector.export(pdf.page_no(), pdf_name, "Planner"),
+        out_dir,
+    )
+    return pdf, [os.path.join(out_dir, pdf_name)] + paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export the rail background and grid as reMarkable templates "
+        "(SVG and PNG) and the planner without them as a slim PDF."
+    )
+    parser.add_argument("--out", default=OUTPUT_DIR, help="Export directory.")
+    parser.add_argument(
+        "--lab-pages",
+        type=int,
+        default=config.LAB_PAGES,
+        help=f"Number of LAB pages after HUB and MAP (default {config.LAB_PAGES}).",
+    )
+    parser.add_argument(
+        "--bundle",
+        metavar="JSON",
+        help="Export several projects into one PDF behind a project index.",
+    )
+    parser.add_argument(
+        "--guides",
+        action="store_true",
+        help="Draw the safe zone's toolbar edge on the templates.",
+    )
+    parser.add_argument(
+        "--full",
+        metavar="PDF",
+        help="Full build to compare sizes with (default: build one to a temp dir).",
+    )
+    args = parser.parse_args(argv)
+    bundle = planner.load_bundle(args.bundle) if args.bundle else None
+
+    t0 = time.perf_counter()
+    _, paths = export(args.out, args.lab_pages, bundle, args.guides)
+    seconds = time.perf_counter() - t0
+    slim_kb = os.path.getsize(paths[0]) / 1024
+    templates_kb = sum(
+        os.path.getsize(p) for p in paths[1:] if p.endswith((".svg", ".png"))
+    ) / 1024
+    if args.full:
+        full_kb = os.path.getsize(args.full) / 1024
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            full_path = os.path.join(tmp, "project_planner.pdf")
+            planner.build(full_path, lab_pages=args.lab_pages, bundle=bundle)
+            full_kb = os.path.getsize(full_path) / 1024
+    templates = sum(1 for p in paths if p.endswith(".svg"))
+    print(f"Exported to {args.out} in {seconds:.2f} s")
+    print(
+        f"Slim PDF {slim_kb:.0f} KB against {full_kb:.0f} KB for the full build; "
+        f"{templates} templates, {templates_kb:.0f} KB (SVG + PNG)"
+    )
+
+    problems = validate_export(args.out)
+    for problem in problems:
+        print(f"  {problem}")
+    if problems:
+        sys.exit(1)
+    print("Export is valid")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import importlib
+import os
+import time
+from typing import List, Optional
+import project_planner.config as config
+import project_planner.logic.planner_map as planner_map
+import project_planner.main as planner
+import project_planner.workers.planner_worker as planner_worker
+from src.infrastructure.watch import (
+    FileWatcher,
+    RebuildReport,
+    reload_config,
+    watch_loop,
+)
+
+
+class PlannerSession:
+    """
+    Rebuilds the planner in a warm process after an edit. The planner draws
+    its rail, labels and grid once as shared blocks and merges the background
+    over the whole file, so there is no per-page work worth skipping: a warm
+    rebuild of the default 10 pages takes a fraction of a second.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        draft: bool,
+        lab_pages: Optional[int],
+        bundle_path: Optional[str],
+    ):
+        self.output_path = output_path
+        self.draft = draft
+        self.lab_pages = lab_pages
+        self.bundle_path = bundle_path
+        self.pages = 0
+        self.build()
+
+    def build(self):
+        # Written next to the output and swapped in once the merge is done
+        directory, name = os.path.split(self.output_path)
+        temp_path = os.path.join(directory, f".tmp-{name}")
+        bundle = planner.load_bundle(self.bundle_path) if self.bundle_path else None
+        pdf = planner.build(
+            temp_path,
+            draft=self.draft,
+            lab_pages=config.LAB_PAGES if self.lab_pages is None else self.lab_pages,
+            bundle=bundle,
+        )
+        os.replace(temp_path, self.output_path)
+        self.pages = pdf.page_no()
+        self.link_report = pdf.link_report
+
+    def apply(self, paths: List[str]) -> RebuildReport:
+        t0 = time.perf_counter()
+        changed = reload_config(config)
+        if changed:
+            # Contracts take their defaults from config at import time
+            for module in (planner_map, planner_worker, planner):
+                importlib.reload(module)
+        self.build()
+        return RebuildReport(
+            paths=paths,
+            changed_names=changed,
+            kinds=["HUB", "MAP", "LAB"],
+            pages=self.pages,
+            full=True,
+            seconds=time.perf_counter() - t0,
+            link_issues=(
+                len(self.link_report.issues) if self.link_report is not None else None
+            ),
+        )
+
+
+def watch(
+    output_path: str = config.OUTPUT_PATH,
+    draft: bool = False,
+    lab_pages: Optional[int] = None,
+    bundle_path: Optional[str] = None,
+):
+    t0 = time.perf_counter()
+    session = PlannerSession(output_path, draft, lab_pages, bundle_path)
+    print(
+        f"Built {session.pages} pages in {time.perf_counter() - t0:.2f} s: "
+        f"{output_path}"
+    )
+    paths = [config.__file__, config.FONT_DIR, config.HUB_BACKGROUND_PDF]
+    if bundle_path:
+        paths.append(bundle_path)
+    watch_loop(FileWatcher(paths), session.apply)
@@ -1,19 +1,18 @@
 import os
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Tuple, Optional
 from src.infrastructure.interfaces import PDFInterface
-from src.workers.grid_worker import GridInput, GridCalculator
-from src.layout.layout_manager import LayoutManager, ToolbarSide
+from src.infrastructure.remarkable_templates import TemplateLayer
+from src.workers.grid_styles import GridGeometry
+from src.workers.grid_worker import GridInput, GridCalculator, GridWorker
+from src.diagnostics.tracer import span, traced
+from src.layout.layout_manager import LayoutManager, Region, ToolbarSide
 import project_planner.config as config
 
-# --- SECTION A: DATA CONTRACTS ---
-
+# fpdf's default line width in pt: the rail separators are drawn with it
+RAIL_LINE_WIDTH = 0.567
 
-class Region(BaseModel):
-    x: float
-    y: float
-    w: float
-    h: float
+# --- SECTION A: DATA CONTRACTS ---
 
 
 class PlannerInput(BaseModel):
@@ -22,20 +21,67 @@ class PlannerInput(BaseModel):
     canvas_height: int = config.CANVAS_HEIGHT
     grid_size: int = config.GRID_SIZE
     right_rail_width: int = config.RIGHT_RAIL_WIDTH
+    lab_pages: int = Field(config.LAB_PAGES, ge=0)
+    rail_slots: int = config.RAIL_SLOTS
+    draft: bool = False  # sparse guide lines instead of dot grids
+    index_link: Optional[int] = None  # bundle mode: HUB shows name + back link
+
+
+class RailSlot(BaseModel):
+    label: str
+    target: Optional[int] = None  # page index (0 = HUB); None = no link
+
+
+class PlannerPage(BaseModel):
+    kind: str  # "HUB", "MAP" or "LAB"
+    rail_group: int  # index into PlannerOutput.rail_groups
+    active_slot: Optional[int]  # highlighted rail slot
 
 
 class PlannerOutput(BaseModel):
     right_rail: Region
-    nav_buttons: List[Region]  # 10 buttons
+    nav_buttons: List[Region]  # one per rail slot
+    rail_groups: List[List[RailSlot]]
+    pages: List[PlannerPage]
     hub_header: Region
     hub_scratchpad: Region
-    hub_grid_points: List[Tuple[float, float]]
     map_architecture: Region
-    map_arch_grid_points: List[Tuple[float, float]]
     map_tasks: Region
     task_rows: List[Region]
     lab_content: Region
-    lab_grid_points: List[Tuple[float, float]]
+    grid_points: List[Tuple[float, float]]  # full page up to the rail
+
+
+class ProjectSpec(BaseModel):
+    name: str
+    lab_pages: int = Field(config.LAB_PAGES, ge=0)
+
+
+class BundleInput(BaseModel):
+    projects: List[ProjectSpec]
+    canvas_width: int = config.CANVAS_WIDTH
+    canvas_height: int = config.CANVAS_HEIGHT
+    right_rail_width: int = config.RIGHT_RAIL_WIDTH
+    draft: bool = False
+
+
+class IndexRow(BaseModel):
+    label: str
+    target: int  # page index of the project's HUB page
+    region: Region
+
+
+class ProjectSection(BaseModel):
+    spec: ProjectSpec
+    first_page: int  # page index of the HUB page
+    page_count: int
+
+
+class BundleOutput(BaseModel):
+    title: Region
+    index_pages: List[List[IndexRow]]
+    sections: List[ProjectSection]
+    total_pages: int
 
 
 # --- SECTION B: PURE LOGIC ---
@@ -45,6 +91,7 @@ class PlannerLogic:
     def __init__(self, grid_calculator: GridCalculator):
         self.grid_calc = grid_calculator
 
+    @traced("planner.logic")
     def process(self, data: PlannerInput) -> PlannerOutput:
         # Calculate Safe Zone (Usable area horizontally between Toolbar and Right Rail)
         safe_zone = LayoutManager.calculate_safe_zone(
@@ -58,11 +105,12 @@ class PlannerLogic:
         rr_x = data.canvas_width - data.right_rail_width
         right_rail = Region(x=rr_x, y=0, w=data.right_rail_width, h=data.canvas_height)
 
-        button_h = data.canvas_height / 10
+        button_h = data.canvas_height / data.rail_slots
         nav_buttons = [
             Region(x=rr_x, y=i * button_h, w=data.right_rail_width, h=button_h)
-            for i in range(10)
+            for i in range(data.rail_slots)
         ]
+        rail_groups, pages = self._navigation(data.lab_pages, data.rail_slots)
 
         # Content area is between toolbar and right rail
         content_x = safe_zone.x
@@ -80,20 +128,14 @@ class PlannerLogic:
             w=main_w,
             h=data.canvas_height * (1 - config.HUB_HEADER_RATIO),
         )
-        # HUB Grid: Full width page
-        hub_grid_points = self._get_grid_points(
-            Region(x=0, y=0, w=grid_w, h=data.canvas_height),
-            data.grid_size,
+        # HUB, MAP and LAB share one full-width grid
+        grid_points = self._get_grid_points(
+            Region(x=0, y=0, w=grid_w, h=data.canvas_height), data.grid_size
         )
 
         map_arch = Region(
             x=content_x, y=0, w=main_w, h=data.canvas_height * config.MAP_ARCH_RATIO
         )
-        # MAP Grid: Full width page
-        map_arch_grid_points = self._get_grid_points(
-            Region(x=0, y=0, w=grid_w, h=data.canvas_height), data.grid_size
-        )
-
         map_tasks = Region(
             x=content_x,
             y=map_arch.h,
@@ -113,25 +155,75 @@ class PlannerLogic:
         ]
 
         lab_content = Region(x=content_x, y=0, w=main_w, h=data.canvas_height)
-        # LAB Grid: Full width page
-        lab_grid_points = self._get_grid_points(
-            Region(x=0, y=0, w=grid_w, h=data.canvas_height), data.grid_size
-        )
 
         return PlannerOutput(
             right_rail=right_rail,
             nav_buttons=nav_buttons,
+            rail_groups=rail_groups,
+            pages=pages,
             hub_header=hub_header,
             hub_scratchpad=hub_scratchpad,
-            hub_grid_points=hub_grid_points,
             map_architecture=map_arch,
-            map_arch_grid_points=map_arch_grid_points,
             map_tasks=map_tasks,
             task_rows=task_rows,
             lab_content=lab_content,
-            lab_grid_points=lab_grid_points,
+            grid_points=grid_points,
         )
 
+    def _navigation(
+        self, lab_pages: int, rail_slots: int
+    ) -> Tuple[List[List[RailSlot]], List[PlannerPage]]:
+        # Page indices: 0 = HUB, 1 = MAP, 2.. = LAB pages labelled "3", "4", ...
+        hub = RailSlot(label="HUB", target=0)
+        map_ = RailSlot(label="MAP", target=1)
+        labs = [RailSlot(label=str(i + 3), target=i + 2) for i in range(lab_pages)]
+
+        if lab_pages + 2 <= rail_slots:
+            # Everything fits: one rail, each page highlights its own slot
+            slots = [hub, map_] + labs
+            slots += [RailSlot(label="")] * (rail_slots - len(slots))
+            pages = [PlannerPage(kind="HUB", rail_group=0, active_slot=0)]
+            pages.append(PlannerPage(kind="MAP", rail_group=0, active_slot=1))
+            pages += [
+                PlannerPage(kind="LAB", rail_group=0, active_slot=i + 2)
+                for i in range(lab_pages)
+            ]
+            return [slots], pages
+
+        # Paged rail: HUB, MAP, "<<", a window of LAB pages, ">>".
+        # The arrows jump to the first page of the neighbouring window.
+        per_group = rail_slots - 4
+        if per_group < 1:
+            raise ValueError(f"A paged rail needs at least 5 slots, got {rail_slots}")
+        num_groups = -(-lab_pages // per_group)
+        groups = []
+        for g in range(num_groups):
+            window = labs[g * per_group : (g + 1) * per_group]
+            window += [RailSlot(label="")] * (per_group - len(window))
+            prev_slot = (
+                RailSlot(label="<<", target=2 + (g - 1) * per_group)
+                if g > 0
+                else RailSlot(label="")
+            )
+            next_slot = (
+                RailSlot(label=">>", target=2 + (g + 1) * per_group)
+                if g < num_groups - 1
+                else RailSlot(label="")
+            )
+            groups.append([hub, map_, prev_slot] + window + [next_slot])
+
+        pages = [
+            PlannerPage(kind="HUB", rail_group=0, active_slot=0),
+            PlannerPage(kind="MAP", rail_group=0, active_slot=1),
+        ]
+        pages += [
+            PlannerPage(
+                kind="LAB", rail_group=i // per_group, active_slot=3 + i % per_group
+            )
+            for i in range(lab_pages)
+        ]
+        return groups, pages
+
     def _get_grid_points(
         self, region: Region, grid_size: int
     ) -> List[Tuple[float, float]]:
@@ -153,6 +245,60 @@ class PlannerLogic:
         return points
 
 
+class BundleLogic:
+    """Page numbering and project index layout for a multi-project bundle."""
+
+    def process(self, data: BundleInput) -> BundleOutput:
+        if not data.projects:
+            raise ValueError("A bundle needs at least one project")
+        safe_zone = LayoutManager.calculate_safe_zone(
+            data.canvas_width,
+            data.canvas_height,
+            config.TOOLBAR_BUFFER,
+            ToolbarSide.LEFT,
+        )
+        content_x = safe_zone.x + 40
+        content_w = data.canvas_width - data.right_rail_width - content_x - 40
+        title = Region(x=content_x, y=config.MAP_TITLE_Y, w=content_w, h=0)
+
+        row_h = config.BUNDLE_INDEX_ROW_HEIGHT
+        top = config.BUNDLE_INDEX_TOP
+        rows_per_page = max(int((data.canvas_height - top - row_h) // row_h), 1)
+        num_index_pages = -(-len(data.projects) // rows_per_page)
+
+        sections = []
+        page = num_index_pages
+        for spec in data.projects:
+            count = 2 + spec.lab_pages
+            sections.append(
+                ProjectSection(spec=spec, first_page=page, page_count=count)
+            )
+            page += count
+
+        index_pages = []
+        for p in range(num_index_pages):
+            chunk = sections[p * rows_per_page : (p + 1) * rows_per_page]
+            index_pages.append(
+                [
+                    IndexRow(
+                        label=f"{p * rows_per_page + i + 1}. {section.spec.name}",
+                        target=section.first_page,
+                        region=Region(
+                            x=content_x, y=top + i * row_h, w=content_w, h=row_h
+                        ),
+                    )
+                    for i, section in enumerate(chunk)
+                ]
+            )
+
+        return BundleOutput(
+            title=title,
+            index_pages=index_pages,
+            sections=sections,
+            total_pages=page,
+        )
+
+
 # --- SECTION C: WORKFLOW ---
 
 
@@ -160,29 +306,142 @@ class ProjectPlannerWorker:
     def __init__(self, pdf: PDFInterface):
         self.pdf = pdf
         self.logic = PlannerLogic(GridCalculator())
+        self.bundle_logic = BundleLogic()
+        self.grid_worker = GridWorker(pdf)
+        # Set to a TemplateCollector to export the rail background and the
+        # grid as device templates instead of drawing them
+        self.templates = None
 
     def draw_planner(self, data: PlannerInput, page_links: List[int]):
         output = self.logic.process(data)
 
-        # HUB Page: Only navigation links (the background planner.pdf is overlayed in main.py)
+        # HUB Page: Only navigation (the background planner.pdf is overlayed in main.py)
         self.pdf.add_page()
-        self._draw_base_page(output, page_links, "HUB")
+        rail = grid = None
+        if self.templates is None:
+            rail = self._shared_block("rail", lambda: self._draw_rail(output))
+            grid = self._shared_block(
+                ("grid", data.draft),
+                lambda: self._draw_grid(output.grid_points, data.draft),
+            )
+        labels = [
+            self._shared_block(
+                ("labels",) + tuple(slot.label for slot in group),
+                lambda group=group: self._draw_rail_labels(output, group),
+            )
+            for group in output.rail_groups
+        ]
 
-        # MAP Page
-        self.pdf.add_page()
-        self._draw_base_page(output, page_links, "MAP")
-        self._draw_map_content(output, data)
+        for i, page in enumerate(output.pages):
+            if i > 0:
+                self.pdf.add_page()
+            with span(page.kind, project=data.project_name, page=self.pdf.page_no()):
+                self._draw_page(output, data, page, page_links, rail, grid, labels)
+
+    def _draw_page(
+        self,
+        output: PlannerOutput,
+        data: PlannerInput,
+        page: PlannerPage,
+        page_links: List[int],
+        rail: Optional[int],
+        grid: Optional[int],
+        labels: List[int],
+    ):
+        if self.templates is not None:
+            self._template_background(output, data.draft, page.kind != "HUB")
+        else:
+            self.pdf.use_shared(rail)
+        self._draw_active_slot(output, page)
+        self.pdf.use_shared(labels[page.rail_group])
+        self._link_rail(output, output.rail_groups[page.rail_group], page_links)
+        if page.kind == "HUB" and data.index_link is not None:
+            self._draw_bundle_header(data)
+        elif page.kind == "MAP":
+            if grid is not None:
+                self.pdf.use_shared(grid)
+            self._draw_map_content(output, data)
+        elif page.kind == "LAB" and grid is not None:
+            self.pdf.use_shared(grid)
+
+    def draw_bundle(self, data: BundleInput, page_links: List[int]) -> List[int]:
+        """
+        Project index page(s) followed by one HUB/MAP/LAB section per project.
+        Returns the page indices of the HUB pages (for the background merge).
+        """
+        bundle = self.bundle_logic.process(data)
+        output = self.logic.process(
+            PlannerInput(project_name="", draft=data.draft, lab_pages=0)
+        )
 
-        # LAB Pages
-        for i in range(3, 11):
+        for rows in bundle.index_pages:
             self.pdf.add_page()
-            self._draw_base_page(output, page_links, str(i))
-            self._draw_lab_content(output, data)
+            with span("INDEX", page=self.pdf.page_no()):
+                if self.templates is not None:
+                    self._template_background(output, data.draft, True)
+                else:
+                    rail = self._shared_block("rail", lambda: self._draw_rail(output))
+                    self.pdf.use_shared(rail)
+                    self.pdf.use_shared(
+                        self._shared_block(
+                            ("grid", data.draft),
+                            lambda: self._draw_grid(output.grid_points, data.draft),
+                        )
+                    )
+                self._draw_project_index(bundle, rows, page_links)
+
+        for section in bundle.sections:
+            first = section.first_page
+            self.draw_planner(
+                PlannerInput(
+                    project_name=section.spec.name,
+                    lab_pages=section.spec.lab_pages,
+                    draft=data.draft,
+                    index_link=page_links[0],
+                ),
+                page_links[first : first + section.page_count],
+            )
+        return [section.first_page for section in bundle.sections]
 
-    def _draw_base_page(
-        self, output: PlannerOutput, page_links: List[int], active_label: str
+    def _shared_block(self, key, draw) -> int:
+        # Recorded once per document, reused by every page and every project
+        return self.pdf.shared_block(("planner", key), draw)
+
+    def _draw_project_index(
+        self, bundle: BundleOutput, rows: List[IndexRow], page_links: List[int]
     ):
-        # 1. Right Rail Background
+        self.pdf.set_text_color(*config.COLOR_TEXT)
+        self.pdf.set_font(config.FONT_NAME, "B", size=config.SIZE_H1)
+        self.pdf.set_xy(bundle.title.x, bundle.title.y)
+        self.pdf.cell(0, 0, config.BUNDLE_INDEX_TITLE)
+
+        self.pdf.set_font(config.FONT_NAME, "", size=config.SIZE_BODY_LG)
+        self.pdf.text_cells(
+            [row.region.x for row in rows],
+            [row.region.y for row in rows],
+            rows[0].region.w,
+            rows[0].region.h,
+            [row.label for row in rows],
+            links=[page_links[row.target] for row in rows],
+        )
+        self.pdf.set_draw_color(*config.COLOR_LINE)
+        self.pdf.set_line_width(1)
+        for row in rows:
+            bottom = row.region.y + row.region.h
+            self.pdf.line(row.region.x, bottom, row.region.x + row.region.w, bottom)
+
+    def _draw_bundle_header(self, data: PlannerInput):
+        self.pdf.set_text_color(*config.COLOR_TEXT)
+        self.pdf.set_font(config.FONT_NAME, "", size=config.SIZE_NAV_LINKS)
+        self.pdf.set_xy(config.BUNDLE_NAME_X, config.BUNDLE_BACK_Y)
+        self.pdf.cell(0, config.SIZE_NAV_LINKS, "<- Projects", link=data.index_link)
+
+        self.pdf.set_font(config.FONT_NAME, "B", size=config.SIZE_H3)
+        self.pdf.set_xy(config.BUNDLE_NAME_X, config.BUNDLE_NAME_Y)
+        self.pdf.cell(0, config.SIZE_H3, data.project_name)
+
+    def _draw_rail(self, output: PlannerOutput):
+        # Background and button separators
         self.pdf.set_fill_color(*config.COLOR_SIDEBAR)
         self.pdf.rect(
             output.right_rail.x,
@@ -191,48 +450,100 @@ class ProjectPlannerWorker:
             output.right_rail.h,
             "F",
         )
-
-        # 2. Navigation Buttons
-        labels = ["HUB", "MAP", "3", "4", "5", "6", "7", "8", "9", "10"]
-        for i, button in enumerate(output.nav_buttons):
-            if i < len(page_links):
-                self.pdf.link(button.x, button.y, button.w, button.h, page_links[i])
-
-            self.pdf.set_text_color(*config.COLOR_TEXT)
-            self.pdf.set_font(
-                config.FONT_NAME,
-                "B" if labels[i] == active_label else "",
-                size=config.SIZE_NAV_LINKS,
-            )
-
-            text_x = button.x + (button.w / 2) - 30
-            text_y = button.y + (button.h / 2) + 10
-            self.pdf.set_xy(text_x, text_y)
-            self.pdf.cell(60, 0, labels[i], align="C")
-
-            self.pdf.set_draw_color(*config.COLOR_LINE)
+        self.pdf.set_draw_color(*config.COLOR_LINE)
+        for button in output.nav_buttons:
             self.pdf.line(
                 button.x, button.y + button.h, button.x + button.w, button.y + button.h
             )
 
-    def _draw_grid(self, points: List[Tuple[float, float]]):
-        self.pdf.set_fill_color(*config.COLOR_DOTS)
+    def _template_background(self, output: PlannerOutput, draft: bool, grid: bool):
+        # The rail's fill and separators, and the grid unless a HUB page
+        rail = [
+            TemplateLayer(
+                color=config.COLOR_SIDEBAR,
+                rects=[
+                    (
+                        output.right_rail.x,
+                        output.right_rail.y,
+                        output.right_rail.w,
+                        output.right_rail.h,
+                    )
+                ],
+            ),
+            TemplateLayer(
+                color=config.COLOR_LINE,
+                segments=[
+                    (b.x, b.y + b.h, b.x + b.w, b.y + b.h) for b in output.nav_buttons
+                ],
+                line_width=RAIL_LINE_WIDTH,
+            ),
+        ]
+        geometry, line_width = GridGeometry(), 1.0
+        if grid:
+            geometry, line_width = self._grid_geometry(output.grid_points, draft)
+        self.templates.add_page(
+            self.pdf.page_no(),
+            "grid" if grid else "rail",
+            ("planner", grid, draft),
+            geometry,
+            config.COLOR_PAPER,
+            config.COLOR_DOTS,
+            line_width,
+            layers=rail,
+        )
+
+    def _grid_geometry(
+        self, points: List[Tuple[float, float]], draft: bool
+    ) -> Tuple[GridGeometry, float]:
+        # What _draw_grid fills, as template geometry and its line width
+        if draft:
+            xs = sorted({px for px, _ in points})
+            ys = sorted({py for _, py in points})
+            guides = self.grid_worker.logic.guides(xs, ys, config.GUIDE_EVERY)
+            return GridGeometry(segments=guides), 0.5
         d = config.DOT_RADIUS * 2
-        for px, py in points:
-            self.pdf.rect(px - d / 2, py - d / 2, d, d, "F")
+        rects = [(px - d / 2, py - d / 2, d, d) for px, py in points]
+        return GridGeometry(rects=rects), 1.0
 
-    def _draw_hub_content(self, output: PlannerOutput, data: PlannerInput):
-        self._draw_grid(output.hub_grid_points)
-        self.pdf.set_draw_color(*config.COLOR_LINE)
+    def _draw_rail_labels(self, output: PlannerOutput, group: List[RailSlot]):
         self.pdf.set_text_color(*config.COLOR_TEXT)
-
-        # Title
-        self.pdf.set_font(config.FONT_NAME, "B", size=config.SIZE_H1)
-        self.pdf.set_xy(output.hub_header.x + config.HUB_TITLE_X, config.HUB_TITLE_Y)
-        self.pdf.cell(0, 0, data.project_name)
+        self.pdf.set_font(config.FONT_NAME, "", size=config.SIZE_NAV_LINKS)
+        for button, slot in zip(output.nav_buttons, group):
+            if not slot.label:
+                continue
+            text_x = button.x + (button.w / 2) - 30
+            text_y = button.y + (button.h / 2) + 10
+            self.pdf.set_xy(text_x, text_y)
+            self.pdf.cell(60, 0, slot.label, align="C")
+
+    def _draw_active_slot(self, output: PlannerOutput, page: PlannerPage):
+        if page.active_slot is None:
+            return
+        # Inset so the separator lines stay visible
+        button = output.nav_buttons[page.active_slot]
+        self.pdf.set_fill_color(*config.COLOR_RAIL_ACTIVE)
+        self.pdf.rect(button.x, button.y + 1, button.w, button.h - 2, "F")
+
+    def _link_rail(
+        self, output: PlannerOutput, group: List[RailSlot], page_links: List[int]
+    ):
+        for button, slot in zip(output.nav_buttons, group):
+            if slot.target is not None and slot.target < len(page_links):
+                self.pdf.link(
+                    button.x, button.y, button.w, button.h, page_links[slot.target]
+                )
+
+    def _draw_grid(self, points: List[Tuple[float, float]], draft: bool = False):
+        if draft:
+            xs = sorted({px for px, _ in points})
+            ys = sorted({py for _, py in points})
+            self.grid_worker.draw_guides(xs, ys, config.GUIDE_EVERY, config.COLOR_DOTS)
+            return
+        self.pdf.set_fill_color(*config.COLOR_DOTS)
+        d = config.DOT_RADIUS * 2
+        self.pdf.fill_rects([(px - d / 2, py - d / 2, d, d) for px, py in points])
 
     def _draw_map_content(self, output: PlannerOutput, data: PlannerInput):
-        self._draw_grid(output.map_arch_grid_points)
         self.pdf.set_draw_color(*config.COLOR_LINE)
         self.pdf.set_line_width(2)
 
@@ -262,6 +573,3 @@ class ProjectPlannerWorker:
         # Tasklist label (right side)
         self.pdf.set_xy(vertical_divider_x + 40, config.MAP_TITLE_Y)
         self.pdf.cell(0, 0, config.MAP_TASKLIST_TITLE)
-
-    def _draw_lab_content(self, output: PlannerOutput, data: PlannerInput):
-        self._draw_grid(output.lab_grid_points)
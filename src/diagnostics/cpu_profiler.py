@@ -0,0 +1,337 @@
+import cProfile
+import marshal
+import os
+import signal
+import sysconfig
+import time
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+
+# pstats layout: (file, line, function) -> (primitive calls, calls, self s,
+# cumulative s, {caller: (primitive calls, calls, self s, cumulative s)})
+Func = Tuple[str, int, str]
+RawStats = Dict[Func, Tuple[int, int, float, float, Dict[Func, Tuple]]]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_STDLIB = os.path.abspath(sysconfig.get_paths()["stdlib"])
+# Site-packages top-level package -> report group
+_LIBRARIES = {
+    "fpdf": "fpdf2",
+    "pypdf": "pypdf",
+    "pydantic": "pydantic",
+    "pydantic_core": "pydantic",
+    "fontTools": "fontTools",
+}
+# Our packages whose modules are reported together; other modules of ours
+# (grid_worker, pdf_adapter, ...) are reported one by one
+_OWN_PACKAGES = ("bujo.workers", "project_planner.workers")
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class GroupTime(BaseModel):
+    group: str  # e.g. "bujo.workers", "src.workers.grid_worker", "fpdf2"
+    kind: str  # "own" | "library" | "stdlib"
+    self_s: float
+    share: float  # of all self time
+
+
+class FunctionTime(BaseModel):
+    name: str  # "module:function"
+    group: str
+    calls: int  # sampled mode: samples the function was on the stack
+    self_s: float
+    cumulative_s: float
+
+
+class ProfileReport(BaseModel):
+    mode: str  # "cprofile" | "sample"
+    wall_s: float
+    profiled_s: float  # self time over all functions
+    groups: List[GroupTime]
+    top: List[FunctionTime]
+
+
+# --- SECTION B: PURE LOGIC ---
+def module_name(filename: str) -> str:
+    """Dotted module of a code file: repo-relative, per package or stdlib."""
+    if filename.startswith(("~", "<")):
+        return "builtins"
+    path = os.path.abspath(filename)
+    marker = os.sep + "site-packages" + os.sep
+    if marker in path:
+        relative = path.split(marker, 1)[1]
+    elif path.startswith(_STDLIB + os.sep):
+        relative = os.path.relpath(path, _STDLIB)
+    elif path.startswith(_ROOT + os.sep):
+        relative = os.path.relpath(path, _ROOT)
+    else:
+        return os.path.splitext(os.path.basename(path))[0]
+    dotted = os.path.splitext(relative)[0].replace(os.sep, ".")
+    return dotted[: -len(".__init__")] if dotted.endswith(".__init__") else dotted
+
+
+def module_group(filename: str) -> Tuple[str, str]:
+    """(group, kind) a function's time is reported under."""
+    module = module_name(filename)
+    path = os.path.abspath(filename)
+    if os.sep + "site-packages" + os.sep in path:
+        top = module.split(".", 1)[0]
+        return _LIBRARIES.get(top, top), "library"
+    if module == "builtins" or path.startswith(_STDLIB + os.sep):
+        return "stdlib", "stdlib"
+    for package in _OWN_PACKAGES:
+        if module.startswith(package + "."):
+            return package, "own"
+    return module, "own"
+
+
+def function_label(func: Func) -> str:
+    filename, _, name = func
+    if filename.startswith(("~", "<")):
+        return name.strip("<>") if filename == "~" else name
+    return f"{module_name(filename)}:{name}"
+
+
+class ProfileGrouper:
+    """
+    Self time per module group. Built-in functions (zlib, str.join, ...)
+    have no module of their own in cProfile, so their time goes to the
+    groups of their callers, split as the per-caller times say.
+    """
+
+    def process(
+        self, stats: RawStats, mode: str, wall_s: float, top: int = 15
+    ) -> ProfileReport:
+        groups: Dict[str, List] = {}  # group -> [kind, self s]
+
+        def add(filename: str, seconds: float):
+            group, kind = module_group(filename)
+            groups.setdefault(group, [kind, 0.0])[1] += seconds
+
+        for func, (_, _, tt, _, callers) in stats.items():
+            if func[0] != "~" or not callers:
+                add(func[0], tt)
+                continue
+            caller_total = sum(c[2] for c in callers.values() if isinstance(c, tuple))
+            if caller_total <= 0:
+                add(func[0], tt)
+                continue
+            for caller, c in callers.items():
+                add(caller[0], tt * c[2] / caller_total)
+
+        profiled = sum(seconds for _, seconds in groups.values())
+        functions = sorted(stats.items(), key=lambda item: -item[1][2])[:top]
+        return ProfileReport(
+            mode=mode,
+            wall_s=wall_s,
+            profiled_s=profiled,
+            groups=sorted(
+                (
+                    GroupTime(
+                        group=group,
+                        kind=kind,
+                        self_s=seconds,
+                        share=seconds / profiled if profiled else 0.0,
+                    )
+                    for group, (kind, seconds) in groups.items()
+                ),
+                key=lambda g: -g.self_s,
+            ),
+            top=[
+                FunctionTime(
+                    name=function_label(func),
+                    group=module_group(func[0])[0],
+                    calls=nc,
+                    self_s=tt,
+                    cumulative_s=ct,
+                )
+                for func, (_, nc, tt, ct, _) in functions
+            ],
+        )
+
+
+def collapse_call_graph(stats: RawStats, min_s: float = 1e-4) -> Dict[str, float]:
+    """
+    Collapsed stacks ("a;b;c" -> self seconds) rebuilt from cProfile's
+    caller/callee totals. cProfile keeps no stacks, so a function called
+    from several places splits its callees between them in proportion; the
+    result is an estimate, exact for code with a single call path.
+    """
+    callees: Dict[Func, List[Tuple[Func, float]]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, c in callers.items():
+            if isinstance(c, tuple):
+                callees.setdefault(caller, []).append((func, c[3]))
+    roots = [
+        func
+        for func, (_, _, _, _, callers) in stats.items()
+        if not any(caller in stats for caller in callers)
+    ]
+    stacks: Dict[str, float] = {}
+
+    def visit(func: Func, path: List[Func], labels: str, fraction: float):
+        _, _, tt, ct, _ = stats[func]
+        if tt * fraction >= min_s:
+            stacks[labels] = stacks.get(labels, 0.0) + tt * fraction
+        for callee, edge_ct in callees.get(func, ()):
+            if callee in path or callee not in stats:
+                continue  # recursion: its time is already in this frame
+            total = stats[callee][3]
+            share = fraction * edge_ct / total if total else 0.0
+            if total * share >= min_s:
+                visit(
+                    callee,
+                    path + [callee],
+                    labels + ";" + function_label(callee),
+                    share,
+                )
+
+    for root in roots:
+        visit(root, [root], function_label(root), 1.0)
+    return stacks
+
+
+# --- SECTION C: WORKFLOW ---
+class CpuProfiler:
+    """
+    Profiles a build with cProfile ("cprofile": every call, exact counts,
+    some overhead on small functions) or a SIGPROF stack sampler ("sample":
+    the main thread's stack every `interval` seconds of CPU time, little
+    overhead, Unix only). Either way `write()` leaves a .pstats file for
+    pstats/snakeviz and collapsed stacks for flamegraph.pl or speedscope.
+    """
+
+    def __init__(self, mode: str = "cprofile", interval: float = 0.001):
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Unknown profiler {mode!r}: use 'cprofile' or 'sample'")
+        self.mode = mode
+        self.interval = interval
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self._profile: Optional[cProfile.Profile] = None
+        self._samples: Dict[tuple, int] = {}  # code objects, root first -> count
+        self._previous_handler = None
+        self._t0 = 0.0
+        self._cpu0 = 0.0
+
+    def start(self):
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            return
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        if self.mode == "cprofile":
+            self._profile.disable()
+        else:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+        self.wall_s = time.perf_counter() - self._t0
+        self.cpu_s = time.process_time() - self._cpu0
+
+    def _sample_s(self) -> float:
+        # The kernel rounds the timer up to its tick, so a sample stands for
+        # the CPU time actually used over the samples taken
+        samples = sum(self._samples.values())
+        return self.cpu_s / samples if samples else self.interval
+
+    def _sample(self, signum, frame):
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        key = tuple(reversed(codes))
+        self._samples[key] = self._samples.get(key, 0) + 1
+
+    def stats(self) -> RawStats:
+        if self.mode == "cprofile":
+            self._profile.create_stats()
+            return self._profile.stats
+        # Samples in pstats form: a function's calls are the samples it was
+        # on the stack in, its self time the samples it was on top
+        stats: Dict[Func, list] = {}
+        sample_s = self._sample_s()
+        for codes, count in self._samples.items():
+            funcs = [(c.co_filename, c.co_firstlineno, c.co_name) for c in codes]
+            seconds = count * sample_s
+            seen = set()
+            for i, func in enumerate(funcs):
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                if func not in seen:
+                    seen.add(func)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+                if i:
+                    caller = entry[4].setdefault(funcs[i - 1], [0, 0, 0.0, 0.0])
+                    caller[0] += count
+                    caller[1] += count
+                    caller[3] += seconds
+                    if i == len(funcs) - 1:
+                        caller[2] += seconds
+            stats[funcs[-1]][2] += seconds
+        return {
+            func: (cc, nc, tt, ct, {k: tuple(v) for k, v in callers.items()})
+            for func, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+    def collapsed(self) -> Dict[str, float]:
+        if self.mode == "cprofile":
+            return collapse_call_graph(self.stats())
+        stacks: Dict[str, float] = {}
+        sample_s = self._sample_s()
+        for codes, count in self._samples.items():
+            labels = ";".join(
+                function_label((c.co_filename, c.co_firstlineno, c.co_name))
+                for c in codes
+            )
+            stacks[labels] = stacks.get(labels, 0.0) + count * sample_s
+        return stacks
+
+    def report(self, top: int = 15) -> ProfileReport:
+        return ProfileGrouper().process(self.stats(), self.mode, self.wall_s, top)
+
+    def write(self, prefix: str) -> List[str]:
+        """Writes `prefix`.pstats and `prefix`.collapsed.txt (microseconds)."""
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pstats_path = prefix + ".pstats"
+        with open(pstats_path, "wb") as f:
+            marshal.dump(self.stats(), f)
+        collapsed_path = prefix + ".collapsed.txt"
+        with open(collapsed_path, "w") as f:
+            for labels, seconds in sorted(self.collapsed().items()):
+                if round(seconds * 1e6):
+                    f.write(f"{labels} {round(seconds * 1e6)}\n")
+        return [pstats_path, collapsed_path]
+
+
+def format_profile(report: ProfileReport) -> str:
+    lines = [
+        f"{report.mode}: {report.wall_s:.2f} s wall, "
+        f"{report.profiled_s:.2f} s profiled",
+        f"{'group':<34}{'kind':<9}{'self s':>8}{'share':>8}",
+    ]
+    for g in report.groups:
+        if g.share < 0.001:
+            continue
+        lines.append(
+            f"{g.group:<34}{g.kind:<9}{g.self_s:>8.3f}{g.share * 100:>7.1f}%"
+        )
+    own = sum(g.share for g in report.groups if g.kind == "own")
+    lines.append(
+        f"Own code {own * 100:.1f}%, libraries and stdlib {(1 - own) * 100:.1f}%"
+    )
+    lines.append("")
+    lines.append(f"{'function':<58}{'calls':>8}{'self s':>8}{'cum s':>8}")
+    for f in report.top:
+        name = f.name if len(f.name) <= 56 else "..." + f.name[-53:]
+        lines.append(
+            f"{name:<58}{f.calls:>8}{f.self_s:>8.3f}{f.cumulative_s:>8.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,100 @@
+import argparse
+import os
+import tempfile
+import time
+from pydantic import BaseModel
+from typing import List
+from src.diagnostics.pdf_inspect import PdfInspector
+from src.infrastructure.pdf_adapter import FPDFAdapter
+from src.workers.grid_styles import GRID_STYLES
+from src.workers.grid_worker import GridInput, GridWorker
+
+CANVAS = (1620, 2160)
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class GridBenchRow(BaseModel):
+    style: str
+    pitch: int
+    mode: str  # "inline" | "shared"
+    pages: int
+    ops_per_page: float  # form XObjects expanded: what a renderer executes
+    content_kb_per_page: float  # uncompressed page stream
+    file_kb_per_page: float  # finished PDF, fonts-free
+    ms_per_page: float
+
+
+# --- SECTION C: WORKFLOW ---
+def bench(style: str, pitch: int, shared: bool, pages: int) -> GridBenchRow:
+    pdf = FPDFAdapter(format=CANVAS)
+    worker = GridWorker(pdf)
+    grid_input = GridInput(
+        canvas_width=CANVAS[0],
+        canvas_height=CANVAS[1],
+        grid_size=pitch,
+        toolbar_buffer=0,
+        dot_radius=1,
+        style=style,
+        shared=shared,
+    )
+    t0 = time.perf_counter()
+    for _ in range(pages):
+        pdf.add_page()
+        worker.draw_grid(grid_input, (0, 0, 0))
+    content = sum(len(pdf.pdf.pages[n].contents) for n in range(1, pages + 1))
+    data = pdf.output_bytes()
+    seconds = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "grid.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        summary = PdfInspector().process(path)
+    return GridBenchRow(
+        style=style,
+        pitch=pitch,
+        mode="shared" if shared else "inline",
+        pages=pages,
+        ops_per_page=sum(p.total_ops for p in summary.pages) / pages,
+        content_kb_per_page=content / pages / 1024,
+        file_kb_per_page=len(data) / pages / 1024,
+        ms_per_page=seconds / pages * 1000,
+    )
+
+
+def format_bench(rows: List[GridBenchRow]) -> str:
+    lines = [
+        f"{'style':<10}{'pitch':>6}{'mode':>8}{'ops/page':>10}"
+        f"{'content KB':>12}{'file KB':>10}{'ms/page':>9}"
+    ]
+    for r in rows:
+        lines.append(
+            f"{r.style:<10}{r.pitch:>6}{r.mode:>8}{r.ops_per_page:>10.0f}"
+            f"{r.content_kb_per_page:>12.1f}{r.file_kb_per_page:>10.2f}"
+            f"{r.ms_per_page:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Operators, bytes and time per page for every grid style."
+    )
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument(
+        "--styles", nargs="+", default=sorted(GRID_STYLES), choices=sorted(GRID_STYLES)
+    )
+    parser.add_argument("--pitches", nargs="+", type=int, default=[45, 30, 15])
+    args = parser.parse_args(argv)
+
+    rows = [
+        bench(style, pitch, shared, args.pages)
+        for style in args.styles
+        for pitch in args.pitches
+        for shared in (False, True)
+    ]
+    print(format_bench(rows))
+
+
+if __name__ == "__main__":
+    main()
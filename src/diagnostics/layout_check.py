@@ -0,0 +1,163 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class LayoutBox(BaseModel):
+    """
+    One drawn element in page coordinates (top-left origin). Text boxes span
+    the cap band, from the baseline up 0.7 em: a line or other text crossing
+    that band strikes through the glyphs, while descender space is left to
+    underlines and separators.
+    """
+
+    page: int
+    kind: str  # "text" | "link" | "line" | "shape"
+    x: float
+    y: float
+    w: float
+    h: float
+    text: str = ""
+    # Horizontal extent the text was laid out in (cell width), if any
+    cell_x: Optional[float] = None
+    cell_w: Optional[float] = None
+
+
+class LayoutIssue(BaseModel):
+    page: int  # 1-based
+    page_kind: str
+    kind: str  # "clipped" | "overflow" | "overlap" | "truncated"
+    detail: str
+
+
+class LayoutCheckInput(BaseModel):
+    width: float
+    height: float
+    boxes: List[LayoutBox]
+    page_kinds: List[str]  # index = page - 1
+    tolerance: float = 1.0  # pt
+
+
+class LayoutReport(BaseModel):
+    pages: int
+    boxes: int
+    issues: List[LayoutIssue]
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+# --- SECTION B: PURE LOGIC ---
+def _label(box: LayoutBox) -> str:
+    if box.text:
+        text = box.text if len(box.text) <= 24 else box.text[:21] + "..."
+        return f"{box.kind} {text!r}"
+    return f"{box.kind} at ({box.x:.0f}, {box.y:.0f})"
+
+
+def _crosses(a0: float, a1: float, b0: float, b1: float, tol: float) -> bool:
+    """Two intervals share more than `tol`; a zero-length one must lie inside."""
+    if a1 - a0 < tol:
+        return b0 + tol < a0 < b1 - tol
+    if b1 - b0 < tol:
+        return a0 + tol < b0 < a1 - tol
+    return min(a1, b1) - max(a0, b0) > tol
+
+
+# Pairs of kinds that must not overlap: crossed text, ambiguous tap targets
+_CONFLICTS = {("text", "text"), ("line", "text"), ("link", "link")}
+
+
+class LayoutChecker:
+    """
+    Geometric checks over recorded boxes, page by page:
+    - clipped: text, links or lines reaching past the page edge
+    - overflow: text wider than the cell it was laid out in
+    - overlap: text crossing text or a line, or two link areas overlapping
+    Overlaps are found with a sweep over boxes sorted by left edge, so a
+    page with hundreds of index cells costs about as much as it has pairs
+    that actually share columns.
+    """
+
+    def process(self, data: LayoutCheckInput) -> LayoutReport:
+        tol = data.tolerance
+        by_page: Dict[int, List[LayoutBox]] = {}
+        for box in data.boxes:
+            by_page.setdefault(box.page, []).append(box)
+
+        issues = []
+        for page in sorted(by_page):
+            page_kind = (
+                data.page_kinds[page - 1] if page <= len(data.page_kinds) else ""
+            )
+
+            def issue(kind: str, detail: str):
+                issues.append(
+                    LayoutIssue(
+                        page=page, page_kind=page_kind, kind=kind, detail=detail
+                    )
+                )
+
+            boxes = by_page[page]
+            for box in boxes:
+                if box.kind == "shape":
+                    continue
+                if (
+                    box.x < -tol
+                    or box.y < -tol
+                    or box.x + box.w > data.width + tol
+                    or box.y + box.h > data.height + tol
+                ):
+                    issue("clipped", f"{_label(box)} extends past the page edge")
+                if box.cell_w is not None and (
+                    box.x < box.cell_x - tol
+                    or box.x + box.w > box.cell_x + box.cell_w + tol
+                ):
+                    issue(
+                        "overflow",
+                        f"{_label(box)} is {box.w:.0f} wide in a "
+                        f"{box.cell_w:.0f} cell",
+                    )
+            for a, b in self._overlaps(boxes, tol):
+                issue("overlap", f"{_label(a)} overlaps {_label(b)}")
+
+        return LayoutReport(
+            pages=len(data.page_kinds), boxes=len(data.boxes), issues=issues
+        )
+
+    @staticmethod
+    def _overlaps(
+        boxes: List[LayoutBox], tol: float
+    ) -> List[Tuple[LayoutBox, LayoutBox]]:
+        found = []
+        active: List[LayoutBox] = []
+        for box in sorted(
+            (b for b in boxes if b.kind != "shape"), key=lambda b: b.x
+        ):
+            active = [a for a in active if a.x + a.w >= box.x]
+            for other in active:
+                if tuple(sorted((other.kind, box.kind))) not in _CONFLICTS:
+                    continue
+                if _crosses(
+                    other.x, other.x + other.w, box.x, box.x + box.w, tol
+                ) and _crosses(other.y, other.y + other.h, box.y, box.y + box.h, tol):
+                    found.append((other, box))
+            active.append(box)
+        return found
+
+
+def format_layout_report(report: LayoutReport, limit: int = 40) -> str:
+    counts: Dict[str, int] = {}
+    for i in report.issues:
+        counts[i.kind] = counts.get(i.kind, 0) + 1
+    summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items()))
+    lines = [
+        f"{report.pages} pages, {report.boxes} elements: "
+        + (summary if summary else "no issues")
+    ]
+    for i in report.issues[:limit]:
+        lines.append(f"  p{i.page:<5}{i.page_kind:<28}{i.kind:<10}{i.detail}")
+    if len(report.issues) > limit:
+        lines.append(f"  ... {len(report.issues) - limit} more")
+    return "\n".join(lines)
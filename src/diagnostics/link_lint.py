@@ -0,0 +1,189 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+
+Rect = Tuple[float, float, float, float]  # x, y, w, h
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class LinkLintInput(BaseModel):
+    """
+    Link areas of a finished document in page coordinates (top-left origin),
+    per page (index = page - 1), with the page each one jumps to. A target of
+    None is a link that leaves the document (URL, named destination).
+    """
+
+    width: float
+    height: float
+    pages: List[List[Tuple[Rect, Optional[int]]]]
+    tolerance: float = 0.5  # pt: adjacent cells share an edge, not an area
+
+
+class LinkIssue(BaseModel):
+    page: int  # 1-based
+    kind: str  # "overlap" | "outside" | "empty" | "dead"
+    detail: str
+
+
+class LinkLintReport(BaseModel):
+    pages: int
+    links: int
+    issues: List[LinkIssue]
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+# --- SECTION B: PURE LOGIC ---
+def _describe(rect: Rect, target: Optional[int]) -> str:
+    x, y, w, h = rect
+    to = f" -> p{target}" if target is not None else ""
+    return f"link {w:.0f}x{h:.0f} at ({x:.0f}, {y:.0f}){to}"
+
+
+class SpatialGrid:
+    """
+    Uniform grid over one page's rects: each rect is filed under every cell
+    it touches, so only rects sharing a cell are compared. With the cell
+    sized to the typical rect, a page of n links costs O(n) plus the pairs
+    that really are close, instead of O(n^2).
+
+    Rects are shrunk by `inset` on every side first, so neighbours that only
+    share an edge (index cells, calendar days) are never filed together.
+    """
+
+    def __init__(self, rects: List[Rect], cell: float, inset: float = 0.0):
+        self.cell = cell
+        self.inset = inset
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x, y, w, h) in enumerate(rects):
+            x0, x1 = int((x + inset) // cell), int((x + w - inset) // cell)
+            y0, y1 = int((y + inset) // cell), int((y + h - inset) // cell)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def candidate_pairs(self, rects: List[Rect]) -> List[Tuple[int, int]]:
+        """Index pairs (i < j) sharing a cell, each listed once."""
+        cell, inset = self.cell, self.inset
+        pairs = []
+        for (cx, cy), members in self.cells.items():
+            if len(members) < 2:
+                continue
+            for a, i in enumerate(members):
+                xi, yi = rects[i][0], rects[i][1]
+                for j in members[a + 1 :]:
+                    xj, yj = rects[j][0], rects[j][1]
+                    # A pair sharing several cells is listed from the one
+                    # holding the top-left corner of their (shrunk) overlap
+                    if (
+                        int(((xi if xi > xj else xj) + inset) // cell) == cx
+                        and int(((yi if yi > yj else yj) + inset) // cell) == cy
+                    ):
+                        pairs.append((i, j))
+        return pairs
+
+
+class LinkLinter:
+    """
+    Checks every link area of a document, page by page:
+    - overlap: two areas sharing more than `tolerance` both ways, so a tap
+      between them is ambiguous
+    - outside: an area reaching past the page edge
+    - empty: an area narrower or lower than `tolerance`, impossible to hit
+    - dead: a destination page that is not in the document
+    Pages repeating another page's link areas (daily pages of a month, the
+    rails of a planner) reuse its overlap search.
+    """
+
+    def process(self, data: LinkLintInput) -> LinkLintReport:
+        tol = data.tolerance
+        page_count = len(data.pages)
+        issues = []
+        links = 0
+        overlaps: Dict[Tuple[Rect, ...], List[Tuple[int, int]]] = {}
+        for page, entries in enumerate(data.pages, start=1):
+            links += len(entries)
+            rects = tuple(rect for rect, _ in entries)
+            for rect, target in entries:
+                x, y, w, h = rect
+                if w <= tol or h <= tol:
+                    issues.append(
+                        LinkIssue(
+                            page=page,
+                            kind="empty",
+                            detail=f"{_describe(rect, target)} has no area",
+                        )
+                    )
+                if (
+                    x < -tol
+                    or y < -tol
+                    or x + w > data.width + tol
+                    or y + h > data.height + tol
+                ):
+                    issues.append(
+                        LinkIssue(
+                            page=page,
+                            kind="outside",
+                            detail=f"{_describe(rect, target)} extends past the page",
+                        )
+                    )
+                if target is not None and not 1 <= target <= page_count:
+                    issues.append(
+                        LinkIssue(
+                            page=page,
+                            kind="dead",
+                            detail=f"{_describe(rect, target)}: the document has "
+                            f"{page_count} pages",
+                        )
+                    )
+            pairs = overlaps.get(rects)
+            if pairs is None:
+                pairs = overlaps[rects] = self._overlaps(rects, tol)
+            for i, j in pairs:
+                issues.append(
+                    LinkIssue(
+                        page=page,
+                        kind="overlap",
+                        detail=f"{_describe(*entries[i])} overlaps "
+                        f"{_describe(*entries[j])}",
+                    )
+                )
+        return LinkLintReport(pages=page_count, links=links, issues=issues)
+
+    @staticmethod
+    def _overlaps(rects: Tuple[Rect, ...], tol: float) -> List[Tuple[int, int]]:
+        if len(rects) < 2:
+            return []
+        # Cells about the size of a typical link: few links per cell, and a
+        # link in only a handful of cells
+        sizes = sorted(max(w, h) for _, _, w, h in rects)
+        cell = max(sizes[len(sizes) // 2], 8.0)
+        grid = SpatialGrid(rects, cell, inset=tol / 2)
+        found = []
+        for i, j in grid.candidate_pairs(rects):
+            xi, yi, wi, hi = rects[i]
+            xj, yj, wj, hj = rects[j]
+            if (
+                min(xi + wi, xj + wj) - max(xi, xj) > tol
+                and min(yi + hi, yj + hj) - max(yi, yj) > tol
+            ):
+                found.append((i, j))
+        return sorted(found)
+
+
+# --- SECTION C: WORKFLOW ---
+def format_link_report(report: LinkLintReport, limit: int = 20) -> str:
+    counts: Dict[str, int] = {}
+    for issue in report.issues:
+        counts[issue.kind] = counts.get(issue.kind, 0) + 1
+    summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items()))
+    lines = [
+        f"Links: {report.links} on {report.pages} pages, "
+        + (summary if summary else "no issues")
+    ]
+    for issue in report.issues[:limit]:
+        lines.append(f"  p{issue.page:<5}{issue.kind:<9}{issue.detail}")
+    if len(report.issues) > limit:
+        lines.append(f"  ... {len(report.issues) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,303 @@
+import fnmatch
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pydantic import BaseModel
+from typing import Callable, Dict, List, Optional
+
+MB = 1024 * 1024
+
+# Keep the profiler's own bookkeeping out of the allocation-site tables
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class AllocationSite(BaseModel):
+    location: str  # "path/to/file.py:123"
+    size_kb: float
+    blocks: int
+
+
+class PhaseMemory(BaseModel):
+    name: str
+    pages: int
+    duration_s: float
+    peak_mb: float  # tracemalloc peak above the phase start
+    retained_mb: float  # traced memory still held when the phase ends
+    rss_start_mb: float
+    rss_peak_mb: float  # highest sampled RSS during the phase
+    retained_kb_per_page: float
+    blocks_per_page: float
+    top_sites: List[AllocationSite]
+
+
+class MemoryReport(BaseModel):
+    phases: List[PhaseMemory]
+    total_peak_mb: float
+    total_retained_mb: float
+    rss_peak_mb: float
+    top_sites: List[AllocationSite]
+
+
+class PhaseBudget(BaseModel):
+    peak_mb: Optional[float] = None
+    retained_mb: Optional[float] = None
+
+
+class MemoryBudget(BaseModel):
+    # Phase name glob (e.g. "content:*") -> limits
+    phases: Dict[str, PhaseBudget] = {}
+    rss_peak_mb: Optional[float] = None
+
+
+class BudgetViolation(BaseModel):
+    phase: str
+    metric: str
+    limit_mb: float
+    actual_mb: float
+
+
+# --- SECTION B: PURE LOGIC ---
+class BudgetChecker:
+    def process(
+        self, report: MemoryReport, budget: MemoryBudget
+    ) -> List[BudgetViolation]:
+        violations = []
+        for phase in report.phases:
+            matched = False
+            for pattern, limits in budget.phases.items():
+                if not fnmatch.fnmatchcase(phase.name, pattern):
+                    continue
+                matched = True
+                if limits.peak_mb is not None and phase.peak_mb > limits.peak_mb:
+                    violations.append(
+                        BudgetViolation(
+                            phase=phase.name,
+                            metric="peak",
+                            limit_mb=limits.peak_mb,
+                            actual_mb=phase.peak_mb,
+                        )
+                    )
+                if (
+                    limits.retained_mb is not None
+                    and phase.retained_mb > limits.retained_mb
+                ):
+                    violations.append(
+                        BudgetViolation(
+                            phase=phase.name,
+                            metric="retained",
+                            limit_mb=limits.retained_mb,
+                            actual_mb=phase.retained_mb,
+                        )
+                    )
+            if not matched and budget.phases:
+                # A phase added without a budget would never be checked
+                violations.append(
+                    BudgetViolation(
+                        phase=phase.name,
+                        metric="unbudgeted",
+                        limit_mb=0.0,
+                        actual_mb=phase.peak_mb,
+                    )
+                )
+        if budget.rss_peak_mb is not None and report.rss_peak_mb > budget.rss_peak_mb:
+            violations.append(
+                BudgetViolation(
+                    phase="*",
+                    metric="rss_peak",
+                    limit_mb=budget.rss_peak_mb,
+                    actual_mb=report.rss_peak_mb,
+                )
+            )
+        return violations
+
+
+def format_report(report: MemoryReport) -> str:
+    lines = [
+        f"{'phase':<22}{'pages':>6}{'time s':>8}{'peak MB':>9}{'kept MB':>9}"
+        f"{'RSS MB':>8}{'KB/page':>9}{'blk/page':>9}"
+    ]
+    for p in report.phases:
+        lines.append(
+            f"{p.name:<22}{p.pages:>6}{p.duration_s:>8.2f}{p.peak_mb:>9.2f}"
+            f"{p.retained_mb:>9.2f}{p.rss_peak_mb:>8.1f}"
+            f"{p.retained_kb_per_page:>9.1f}{p.blocks_per_page:>9.1f}"
+        )
+    lines.append(
+        f"total: peak {report.total_peak_mb:.2f} MB, retained "
+        f"{report.total_retained_mb:.2f} MB, RSS peak {report.rss_peak_mb:.1f} MB"
+    )
+    lines.append("top allocation sites (retained):")
+    for site in report.top_sites:
+        lines.append(f"  {site.size_kb:>10.1f} KB {site.blocks:>8} blk  {site.location}")
+    return "\n".join(lines)
+
+
+def load_budget(path: Optional[str], default: Dict[str, dict]) -> MemoryBudget:
+    """Budget from a JSON file if given, else from the generator's config dict."""
+    if path:
+        with open(path) as f:
+            return MemoryBudget.model_validate(json.load(f))
+    return MemoryBudget.model_validate(default)
+
+
+# --- SECTION C: WORKFLOW ---
+def _current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in KB on Linux: the best we can do is the high-water mark
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _RssSampler:
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.peak_mb = max(self.peak_mb, _current_rss_mb())
+
+    def __enter__(self):
+        self.peak_mb = _current_rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, _current_rss_mb())
+
+
+class MemoryProfiler:
+    """
+    Records tracemalloc and RSS figures for named build phases.
+    Usage: `with profiler.phase("index"): ...`, then `profiler.report()`.
+    """
+
+    def __init__(self, top_n: int = 10, rss_interval_s: float = 0.01):
+        self.page_counter: Callable[[], int] = lambda: 0
+        self.top_n = top_n
+        self.rss_interval_s = rss_interval_s
+        self.phases: List[PhaseMemory] = []
+        self._baseline = None
+        self._owns_tracemalloc = False
+        self._rss_peak_mb = 0.0
+        self._peak_bytes = 0
+
+    def track_pages(self, page_counter: Callable[[], int]):
+        self.page_counter = page_counter
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._owns_tracemalloc = True
+        self._baseline = self._snapshot()
+        self._start_bytes = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name: str):
+        if self._baseline is None:
+            self.start()
+        before = self._snapshot()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start_pages = self.page_counter()
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        with _RssSampler(self.rss_interval_s) as sampler:
+            rss_start = _current_rss_mb()
+            yield
+        duration = time.perf_counter() - t0
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        after = self._snapshot()
+        pages = max(self.page_counter() - start_pages, 0)
+
+        stats = after.compare_to(before, "lineno")
+        retained_blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+        retained = end_bytes - start_bytes
+        self._peak_bytes = max(self._peak_bytes, peak_bytes)
+        self._rss_peak_mb = max(self._rss_peak_mb, sampler.peak_mb)
+
+        self.phases.append(
+            PhaseMemory(
+                name=name,
+                pages=pages,
+                duration_s=duration,
+                peak_mb=(peak_bytes - start_bytes) / MB,
+                retained_mb=retained / MB,
+                rss_start_mb=rss_start,
+                rss_peak_mb=sampler.peak_mb,
+                retained_kb_per_page=(retained / 1024 / pages) if pages else 0.0,
+                blocks_per_page=(retained_blocks / pages) if pages else 0.0,
+                top_sites=self._top_sites(stats, 3),
+            )
+        )
+
+    def report(self) -> MemoryReport:
+        final = self._snapshot()
+        end_bytes = tracemalloc.get_traced_memory()[0]
+        stats = final.compare_to(self._baseline, "lineno")
+        return MemoryReport(
+            phases=self.phases,
+            total_peak_mb=(self._peak_bytes - self._start_bytes) / MB,
+            total_retained_mb=(end_bytes - self._start_bytes) / MB,
+            rss_peak_mb=self._rss_peak_mb,
+            top_sites=self._top_sites(stats, self.top_n),
+        )
+
+    def check(self, report: MemoryReport, budget: MemoryBudget) -> MemoryReport:
+        """Raises MemoryBudgetExceeded if the report breaks any budget."""
+        violations = BudgetChecker().process(report, budget)
+        if violations:
+            details = "; ".join(
+                f"{v.phase} has no budget (peak {v.actual_mb:.2f} MB)"
+                if v.metric == "unbudgeted"
+                else f"{v.phase} {v.metric} {v.actual_mb:.2f} MB > {v.limit_mb:.2f} MB"
+                for v in violations
+            )
+            raise MemoryBudgetExceeded(details)
+        return report
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    @staticmethod
+    def _top_sites(stats, n: int) -> List[AllocationSite]:
+        sites = []
+        for stat in stats:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            sites.append(
+                AllocationSite(
+                    location=f"{frame.filename}:{frame.lineno}",
+                    size_kb=stat.size_diff / 1024,
+                    blocks=stat.count_diff,
+                )
+            )
+            if len(sites) == n:
+                break
+        return sites
@@ -0,0 +1,351 @@
+import argparse
+import gc
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional
+
+# Scratch space for outputs that are read back (the planner's background
+# merge): memory-backed where the system has one
+_TMPFS = "/dev/shm"
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class BenchResult(BaseModel):
+    name: str
+    number: int  # calls timed together in one sample
+    samples_ms: List[float]  # per call, one entry per sample
+
+    @property
+    def median_ms(self) -> float:
+        return _median(self.samples_ms)
+
+    @property
+    def min_ms(self) -> float:
+        return min(self.samples_ms)
+
+
+class BenchRun(BaseModel):
+    suite: str
+    sink: str  # "null" | "file"
+    python: str
+    machine: str
+    cpus: int
+    results: List[BenchResult]
+
+
+class BenchDelta(BaseModel):
+    name: str
+    baseline_ms: float  # medians
+    current_ms: float
+    change: float  # current / baseline - 1
+    p_value: float  # one-sided: current slower than baseline
+    regression: bool
+    improvement: bool
+
+
+class BenchComparison(BaseModel):
+    deltas: List[BenchDelta]
+    missing: List[str]  # in the baseline, not in the current run
+    environment_differs: bool
+
+    @property
+    def ok(self) -> bool:
+        return not any(d.regression for d in self.deltas)
+
+
+# --- SECTION B: PURE LOGIC ---
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def mann_whitney_p(a: List[float], b: List[float]) -> float:
+    """
+    One-sided Mann-Whitney U test, normal approximation with tie and
+    continuity corrections: the probability of `b` being this much larger
+    than `a` by chance. Timings are skewed by outliers, so ranks fit them
+    better than means.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 1.0
+    pooled = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t**3 - t
+        i = j + 1
+    n = n1 + n2
+    rank_b = sum(r for r, (_, group) in zip(ranks, pooled) if group == 1)
+    u = rank_b - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 0.0 if u > mean else 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class BenchComparator:
+    """
+    A case regresses when its samples are slower than the baseline's with
+    p < alpha and its median grew by more than `threshold`: significance
+    alone flags 1% drifts on quiet machines, size alone flags noise.
+    """
+
+    def process(
+        self,
+        baseline: BenchRun,
+        current: BenchRun,
+        threshold: float = 0.10,
+        alpha: float = 0.01,
+    ) -> BenchComparison:
+        before = {r.name: r for r in baseline.results}
+        deltas = []
+        for result in current.results:
+            old = before.get(result.name)
+            if old is None:
+                continue
+            change = result.median_ms / old.median_ms - 1
+            slower = mann_whitney_p(old.samples_ms, result.samples_ms)
+            faster = mann_whitney_p(result.samples_ms, old.samples_ms)
+            deltas.append(
+                BenchDelta(
+                    name=result.name,
+                    baseline_ms=old.median_ms,
+                    current_ms=result.median_ms,
+                    change=change,
+                    p_value=slower,
+                    regression=slower < alpha and change > threshold,
+                    improvement=faster < alpha and change < -threshold,
+                )
+            )
+        current_names = {r.name for r in current.results}
+        return BenchComparison(
+            deltas=deltas,
+            missing=[r.name for r in baseline.results if r.name not in current_names],
+            environment_differs=(baseline.python, baseline.machine, baseline.cpus)
+            != (current.python, current.machine, current.cpus)
+            or baseline.sink != current.sink,
+        )
+
+
+# --- SECTION C: WORKFLOW ---
+class BenchSink:
+    """
+    Where benchmarked builds write. The null sink sends single-file output
+    to os.devnull, so serialization is timed but not the disk; outputs that
+    are read back get a scratch directory in memory. The file sink writes
+    to a temporary directory on disk.
+    """
+
+    def __init__(self, kind: str = "null"):
+        if kind not in ("null", "file"):
+            raise ValueError(f"Unknown sink {kind!r}: use 'null' or 'file'")
+        self.kind = kind
+        scratch = _TMPFS if kind == "null" and os.path.isdir(_TMPFS) else None
+        self.directory = tempfile.mkdtemp(prefix="bench-", dir=scratch)
+
+    def path(self, name: str, read_back: bool = False) -> str:
+        if self.kind == "null" and not read_back:
+            return os.devnull
+        return os.path.join(self.directory, name)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# name -> prepare(sink), which does the untimed setup and returns the call
+# to time
+Cases = Dict[str, Callable[[BenchSink], Callable[[], Any]]]
+
+
+def measure(
+    name: str, run: Callable[[], Any], repeat: int = 15, min_sample_s: float = 0.02
+) -> BenchResult:
+    """
+    Times `run()` like timeit: one untimed call warms caches and a second
+    sizes the batches, so a sample lasts at least `min_sample_s`; the
+    collector is off while timing.
+    """
+    run()
+    t0 = time.perf_counter()
+    run()
+    warm = time.perf_counter() - t0
+    number = max(1, math.ceil(min_sample_s / max(warm, 1e-9)))
+    samples = []
+    enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            t0 = time.perf_counter()
+            for _ in range(number):
+                run()
+            samples.append((time.perf_counter() - t0) / number * 1000)
+            if enabled:
+                gc.enable()
+    finally:
+        if enabled:
+            gc.enable()
+    return BenchResult(name=name, number=number, samples_ms=samples)
+
+
+def run_suite(
+    suite: str,
+    cases: Cases,
+    names: Optional[List[str]] = None,
+    repeat: int = 15,
+    sink: str = "null",
+    log: Callable[[str], None] = print,
+) -> BenchRun:
+    unknown = sorted(set(names or []) - set(cases))
+    if unknown:
+        raise ValueError(f"Unknown cases: {', '.join(unknown)}")
+    bench_sink = BenchSink(sink)
+    results = []
+    try:
+        for name, prepare in cases.items():
+            if names and name not in names:
+                continue
+            result = measure(name, prepare(bench_sink), repeat)
+            log(format_result(result))
+            results.append(result)
+    finally:
+        bench_sink.close()
+    return BenchRun(
+        suite=suite,
+        sink=sink,
+        python=platform.python_version(),
+        machine=f"{platform.system()} {platform.machine()}",
+        cpus=os.cpu_count() or 1,
+        results=results,
+    )
+
+
+def load_run(path: str) -> BenchRun:
+    with open(path) as f:
+        return BenchRun.model_validate_json(f.read())
+
+
+def save_run(run: BenchRun, path: str):
+    with open(path, "w") as f:
+        f.write(run.model_dump_json(indent=1) + "\n")
+
+
+def format_result(result: BenchResult) -> str:
+    spread = max(result.samples_ms) - result.min_ms
+    return (
+        f"{result.name:<28}{result.median_ms:>10.3f} ms"
+        f"  (min {result.min_ms:.3f}, spread {spread:.3f}, "
+        f"{len(result.samples_ms)}x{result.number})"
+    )
+
+
+def format_comparison(comparison: BenchComparison) -> str:
+    lines = [f"{'case':<28}{'baseline':>10}{'current':>10}{'change':>9}{'p':>9}"]
+    for d in comparison.deltas:
+        flag = ""
+        if d.regression:
+            flag = "  REGRESSION"
+        elif d.improvement:
+            flag = "  faster"
+        lines.append(
+            f"{d.name:<28}{d.baseline_ms:>10.3f}{d.current_ms:>10.3f}"
+            f"{d.change * 100:>+8.1f}%{d.p_value:>9.4f}{flag}"
+        )
+    if comparison.missing:
+        lines.append(f"Not run: {', '.join(comparison.missing)}")
+    if comparison.environment_differs:
+        lines.append(
+            "Baseline was recorded on another Python, machine or sink: "
+            "differences may not come from the code"
+        )
+    return "\n".join(lines)
+
+
+def bench_main(
+    suite: str,
+    cases: Cases,
+    baseline_path: str,
+    argv=None,
+    description: str = "",
+):
+    """Command line shared by the journal and planner suites."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "cases", nargs="*", help=f"Cases to run (default: all of {', '.join(cases)})."
+    )
+    parser.add_argument("--repeat", type=int, default=15, help="Samples per case.")
+    parser.add_argument(
+        "--sink",
+        choices=["null", "file"],
+        default="null",
+        help="null: outputs go to os.devnull or memory, so I/O is not timed "
+        "(default); file: a temporary directory on disk.",
+    )
+    parser.add_argument(
+        "--save",
+        nargs="?",
+        const=baseline_path,
+        metavar="JSON",
+        help=f"Write the results as a baseline (default {baseline_path}).",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=baseline_path,
+        metavar="JSON",
+        help="Compare against a baseline and exit 1 on a significant regression.",
+    )
+    parser.add_argument(
+        "--current",
+        metavar="JSON",
+        help="With --compare: compare these saved results instead of running.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Median growth that counts as a regression (default 0.10).",
+    )
+    parser.add_argument(
+        "--alpha", type=float, default=0.01, help="Significance level (default 0.01)."
+    )
+    args = parser.parse_args(argv)
+
+    if args.current:
+        if not args.compare:
+            parser.error("--current needs --compare")
+        run = load_run(args.current)
+    else:
+        run = run_suite(suite, cases, args.cases, args.repeat, args.sink)
+    if args.save:
+        save_run(run, args.save)
+        print(f"Baseline written to {args.save}")
+    if args.compare:
+        comparison = BenchComparator().process(
+            load_run(args.compare), run, args.threshold, args.alpha
+        )
+        print(format_comparison(comparison))
+        if not comparison.ok:
+            regressed = [d.name for d in comparison.deltas if d.regression]
+            print(f"Significant regressions: {', '.join(regressed)}")
+            sys.exit(1)
+        print("No significant regressions")
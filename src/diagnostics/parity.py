@@ -0,0 +1,144 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from src.diagnostics.pdf_inspect import PageSummary, PdfSummary
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class BuildStats(BaseModel):
+    name: str
+    wall_s: float  # fastest run
+    rss_start_mb: float  # after imports, before the build
+    rss_peak_mb: float  # ru_maxrss of the build process
+    size_bytes: int
+    pages: int
+
+
+class PageDiff(BaseModel):
+    index: int
+    kind: str  # "links" | "ops"
+    reference: str
+    candidate: str
+
+
+class ParityInput(BaseModel):
+    reference: PdfSummary
+    candidate: PdfSummary
+    op_tolerance: float = 0.0  # allowed relative difference in total ops per page
+
+
+class ParityReport(BaseModel):
+    reference_pages: int
+    candidate_pages: int
+    reference_ops: int
+    candidate_ops: int
+    link_diffs: List[PageDiff]
+    op_diffs: List[PageDiff]
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.reference_pages == self.candidate_pages
+            and not self.link_diffs
+            and not self.op_diffs
+        )
+
+
+# --- SECTION B: PURE LOGIC ---
+class ParityLogic:
+    """
+    Page-by-page structural comparison of two builds of the same document.
+    Links are compared as multisets of targets (annotation order is free);
+    operators by total count, with the differing operators listed.
+    """
+
+    def process(self, data: ParityInput) -> ParityReport:
+        link_diffs = []
+        op_diffs = []
+        for ref, cand in zip(data.reference.pages, data.candidate.pages):
+            if sorted(ref.link_targets) != sorted(cand.link_targets):
+                link_diffs.append(
+                    PageDiff(
+                        index=ref.index,
+                        kind="links",
+                        reference=self._links(ref, cand),
+                        candidate=self._links(cand, ref),
+                    )
+                )
+            diff = self._op_diff(ref, cand, data.op_tolerance)
+            if diff is not None:
+                op_diffs.append(diff)
+        return ParityReport(
+            reference_pages=len(data.reference.pages),
+            candidate_pages=len(data.candidate.pages),
+            reference_ops=sum(p.total_ops for p in data.reference.pages),
+            candidate_ops=sum(p.total_ops for p in data.candidate.pages),
+            link_diffs=link_diffs,
+            op_diffs=op_diffs,
+        )
+
+    @staticmethod
+    def _links(page: PageSummary, other: PageSummary) -> str:
+        # Only the targets the other side lacks, to keep the report readable
+        remaining = list(other.link_targets)
+        extra = []
+        for target in page.link_targets:
+            if target in remaining:
+                remaining.remove(target)
+            else:
+                extra.append(target)
+        return ", ".join(extra) or "-"
+
+    @staticmethod
+    def _op_diff(
+        ref: PageSummary, cand: PageSummary, tolerance: float
+    ) -> Optional[PageDiff]:
+        ref_total, cand_total = ref.total_ops, cand.total_ops
+        if abs(cand_total - ref_total) <= tolerance * max(ref_total, 1):
+            return None
+        ops = sorted(set(ref.op_counts) | set(cand.op_counts))
+        changed = [
+            op for op in ops if ref.op_counts.get(op, 0) != cand.op_counts.get(op, 0)
+        ]
+        return PageDiff(
+            index=ref.index,
+            kind="ops",
+            reference=f"{ref_total} ("
+            + " ".join(f"{op}:{ref.op_counts.get(op, 0)}" for op in changed)
+            + ")",
+            candidate=f"{cand_total} ("
+            + " ".join(f"{op}:{cand.op_counts.get(op, 0)}" for op in changed)
+            + ")",
+        )
+
+
+def format_parity(
+    reference: BuildStats,
+    candidate: BuildStats,
+    report: ParityReport,
+    max_diffs: int = 10,
+) -> str:
+    mb = 1024 * 1024
+    lines = [
+        f"{'':<14}{reference.name:>14}{candidate.name:>14}{'ratio':>8}",
+        f"{'wall s':<14}{reference.wall_s:>14.2f}{candidate.wall_s:>14.2f}"
+        f"{candidate.wall_s / reference.wall_s:>8.2f}",
+        f"{'RSS start MB':<14}{reference.rss_start_mb:>14.1f}"
+        f"{candidate.rss_start_mb:>14.1f}",
+        f"{'RSS peak MB':<14}{reference.rss_peak_mb:>14.1f}"
+        f"{candidate.rss_peak_mb:>14.1f}"
+        f"{candidate.rss_peak_mb / reference.rss_peak_mb:>8.2f}",
+        f"{'size MB':<14}{reference.size_bytes / mb:>14.2f}"
+        f"{candidate.size_bytes / mb:>14.2f}"
+        f"{candidate.size_bytes / reference.size_bytes:>8.2f}",
+        f"{'pages':<14}{reference.pages:>14}{candidate.pages:>14}",
+        f"{'operators':<14}{report.reference_ops:>14}{report.candidate_ops:>14}"
+        f"{report.candidate_ops / max(report.reference_ops, 1):>8.2f}",
+        f"parity: {len(report.link_diffs)} pages with different link targets, "
+        f"{len(report.op_diffs)} pages with different op counts",
+    ]
+    for diff in report.link_diffs[:max_diffs] + report.op_diffs[:max_diffs]:
+        lines.append(
+            f"  p{diff.index:<4} {diff.kind:<6} {reference.name}: {diff.reference}"
+            f" | {candidate.name}: {diff.candidate}"
+        )
+    return "\n".join(lines)
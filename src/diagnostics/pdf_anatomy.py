@@ -0,0 +1,404 @@
+import argparse
+import re
+from collections import Counter
+from pydantic import BaseModel
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from src.diagnostics.pdf_inspect import _NAMES, _OPERATORS, _STRINGS, _KEYWORDS
+
+_OBJECT_KINDS = (
+    "page content",
+    "page dict",
+    "annotations",
+    "resources",
+    "shared xobject",
+    "image",
+    "font file",
+    "font",
+    "structure",
+    "xref + trailer",
+    "header",
+    "unaccounted",
+)
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class ObjectStat(BaseModel):
+    kind: str  # one of _OBJECT_KINDS
+    count: int
+    bytes: int
+
+
+class OpStat(BaseModel):
+    op: str
+    count: int
+    bytes: int  # operator plus its operands, uncompressed
+
+
+class PageAnatomy(BaseModel):
+    index: int  # 0-based
+    kind: str
+    bytes: int  # page dict + own content streams, as stored
+    content_bytes: int  # content streams as stored (compressed)
+    content_raw_bytes: int  # content streams decoded
+    annotation_bytes: int
+    annotations: int
+    ops: List[OpStat]  # own content streams; shared XObjects count once overall
+
+
+class KindAnatomy(BaseModel):
+    kind: str
+    pages: int
+    bytes: int
+    content_raw_bytes: int
+
+
+class PdfAnatomy(BaseModel):
+    path: str
+    size_bytes: int
+    objects: List[ObjectStat]
+    pages: List[PageAnatomy]
+    kinds: List[KindAnatomy]
+    ops: List[OpStat]  # whole file: pages and shared XObjects
+
+
+# --- SECTION B: PURE LOGIC ---
+class OperatorSizer:
+    """
+    Count and uncompressed bytes per content-stream operator. Each operator
+    is charged for itself and the operands written before it, so the totals
+    add up to the stream length (minus whitespace between operations).
+    """
+
+    def process(self, stream: bytes) -> Dict[str, List[int]]:
+        # Blank strings and names in place so offsets stay valid
+        blank = _STRINGS.sub(lambda m: b" " * len(m.group()), stream)
+        blank = _NAMES.sub(lambda m: b" " * len(m.group()), blank)
+        sizes: Dict[str, List[int]] = {}
+        start = 0
+        for match in _OPERATORS.finditer(blank):
+            op = match.group().decode("latin-1")
+            if op in _KEYWORDS:
+                continue
+            entry = sizes.setdefault(op, [0, 0])
+            entry[0] += 1
+            entry[1] += len(stream[start : match.end()].strip())
+            start = match.end()
+        return sizes
+
+
+def merge_op_sizes(target: Dict[str, List[int]], sizes: Dict[str, List[int]]):
+    for op, (count, size) in sizes.items():
+        entry = target.setdefault(op, [0, 0])
+        entry[0] += count
+        entry[1] += size
+
+
+def op_stats(sizes: Dict[str, List[int]]) -> List[OpStat]:
+    return sorted(
+        (OpStat(op=op, count=c, bytes=b) for op, (c, b) in sizes.items()),
+        key=lambda s: -s.bytes,
+    )
+
+
+def annots_span(raw: bytes) -> Tuple[int, int]:
+    """Bytes and entries of an inline `/Annots [...]` array in a page object."""
+    start = raw.find(b"/Annots")
+    if start < 0:
+        return 0, 0
+    open_at = raw.find(b"[", start)
+    if open_at < 0 or raw[start + 7 : open_at].strip():
+        return 0, 0  # indirect array: counted as its own object
+    depth = 0
+    for i in range(open_at, len(raw)):
+        c = raw[i]
+        if c == 0x5B:  # [
+            depth += 1
+        elif c == 0x5D:  # ]
+            depth -= 1
+            if depth == 0:
+                body = raw[open_at : i + 1]
+                return i + 1 - start, body.count(b"/Annot")
+    return 0, 0
+
+
+# --- SECTION C: WORKFLOW ---
+class PdfAnatomyAnalyzer:
+    """
+    Where the bytes of a finished PDF go: every live object is measured from
+    its offset in the file and classified by what refers to it (page
+    contents, shared form XObjects, fonts, annotations...). Bytes no live
+    object or xref section covers are "unaccounted", e.g. the superseded
+    objects of an incremental update.
+    """
+
+    def __init__(self):
+        self.sizer = OperatorSizer()
+
+    def process(
+        self, path: str, page_kinds: Optional[List[str]] = None
+    ) -> PdfAnatomy:
+        with open(path, "rb") as f:
+            data = f.read()
+        reader = PdfReader(path)
+        offsets = {
+            idnum: offset
+            for generation in reader.xref.values()
+            for idnum, offset in generation.items()
+        }
+        sizes = {
+            idnum: self._object_size(reader, data, idnum, offset)
+            for idnum, offset in offsets.items()
+        }
+
+        kinds: Dict[int, str] = {}
+        owner: Dict[int, int] = {}  # content stream -> page index
+        fonts: Set[int] = set()
+        forms: Set[int] = set()
+        pages = []
+        all_ops: Dict[str, List[int]] = {}
+        if page_kinds is not None and len(page_kinds) != len(reader.pages):
+            page_kinds = None  # plan doesn't match this file: don't mislabel
+        for i, page in enumerate(reader.pages):
+            page_id = page.indirect_reference.idnum
+            kinds[page_id] = "page dict"
+            content_ids = self._refs(page.raw_get("/Contents"))
+            content_bytes = 0
+            raw_bytes = 0
+            page_ops: Dict[str, List[int]] = {}
+            for ref in content_ids:
+                if ref.idnum in owner:
+                    continue  # stream shared between pages (e.g. a merge prefix)
+                kinds[ref.idnum] = "page content"
+                owner[ref.idnum] = i
+                stream = ref.get_object().get_data()
+                content_bytes += sizes.get(ref.idnum, 0)
+                raw_bytes += len(stream)
+                merge_op_sizes(page_ops, self.sizer.process(stream))
+            merge_op_sizes(all_ops, page_ops)
+            self._classify_resources(
+                page.raw_get("/Resources"), kinds, fonts, forms
+            )
+
+            annot_bytes, annot_count = annots_span(
+                self._raw(data, offsets.get(page_id), sizes.get(page_id, 0))
+            )
+            for ref in self._refs(page.raw_get("/Annots")):
+                kinds[ref.idnum] = "annotations"
+                annot_bytes += sizes.get(ref.idnum, 0)
+            annot_count = annot_count or len(page.get("/Annots", []) or [])
+            pages.append(
+                PageAnatomy(
+                    index=i,
+                    kind=page_kinds[i] if page_kinds else "page",
+                    bytes=sizes.get(page_id, 0) + content_bytes,
+                    content_bytes=content_bytes,
+                    content_raw_bytes=raw_bytes,
+                    annotation_bytes=annot_bytes,
+                    annotations=annot_count,
+                    ops=op_stats(page_ops),
+                )
+            )
+
+        for idnum in forms:
+            merge_op_sizes(
+                all_ops,
+                self.sizer.process(reader.get_object(idnum).get_data()),
+            )
+
+        objects = Counter()
+        counts = Counter()
+        for idnum, size in sizes.items():
+            kind = kinds.get(idnum, "structure")
+            objects[kind] += size
+            counts[kind] += 1
+        xref = self._xref_bytes(data)
+        objects["xref + trailer"] += xref
+        counts["xref + trailer"] += len(re.findall(rb"(?m)^xref\b", data))
+        objects["header"] += min(offsets.values(), default=0)
+        counts["header"] += 1
+        objects["unaccounted"] += len(data) - sum(objects.values())
+
+        return PdfAnatomy(
+            path=path,
+            size_bytes=len(data),
+            objects=[
+                ObjectStat(kind=kind, count=counts[kind], bytes=objects[kind])
+                for kind in _OBJECT_KINDS
+                if objects[kind]
+            ],
+            pages=pages,
+            kinds=self._kinds(pages),
+            ops=op_stats(all_ops),
+        )
+
+    @staticmethod
+    def _object_size(
+        reader: PdfReader, data: bytes, idnum: int, offset: int
+    ) -> int:
+        # Search for `endobj` past the stream data so binary streams can't fool it
+        obj = reader.get_object(idnum)
+        skip = len(obj._data) if isinstance(obj, StreamObject) else 0
+        body = data.find(b"stream", offset) + 6 if skip else offset
+        end = data.find(b"endobj", body + skip)
+        return (end + 6 - offset) if end >= 0 else 0
+
+    @staticmethod
+    def _raw(data: bytes, offset: Optional[int], size: int) -> bytes:
+        return b"" if offset is None else data[offset : offset + size]
+
+    @staticmethod
+    def _refs(value) -> List[IndirectObject]:
+        if isinstance(value, IndirectObject):
+            target = value.get_object()
+            if isinstance(target, ArrayObject):
+                return [value] + [v for v in target if isinstance(v, IndirectObject)]
+            return [value]
+        if isinstance(value, ArrayObject):
+            return [v for v in value if isinstance(v, IndirectObject)]
+        return []
+
+    def _classify_resources(
+        self, resources, kinds: Dict[int, str], fonts: Set[int], forms: Set[int]
+    ):
+        if resources is None:
+            return
+        if isinstance(resources, IndirectObject):
+            kinds.setdefault(resources.idnum, "resources")
+        resources = resources.get_object()
+        for ref in self._dict(resources, "/Font").values():
+            if isinstance(ref, IndirectObject) and ref.idnum not in fonts:
+                fonts.add(ref.idnum)
+                self._classify_font(ref, kinds)
+        for ref in self._dict(resources, "/XObject").values():
+            if not isinstance(ref, IndirectObject) or ref.idnum in kinds:
+                continue
+            xobject = ref.get_object()
+            if xobject.get("/Subtype") == "/Image":
+                kinds[ref.idnum] = "image"
+                continue
+            kinds[ref.idnum] = "shared xobject"
+            forms.add(ref.idnum)
+            self._classify_resources(
+                xobject.raw_get("/Resources") if "/Resources" in xobject else None,
+                kinds,
+                fonts,
+                forms,
+            )
+
+    @staticmethod
+    def _dict(resources: DictionaryObject, key: str) -> DictionaryObject:
+        value = resources.get(key)
+        return value.get_object() if value is not None else DictionaryObject()
+
+    def _classify_font(self, ref: IndirectObject, kinds: Dict[int, str]):
+        # Everything reachable from a font dict is font data; the embedded
+        # (subset) programs are split out as "font file"
+        stack = [(ref, None)]
+        while stack:
+            value, key = stack.pop()
+            if isinstance(value, IndirectObject):
+                if value.idnum in kinds:
+                    continue
+                is_program = key is not None and key.startswith("/FontFile")
+                kinds[value.idnum] = "font file" if is_program else "font"
+                value = value.get_object()
+            if isinstance(value, DictionaryObject):
+                stack.extend((v, k) for k, v in value.items() if k != "/Parent")
+            elif isinstance(value, ArrayObject):
+                stack.extend((v, key) for v in value)
+
+    @staticmethod
+    def _xref_bytes(data: bytes) -> int:
+        total = 0
+        for match in re.finditer(rb"(?m)^xref\b", data):
+            end = data.find(b"%%EOF", match.start())
+            total += (end + 5 if end >= 0 else len(data)) - match.start()
+        return total
+
+    @staticmethod
+    def _kinds(pages: List[PageAnatomy]) -> List[KindAnatomy]:
+        kinds: Dict[str, KindAnatomy] = {}
+        for page in pages:
+            kind = kinds.setdefault(
+                page.kind,
+                KindAnatomy(kind=page.kind, pages=0, bytes=0, content_raw_bytes=0),
+            )
+            kind.pages += 1
+            kind.bytes += page.bytes
+            kind.content_raw_bytes += page.content_raw_bytes
+        return sorted(kinds.values(), key=lambda k: -k.bytes)
+
+
+def format_anatomy(anatomy: PdfAnatomy, top_n: int = 10) -> str:
+    kb = 1024
+    size = anatomy.size_bytes
+    lines = [f"{anatomy.path}: {size / kb:.1f} KB, {len(anatomy.pages)} pages", ""]
+    lines.append(f"{'object type':<18}{'count':>8}{'KB':>10}{'share':>8}")
+    for stat in sorted(anatomy.objects, key=lambda s: -s.bytes):
+        lines.append(
+            f"{stat.kind:<18}{stat.count:>8}{stat.bytes / kb:>10.1f}"
+            f"{stat.bytes / size:>8.1%}"
+        )
+
+    lines += [
+        "",
+        f"{'page kind':<30}{'pages':>7}{'KB':>10}{'KB/page':>9}{'raw KB':>10}",
+    ]
+    for kind in anatomy.kinds:
+        lines.append(
+            f"{kind.kind:<30}{kind.pages:>7}{kind.bytes / kb:>10.1f}"
+            f"{kind.bytes / kb / kind.pages:>9.2f}"
+            f"{kind.content_raw_bytes / kb:>10.1f}"
+        )
+
+    lines += ["", f"top {top_n} pages by stored bytes:"]
+    biggest = sorted(anatomy.pages, key=lambda p: -p.bytes)[:top_n]
+    for page in biggest:
+        top_ops = ", ".join(f"{s.op} {s.bytes / kb:.1f}K" for s in page.ops[:3])
+        lines.append(
+            f"  p{page.index + 1:<5}{page.kind:<30}{page.bytes / kb:>7.1f} KB "
+            f"(raw {page.content_raw_bytes / kb:.1f} KB, "
+            f"{page.annotations} links {page.annotation_bytes / kb:.1f} KB) {top_ops}"
+        )
+
+    lines += ["", f"top {top_n} operators by uncompressed bytes (pages + shared):"]
+    raw_total = sum(s.bytes for s in anatomy.ops) or 1
+    for stat in anatomy.ops[:top_n]:
+        lines.append(
+            f"  {stat.op:<6}{stat.count:>9}x {stat.bytes / kb:>9.1f} KB"
+            f"{stat.bytes / raw_total:>8.1%}"
+        )
+    return "\n".join(lines)
+
+
+def main(
+    argv=None,
+    default_path: Optional[str] = None,
+    page_kinds: Optional[Callable[[argparse.Namespace], List[str]]] = None,
+    add_arguments: Optional[Callable[[argparse.ArgumentParser], None]] = None,
+):
+    parser = argparse.ArgumentParser(
+        description="Break a generated PDF down by object type, page, page kind "
+        "and operator."
+    )
+    parser.add_argument(
+        "path", nargs="?" if default_path else None, default=default_path
+    )
+    parser.add_argument("--top", type=int, default=10, help="Pages/operators listed.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report.")
+    if add_arguments is not None:
+        add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    kinds = page_kinds(args) if page_kinds is not None else None
+    anatomy = PdfAnatomyAnalyzer().process(args.path, kinds)
+    print(format_anatomy(anatomy, args.top))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(anatomy.model_dump_json(indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import re
+from collections import Counter
+from pydantic import BaseModel
+from pypdf import PdfReader
+from typing import Dict, List
+
+# Strings and names can spell operator-like words: strip them before counting
+_STRINGS = re.compile(rb"\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]*>")
+_NAMES = re.compile(rb"/[^\s/\[\]()<>{}%]*")
+_OPERATORS = re.compile(rb"[A-Za-z'\"][^\s\[\]<>()/{}%]*")
+_KEYWORDS = {"true", "false", "null"}
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class PageSummary(BaseModel):
+    index: int  # 0-based
+    link_targets: List[str]  # "page:12" or "uri:https://...", annotation order
+    op_counts: Dict[str, int]  # operator -> count, form XObjects expanded
+
+    @property
+    def total_ops(self) -> int:
+        return sum(self.op_counts.values())
+
+
+class PdfSummary(BaseModel):
+    path: str
+    size_bytes: int
+    pages: List[PageSummary]
+
+
+# --- SECTION B: PURE LOGIC ---
+class OperatorCounter:
+    """Counts content-stream operators without building an operand tree."""
+
+    def process(self, stream: bytes) -> Counter:
+        stripped = _NAMES.sub(b" ", _STRINGS.sub(b" ", stream))
+        counts = Counter(
+            token.decode("latin-1") for token in _OPERATORS.findall(stripped)
+        )
+        for keyword in _KEYWORDS:
+            counts.pop(keyword, None)
+        return counts
+
+
+# --- SECTION C: WORKFLOW ---
+class PdfInspector:
+    """
+    Reads a finished PDF back into per-page link targets and operator counts.
+    `Do` calls on form XObjects are replaced by the form's own operators, so a
+    page drawn through shared blocks counts the same as one drawn inline.
+    """
+
+    def __init__(self):
+        self.counter = OperatorCounter()
+
+    def process(self, path: str) -> PdfSummary:
+        reader = PdfReader(path)
+        page_numbers = {
+            page.indirect_reference.idnum: i for i, page in enumerate(reader.pages)
+        }
+        forms: Dict[int, Counter] = {}
+        pages = []
+        for i, page in enumerate(reader.pages):
+            contents = page.get_contents()
+            data = contents.get_data() if contents is not None else b""
+            pages.append(
+                PageSummary(
+                    index=i,
+                    link_targets=self._link_targets(page, page_numbers),
+                    op_counts=dict(self._expanded(data, page, forms)),
+                )
+            )
+        return PdfSummary(path=path, size_bytes=os.path.getsize(path), pages=pages)
+
+    def _expanded(self, data: bytes, owner, forms: Dict[int, Counter]) -> Counter:
+        counts = self.counter.process(data)
+        xobjects = owner.get("/Resources", {}).get("/XObject", {})
+        if not counts.get("Do") or not xobjects:
+            return counts
+        for name in re.findall(rb"/([^\s/\[\]()<>{}%]+)\s+Do\b", data):
+            ref = xobjects.get("/" + name.decode("latin-1"))
+            if ref is None:
+                continue
+            xobject = ref.get_object()
+            if xobject.get("/Subtype") != "/Form":
+                continue
+            key = ref.idnum if hasattr(ref, "idnum") else id(xobject)
+            if key not in forms:
+                forms[key] = self._expanded(xobject.get_data(), xobject, forms)
+            counts.update(forms[key])
+            counts["Do"] -= 1
+        if counts["Do"] <= 0:
+            del counts["Do"]
+        return counts
+
+    @staticmethod
+    def _link_targets(page, page_numbers: Dict[int, int]) -> List[str]:
+        targets = []
+        for ref in page.get("/Annots", []) or []:
+            annot = ref.get_object()
+            if annot.get("/Subtype") != "/Link":
+                continue
+            dest = annot.get("/Dest")
+            action = annot.get("/A")
+            if dest is None and action is not None:
+                action = action.get_object()
+                if "/URI" in action:
+                    targets.append(f"uri:{action['/URI']}")
+                    continue
+                dest = action.get("/D")
+            if dest is None:
+                targets.append("none")
+                continue
+            target = dest.get_object()[0]
+            idnum = getattr(target, "idnum", None)
+            if idnum in page_numbers:
+                targets.append(f"page:{page_numbers[idnum]}")
+            else:
+                targets.append(f"page:{int(target)}")
+        return targets
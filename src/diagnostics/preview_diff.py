@@ -0,0 +1,138 @@
+import os
+from pydantic import BaseModel
+from typing import List, Optional, Tuple
+from src.infrastructure.raster_preview import decode_png, encode_png
+
+# Unchanged pixels fade toward white in diff images, changed ones are red
+_FADE = bytes(255 - (255 - v) // 4 for v in range(256))
+_CHANGED = bytes((220, 0, 0))
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class PageDiff(BaseModel):
+    name: str  # preview file name
+    changed_pixels: int
+    share: float  # of the page's pixels
+    # Changed area in preview pixels: (x0, y0, x1, y1), end exclusive
+    bounds: Optional[Tuple[int, int, int, int]] = None
+    size_changed: bool = False
+
+
+class PreviewDiffReport(BaseModel):
+    changed: List[PageDiff]
+    added: List[str]  # only in the new previews
+    removed: List[str]  # only in the old previews
+    unchanged: int
+
+    @property
+    def ok(self) -> bool:
+        return not (self.changed or self.added or self.removed)
+
+
+# --- SECTION B: PURE LOGIC ---
+class PixelDiffLogic:
+    """
+    Pixel-exact comparison of two RGB images of the same size. Rows are
+    compared as bytes first, so only changed rows are walked pixel by pixel.
+    Returns the page diff and a diff image: the new page faded, changes red.
+    """
+
+    def process(
+        self, name: str, width: int, height: int, before: bytes, after: bytes
+    ) -> Tuple[PageDiff, Optional[bytearray]]:
+        stride = width * 3
+        changed = 0
+        x0, y0, x1, y1 = width, height, 0, 0
+        image = None
+        for row in range(height):
+            start = row * stride
+            old = before[start : start + stride]
+            new = after[start : start + stride]
+            if old == new:
+                continue
+            if image is None:
+                image = bytearray(after.translate(_FADE))
+            for i in range(0, stride, 3):
+                if old[i : i + 3] != new[i : i + 3]:
+                    changed += 1
+                    image[start + i : start + i + 3] = _CHANGED
+                    x0, x1 = min(x0, i // 3), max(x1, i // 3 + 1)
+            y0, y1 = min(y0, row), row + 1
+        return (
+            PageDiff(
+                name=name,
+                changed_pixels=changed,
+                share=changed / (width * height),
+                bounds=(x0, y0, x1, y1) if changed else None,
+            ),
+            image,
+        )
+
+
+# --- SECTION C: WORKFLOW ---
+def diff_previews(
+    before_dir: str, after_dir: str, diff_dir: Optional[str] = None
+) -> PreviewDiffReport:
+    """
+    Compares the PNGs of two preview directories by file name; with
+    `diff_dir`, writes a diff image for every changed page.
+    """
+    before = {n for n in os.listdir(before_dir) if n.endswith(".png")}
+    after = {n for n in os.listdir(after_dir) if n.endswith(".png")}
+    logic = PixelDiffLogic()
+    changed = []
+    unchanged = 0
+    for name in sorted(before & after):
+        with open(os.path.join(before_dir, name), "rb") as f:
+            old = f.read()
+        with open(os.path.join(after_dir, name), "rb") as f:
+            new = f.read()
+        if old == new:
+            unchanged += 1
+            continue
+        w0, h0, old_pixels = decode_png(old)
+        w1, h1, new_pixels = decode_png(new)
+        if (w0, h0) != (w1, h1):
+            changed.append(
+                PageDiff(
+                    name=name, changed_pixels=w1 * h1, share=1.0, size_changed=True
+                )
+            )
+            continue
+        page, image = logic.process(name, w1, h1, old_pixels, new_pixels)
+        if not page.changed_pixels:
+            unchanged += 1  # same pixels, different compression
+            continue
+        changed.append(page)
+        if diff_dir is not None:
+            os.makedirs(diff_dir, exist_ok=True)
+            with open(os.path.join(diff_dir, name), "wb") as f:
+                f.write(encode_png(w1, h1, image))
+    return PreviewDiffReport(
+        changed=changed,
+        added=sorted(after - before),
+        removed=sorted(before - after),
+        unchanged=unchanged,
+    )
+
+
+def format_preview_diff(report: PreviewDiffReport, limit: int = 40) -> str:
+    lines = [
+        f"{len(report.changed)} changed, {len(report.added)} added, "
+        f"{len(report.removed)} removed, {report.unchanged} unchanged"
+    ]
+    for page in report.changed[:limit]:
+        if page.size_changed:
+            lines.append(f"  {page.name}: image size changed")
+            continue
+        lines.append(
+            f"  {page.name}: {page.changed_pixels} px ({page.share * 100:.2f}%) "
+            f"in {page.bounds}"
+        )
+    if len(report.changed) > limit:
+        lines.append(f"  ... {len(report.changed) - limit} more")
+    for name in report.added:
+        lines.append(f"  + {name}")
+    for name in report.removed:
+        lines.append(f"  - {name}")
+    return "\n".join(lines)
@@ -0,0 +1,168 @@
+import importlib
+import math
+import multiprocessing
+import os
+import statistics
+import time
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from src.diagnostics.memory_profiler import _RssSampler, _current_rss_mb
+from src.diagnostics.pdf_inspect import PdfInspector
+
+METRICS = ("seconds", "peak_mb", "size_kb", "ops")
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class ScalingSample(BaseModel):
+    case: str  # e.g. "years=5"
+    scale: float  # what the metrics are fitted against: pages, grid cells
+    pages: int
+    seconds: float  # build wall time, output included
+    peak_mb: float  # peak RSS growth over the process after imports
+    runs: int = 1  # builds behind seconds and peak_mb (their medians)
+    size_kb: float
+    ops: int  # content operators, form XObjects expanded
+
+
+class ScalingFit(BaseModel):
+    metric: str
+    exponent: float  # least-squares slope of log(metric) over log(scale)
+    tail_exponent: float  # the same between the two largest samples
+    per_unit: float  # metric / scale at the largest sample
+    super_linear: bool
+
+
+class ScalingReport(BaseModel):
+    group: str
+    scale_name: str
+    samples: List[ScalingSample]
+    fits: List[ScalingFit]
+
+    @property
+    def ok(self) -> bool:
+        return not any(f.super_linear for f in self.fits)
+
+
+# --- SECTION B: PURE LOGIC ---
+def _slope(xs: List[float], ys: List[float]) -> float:
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+
+class ScalingFitter:
+    """
+    Fits every metric as `metric ~ scale ** k` on a log-log scale. Fixed
+    costs (interpreter, fonts) pull k below 1 on small builds, so the
+    exponent between the two largest samples is checked as well: a quadratic
+    path shows up there first. A metric is super-linear when either
+    exponent exceeds 1 + tolerance.
+    """
+
+    def process(
+        self,
+        group: str,
+        scale_name: str,
+        samples: List[ScalingSample],
+        tolerance: float = 0.15,
+    ) -> ScalingReport:
+        samples = sorted(samples, key=lambda s: s.scale)
+        if len(samples) < 2 or samples[0].scale == samples[-1].scale:
+            raise ValueError(f"{group}: need samples at two or more scales")
+        log_scales = [math.log(s.scale) for s in samples]
+        fits = []
+        for metric in METRICS:
+            values = [float(getattr(s, metric)) for s in samples]
+            largest = samples[-1]
+            if min(values) <= 0:
+                # e.g. a build that did not grow RSS measurably
+                exponent = tail = 0.0
+            else:
+                logs = [math.log(v) for v in values]
+                exponent = _slope(log_scales, logs)
+                tail = (logs[-1] - logs[-2]) / (log_scales[-1] - log_scales[-2])
+            fits.append(
+                ScalingFit(
+                    metric=metric,
+                    exponent=exponent,
+                    tail_exponent=tail,
+                    per_unit=values[-1] / largest.scale,
+                    super_linear=max(exponent, tail) > 1 + tolerance,
+                )
+            )
+        return ScalingReport(
+            group=group, scale_name=scale_name, samples=samples, fits=fits
+        )
+
+
+# --- SECTION C: WORKFLOW ---
+def _timed_case(target: str, output_path: str, params: dict) -> dict:
+    """Runs in a fresh process so imports, caches and RSS are not shared."""
+    module_name, func_name = target.split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+    rss_start = _current_rss_mb()
+    # Sampled: ru_maxrss would carry over the parent's high-water mark
+    with _RssSampler(0.01) as rss:
+        t0 = time.perf_counter()
+        pages = func(output_path, **params)
+        wall = time.perf_counter() - t0
+    return {"pages": pages, "seconds": wall, "peak_mb": rss.peak_mb - rss_start}
+
+
+def measure_case(
+    target: str,
+    case: str,
+    output_path: str,
+    params: Dict,
+    scale: Optional[float] = None,
+    repeats: int = 1,
+) -> ScalingSample:
+    """
+    Builds one case in a spawned process: `target` is "module:function",
+    called as `function(output_path, **params)` and returning the page count.
+    `scale` defaults to that page count. With `repeats`, every build gets a
+    fresh process and time and peak memory are the medians, so one slow
+    run on a busy machine does not bend the fit.
+    """
+    if repeats < 1:
+        raise ValueError(f"repeats must be at least 1, got {repeats}")
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        runs = [
+            pool.apply(_timed_case, (target, output_path, params))
+            for _ in range(repeats)
+        ]
+    summary = PdfInspector().process(output_path)
+    pages = runs[-1]["pages"]
+    return ScalingSample(
+        case=case,
+        scale=pages if scale is None else scale,
+        pages=pages,
+        seconds=statistics.median(r["seconds"] for r in runs),
+        peak_mb=statistics.median(r["peak_mb"] for r in runs),
+        runs=repeats,
+        size_kb=os.path.getsize(output_path) / 1024,
+        ops=sum(p.total_ops for p in summary.pages),
+    )
+
+
+def format_scaling(report: ScalingReport) -> str:
+    lines = [
+        f"{report.group} (fitted against {report.scale_name})",
+        f"{'case':<16}{'scale':>10}{'pages':>7}{'s':>8}{'peak MB':>9}"
+        f"{'KB':>10}{'ops':>11}",
+    ]
+    for s in report.samples:
+        lines.append(
+            f"{s.case:<16}{s.scale:>10.0f}{s.pages:>7}{s.seconds:>8.2f}"
+            f"{s.peak_mb:>9.1f}{s.size_kb:>10.0f}{s.ops:>11}"
+        )
+    lines.append(f"{'metric':<16}{'k':>10}{'tail k':>8}{'per unit':>12}")
+    for f in report.fits:
+        flag = "  SUPER-LINEAR" if f.super_linear else ""
+        lines.append(
+            f"{f.metric:<16}{f.exponent:>10.2f}{f.tail_exponent:>8.2f}"
+            f"{f.per_unit:>12.4g}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,201 @@
+import functools
+import json
+import os
+import threading
+import time
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# name, start ns, end ns, thread id, attributes
+SpanRecord = Tuple[str, int, int, int, Dict[str, Any]]
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class SpanStats(BaseModel):
+    name: str
+    count: int
+    total_ms: float  # wall time inside the span, children included
+    self_ms: float  # minus the time spent in child spans
+
+
+# --- SECTION B: PURE LOGIC ---
+class ChromeTraceExporter:
+    """
+    Spans as Chrome trace-event JSON ("X" complete events, microseconds),
+    loadable in chrome://tracing or Perfetto. Nesting is implied by the
+    timestamps, so parents and children line up as one flame per thread.
+    """
+
+    def process(self, spans: List[SpanRecord], pid: int, origin_ns: int) -> dict:
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": "build"},
+            }
+        ]
+        for name, start, end, tid, attrs in spans:
+            events.append(
+                {
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (start - origin_ns) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": attrs,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+class SpanAggregator:
+    """Per-name count, total and self time; children are found per thread."""
+
+    def process(self, spans: List[SpanRecord]) -> List[SpanStats]:
+        # name -> [count, total ns, self ns]
+        stats: Dict[str, List[int]] = {}
+        # A parent sorts before its children: earlier start, or same start and
+        # later end
+        ordered = sorted(spans, key=lambda s: (s[3], s[1], -s[2]))
+        stack: List[Tuple[int, int, str]] = []  # (tid, end ns, name)
+        for name, start, end, tid, _ in ordered:
+            while stack and (stack[-1][0] != tid or stack[-1][1] <= start):
+                stack.pop()
+            if stack:
+                stats[stack[-1][2]][2] -= end - start
+            entry = stats.setdefault(name, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += end - start
+            entry[2] += end - start
+            stack.append((tid, end, name))
+        return sorted(
+            (
+                SpanStats(
+                    name=name, count=count, total_ms=total / 1e6, self_ms=own / 1e6
+                )
+                for name, (count, total, own) in stats.items()
+            ),
+            key=lambda s: -s.total_ms,
+        )
+
+
+# --- SECTION C: WORKFLOW ---
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, key: str, value: Any):
+        self.attrs[key] = value
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.spans.append(
+            (
+                self.name,
+                self.start,
+                time.perf_counter_ns(),
+                threading.get_ident(),
+                self.attrs,
+            )
+        )
+        return False
+
+
+class _NullSpan:
+    """What `span()` returns while no tracer runs: one shared, inert object."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_active: Optional["Tracer"] = None
+
+
+def span(name: str, **attrs):
+    """
+    `with span("daily", page=12): ...` records a span while a tracer is
+    started; otherwise it costs a global lookup and returns a no-op.
+    """
+    if _active is None:
+        return _NULL_SPAN
+    return _Span(_active, name, attrs)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of `span` for a whole function or method."""
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _Span(_active, name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class Tracer:
+    """
+    Collects nested spans from `span()` / `@traced` between `start()` and
+    `stop()`. Usage: `tracer.start()`, build, `tracer.stop()`, then
+    `tracer.write(path)` for the timeline and `tracer.summary()` for totals.
+    """
+
+    def __init__(self):
+        self.spans: List[SpanRecord] = []
+        self.origin_ns = 0
+
+    def start(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("A tracer is already running")
+        self.origin_ns = time.perf_counter_ns()
+        _active = self
+
+    def stop(self):
+        global _active
+        if _active is self:
+            _active = None
+
+    def chrome_trace(self) -> dict:
+        return ChromeTraceExporter().process(self.spans, os.getpid(), self.origin_ns)
+
+    def write(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self) -> List[SpanStats]:
+        return SpanAggregator().process(self.spans)
+
+
+def format_trace_summary(stats: List[SpanStats], top_n: int = 15) -> str:
+    lines = [f"{'span':<28}{'count':>7}{'total ms':>11}{'self ms':>10}"]
+    for s in stats[:top_n]:
+        lines.append(
+            f"{s.name:<28}{s.count:>7}{s.total_ms:>11.1f}{s.self_ms:>10.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,299 @@
+import re
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple, Union
+
+# A form XObject use costs "/I12 Do" on the page, its object a fixed overhead
+_USE_BYTES = 10
+_FORM_BYTES = 160
+
+
+# A top-level piece of a content stream: a q..Q block, a BT..ET text object,
+# a path up to its painting operator, or a single operator, as
+# (start, end, key, neutral). start/end are its byte span in the page stream
+# and key its tokens joined by single spaces (whitespace-normalized). Neutral
+# units leave the graphics state as they found it, so they can be moved into
+# a form XObject, which inherits the state at `Do`. Plain tuples: a year has
+# tens of thousands of them.
+ContentUnit = Tuple[int, int, bytes, bool]
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class DedupPlan(BaseModel):
+    forms: List[bytes]  # content of each new form XObject
+    # Per page: None when unchanged, else the new stream as bytes and form
+    # positions (ints) to be drawn with `Do`
+    pages: List[Optional[List[Union[bytes, int]]]]
+    uses: int
+
+
+class ContentDedupReport(BaseModel):
+    pages: int
+    pages_rewritten: int
+    forms: int
+    uses: int
+    bytes_before: int  # raw page streams
+    bytes_after: int  # raw page streams plus the new forms
+
+    @property
+    def saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+# --- SECTION B: PURE LOGIC ---
+_OPERAND = (
+    rb"\((?:\\.|[^\\)])*\)"  # literal string (parens inside are escaped)
+    rb"|<[0-9A-Fa-f\s]*>"  # hex string
+    rb"|[\[\]]"
+    rb"|/[^\s/\[\]()<>{}%]*"  # name
+    rb"|[+-]?[0-9.]+"  # number
+    rb"|\s+|%[^\r\n]*"  # whitespace, comment
+)
+# One operation per match: its operands, then the operator
+_OPERATION = re.compile(
+    rb"(?P<operands>(?:" + _OPERAND + rb")*)(?P<op>[A-Za-z'\"*][A-Za-z*]*)", re.S
+)
+_PATH_REST = re.compile(rb"(?:\s+(?:[-+0-9.]+\s+)*(?:re|m|l|c|v|y|h)(?![A-Za-z*]))*")
+_TOKEN = re.compile(_OPERAND + rb"|true|false|null", re.S)
+_PATH = {b"m", b"l", b"c", b"v", b"y", b"re", b"h"}
+_PAINT = {b"S", b"s", b"f", b"F", b"f*", b"B", b"B*", b"b", b"b*", b"n"}
+_CLIP = {b"W", b"W*"}
+# Text-state and graphics-state operators: a text object using any of them
+# changes what follows it
+_STATEFUL_IN_TEXT = {
+    b"Tc", b"Tw", b"Tz", b"TL", b"Tf", b"Tr", b"Ts",
+    b"w", b"J", b"j", b"M", b"d", b"ri", b"i", b"gs", b"cm",
+    b"CS", b"cs", b"SC", b"SCN", b"sc", b"scn", b"G", b"g", b"RG", b"rg",
+    b"K", b"k",
+}  # fmt: skip
+# Inline images and marked content are left alone
+_UNSUPPORTED = {b"BI", b"ID", b"EI", b"BMC", b"BDC", b"EMC", b"BX", b"EX"}
+
+
+# Lines joined before a page falls back to a single parse of the rest
+_MAX_JOIN = 16
+
+Operation = Tuple[bytes, int, int, bytes]
+
+
+def _parse_operations(content: bytes) -> Optional[List[Operation]]:
+    """(operator, start, end, normalized key) per operation; None if unparsable."""
+    ops = []
+    pos = 0
+    start = None  # of the pending operation's first operand
+    while True:
+        m = _OPERATION.search(content, pos)
+        if m is None:
+            break
+        if content[pos : m.start()].strip():
+            return None  # bytes the grammar does not cover
+        pos = m.end()
+        if start is None:
+            start = m.start()
+        op = m.group("op")
+        if op in (b"true", b"false", b"null"):
+            continue  # an operand after all
+        if op in _UNSUPPORTED:
+            return None
+        operands = content[start : m.start("op")]
+        if b"(" in operands or b"<" in operands or b"%" in operands:
+            # Strings may hold whitespace bytes: normalize token by token
+            tokens = [
+                t
+                for t in _TOKEN.findall(operands)
+                if not t.isspace() and not t.startswith(b"%")
+            ]
+        else:
+            tokens = operands.split()
+        start += len(operands) - len(operands.lstrip())
+        ops.append((op, start, pos, b" ".join(tokens + [op])))
+        start = None
+        if op in _PATH:
+            # The rest of the path in one match: grids are thousands of `re`
+            rest = _PATH_REST.match(content, pos)
+            if rest.end() > pos:
+                body = content[pos : rest.end()]
+                ops.append((op, pos, rest.end(), b" ".join(body.split())))
+                pos = rest.end()
+    if content[pos:].strip():
+        return None
+    return ops
+
+
+def _operations(
+    content: bytes, cache: Dict[bytes, Optional[List[Operation]]]
+) -> Optional[List[Operation]]:
+    """
+    `_parse_operations` line by line, each distinct line parsed once: pages of
+    one kind repeat most of their lines. A line that does not parse on its own
+    (a string holding a newline byte, operands before a line break) is joined
+    with the next ones until it does.
+    """
+    lines = content.split(b"\n")
+    ops: List[Operation] = []
+    base = 0
+    i = 0
+    while i < len(lines):
+        piece = lines[i]
+        j = i + 1
+        parsed = cache[piece] if piece in cache else _parse_operations(piece)
+        cache[piece] = parsed
+        while parsed is None and j < len(lines) and j - i < _MAX_JOIN:
+            piece += b"\n" + lines[j]
+            j += 1
+            parsed = cache[piece] if piece in cache else _parse_operations(piece)
+            cache[piece] = parsed
+        if parsed is None:
+            rest = _parse_operations(content[base:])
+            if rest is None:
+                return None
+            parsed, j = rest, len(lines)
+        ops += [(op, start + base, end + base, key) for op, start, end, key in parsed]
+        base += len(piece) + 1
+        i = j
+    return ops
+
+
+def content_units(
+    content: bytes, cache: Optional[Dict[bytes, Optional[List[Operation]]]] = None
+) -> Optional[List[ContentUnit]]:
+    ops = _operations(content, {} if cache is None else cache)
+    if ops is None:
+        return None
+    names = [o[0] for o in ops]
+    n = len(names)
+    units = []
+    i = 0
+    while i < n:
+        op = names[i]
+        j = i
+        neutral = False
+        if op in (b"q", b"BT"):
+            close = b"Q" if op == b"q" else b"ET"
+            depth = 0
+            while j < n:
+                name = names[j]
+                if name == op:
+                    depth += 1
+                elif name == close:
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j += 1
+            if j == n:
+                return None  # unbalanced
+            neutral = op == b"q" or not _STATEFUL_IN_TEXT.intersection(
+                names[i + 1 : j]
+            )
+        elif op in _PATH:
+            while j < n and names[j] not in _PAINT:
+                j += 1
+            if j == n:
+                return None  # path never painted
+            neutral = not _CLIP.intersection(names[i : j + 1])
+        elif op == b"Do":
+            neutral = True
+        units.append(
+            (
+                ops[i][1],
+                ops[j][2],
+                b"\n".join([o[3] for o in ops[i : j + 1]]),
+                neutral,
+            )
+        )
+        i = j + 1
+    return units
+
+
+class RepeatedContentFinder:
+    """
+    Finds runs of neutral units that repeat across page streams and plans
+    moving each into one form XObject. Adjacent units are joined into one
+    run when they always occur together; a run is hoisted when the bytes it
+    saves outweigh a `Do` per use and the form's own object.
+    """
+
+    def process(self, pages: List[bytes]) -> DedupPlan:
+        # Identical streams (a month's blank pages) are parsed once, and so
+        # is each distinct line
+        cache: Dict[bytes, Optional[List[ContentUnit]]] = {}
+        lines: Dict[bytes, Optional[List[Operation]]] = {}
+        parsed = []
+        for content in pages:
+            if content not in cache:
+                cache[content] = content_units(content, lines)
+            parsed.append(cache[content])
+
+        counts: Dict[bytes, int] = {}
+        pairs: Dict[Tuple[bytes, bytes], int] = {}
+        for units in parsed:
+            previous = None
+            for _, _, key, neutral in units or ():
+                if not neutral:
+                    previous = None
+                    continue
+                counts[key] = counts.get(key, 0) + 1
+                if previous is not None:
+                    pairs[(previous, key)] = pairs.get((previous, key), 0) + 1
+                previous = key
+
+        # Runs of units that repeat and always appear together
+        page_runs: List[List[List[ContentUnit]]] = []
+        run_uses: Dict[Tuple[bytes, ...], int] = {}
+        for units in parsed:
+            runs: List[List[ContentUnit]] = []
+            previous = None
+            for unit in units or ():
+                key = unit[2]
+                if not unit[3] or counts[key] < 2:
+                    previous = None
+                    continue
+                if (
+                    previous is not None
+                    and pairs.get((previous, key), 0)
+                    == counts[previous]
+                    == counts[key]
+                ):
+                    runs[-1].append(unit)
+                else:
+                    runs.append([unit])
+                previous = key
+            for run in runs:
+                key = tuple(u[2] for u in run)
+                run_uses[key] = run_uses.get(key, 0) + 1
+            page_runs.append(runs)
+
+        forms: List[bytes] = []
+        form_of: Dict[Tuple[bytes, ...], int] = {}
+        plan_pages: List[Optional[List[Union[bytes, int]]]] = []
+        uses = 0
+        for content, runs in zip(pages, page_runs):
+            pieces: List[Union[bytes, int]] = []
+            pos = 0
+            for run in runs:
+                key = tuple(u[2] for u in run)
+                start, end = run[0][0], run[-1][1]
+                body = content[start:end]
+                n = run_uses[key]
+                if (n - 1) * len(body) - n * _USE_BYTES - _FORM_BYTES <= 0:
+                    continue
+                if key not in form_of:
+                    form_of[key] = len(forms)
+                    forms.append(body)
+                pieces += [content[pos:start], form_of[key]]
+                pos = end
+                uses += 1
+            if pieces:
+                pieces.append(content[pos:])
+                plan_pages.append(pieces)
+            else:
+                plan_pages.append(None)
+        return DedupPlan(forms=forms, pages=plan_pages, uses=uses)
+
+
+def format_dedup(report: ContentDedupReport) -> str:
+    return (
+        f"Repeated content: {report.forms} shared forms, {report.uses} uses on "
+        f"{report.pages_rewritten}/{report.pages} pages; page streams "
+        f"{report.bytes_before / 1024:.0f} KB -> {report.bytes_after / 1024:.0f} KB "
+        f"raw ({report.saved / 1024:.0f} KB saved)"
+    )
@@ -0,0 +1,250 @@
+import gc
+import json
+import math
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class ForkReply(BaseModel):
+    ok: bool
+    result: Dict[str, Any] = {}
+    error: str = ""
+
+
+class LatencyStats(BaseModel):
+    requests: int
+    failed: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+# --- SECTION B: PURE LOGIC ---
+class LatencyPercentiles:
+    """Nearest-rank percentiles of request latencies given in seconds."""
+
+    def process(self, seconds: List[float], failed: int = 0) -> LatencyStats:
+        ordered = sorted(seconds)
+
+        def rank(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[max(math.ceil(p / 100 * len(ordered)), 1) - 1] * 1000
+
+        return LatencyStats(
+            requests=len(ordered),
+            failed=failed,
+            p50_ms=rank(50),
+            p90_ms=rank(90),
+            p99_ms=rank(99),
+            max_ms=rank(100),
+        )
+
+
+def format_latency(stats: LatencyStats) -> str:
+    return (
+        f"{stats.requests} requests ({stats.failed} failed): "
+        f"p50 {stats.p50_ms:.0f} ms, p90 {stats.p90_ms:.0f} ms, "
+        f"p99 {stats.p99_ms:.0f} ms, max {stats.max_ms:.0f} ms"
+    )
+
+
+# --- SECTION C: WORKFLOW ---
+def _send(conn: socket.socket, reply: ForkReply):
+    conn.sendall(reply.model_dump_json().encode() + b"\n")
+
+
+def _receive(conn: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+class ForkServer:
+    """
+    Serves JSON requests on a Unix socket by forking the warm parent once per
+    request: the child starts with everything the parent imported and
+    prepared (copy-on-write), runs `handle(request)`, replies and exits.
+    Requests are one JSON object per connection, newline-terminated;
+    {"command": "stats"} and {"command": "stop"} are answered by the parent.
+
+    Latency runs from accepting the connection to reaping the child, which
+    has replied by then; a SIGCHLD wakeup makes reaping immediate.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        handle: Callable[[Dict[str, Any]], Dict[str, Any]],
+        max_children: Optional[int] = None,
+        report_every: int = 10,
+        log: Callable[[str], None] = print,
+    ):
+        self.socket_path = socket_path
+        self.handle = handle
+        self.max_children = max_children or os.cpu_count() or 1
+        self.report_every = report_every
+        self.log = log
+        self.latencies: List[float] = []
+        self.failed = 0
+        self._running: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._stopping = False
+
+    def stats(self) -> LatencyStats:
+        return LatencyPercentiles().process(self.latencies, self.failed)
+
+    def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)  # left behind by a killed server
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen(64)
+        wake_r, wake_w = socket.socketpair()
+        wake_r.setblocking(False)
+        wake_w.setblocking(False)
+        previous_fd = signal.set_wakeup_fd(wake_w.fileno())
+        previous_handler = signal.signal(signal.SIGCHLD, lambda *_: None)
+        # Objects from the warm-up never move again: the collector would
+        # otherwise touch, and so copy, their pages in every child
+        gc.freeze()
+        sockets = (listener, wake_r, wake_w)
+        self.log(f"Serving on {self.socket_path} (Ctrl-C to stop)")
+        try:
+            while not self._stopping or self._running:
+                readable = [wake_r]
+                if not self._stopping and len(self._running) < self.max_children:
+                    readable.append(listener)
+                ready, _, _ = select.select(readable, [], [])
+                if wake_r in ready:
+                    try:
+                        while wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    self._reap()
+                if listener in ready:
+                    self._accept(listener, sockets)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGCHLD, previous_handler)
+            signal.set_wakeup_fd(previous_fd)
+            for sock in sockets:
+                sock.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            gc.unfreeze()
+        self.log(format_latency(self.stats()))
+
+    def _accept(self, listener: socket.socket, sockets: Tuple[socket.socket, ...]):
+        conn, _ = listener.accept()
+        t0 = time.perf_counter()
+        conn.settimeout(5.0)
+        try:
+            request = json.loads(_receive(conn))
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except (OSError, ValueError) as e:
+            self._answer(conn, ForkReply(ok=False, error=f"Bad request: {e}"))
+            return
+
+        command = request.get("command", "build")
+        if command == "stats":
+            self._answer(conn, ForkReply(ok=True, result=self.stats().model_dump()))
+            return
+        if command == "stop":
+            self._stopping = True
+            self._answer(conn, ForkReply(ok=True))
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            self._child(conn, request, sockets)
+        conn.close()
+        self._running[pid] = (t0, request)
+
+    @staticmethod
+    def _answer(conn: socket.socket, reply: ForkReply):
+        try:
+            _send(conn, reply)
+        except OSError:
+            pass  # client went away
+        conn.close()
+
+    def _child(
+        self,
+        conn: socket.socket,
+        request: Dict[str, Any],
+        sockets: Tuple[socket.socket, ...],
+    ):
+        status = 1
+        try:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            for sock in sockets:
+                sock.close()
+            try:
+                reply = ForkReply(ok=True, result=self.handle(request))
+            except Exception as e:
+                reply = ForkReply(ok=False, error=f"{type(e).__name__}: {e}")
+            conn.settimeout(None)
+            _send(conn, reply)
+            status = 0 if reply.ok else 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # Never return into the parent's loop or run its cleanup
+            os._exit(status)
+
+    def _reap(self):
+        while self._running:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid not in self._running:
+                continue
+            t0, request = self._running.pop(pid)
+            seconds = time.perf_counter() - t0
+            ok = os.waitstatus_to_exitcode(status) == 0
+            self.latencies.append(seconds)
+            if not ok:
+                self.failed += 1
+            target = request.get("output", "")
+            self.log(
+                f"#{len(self.latencies)} {'ok' if ok else 'failed'} "
+                f"{seconds * 1000:.0f} ms {target}".rstrip()
+            )
+            if self.report_every and len(self.latencies) % self.report_every == 0:
+                self.log(format_latency(self.stats()))
+
+
+def fork_request(
+    socket_path: str, request: Dict[str, Any], timeout: float = 120.0
+) -> ForkReply:
+    """Sends one request to a `ForkServer` and waits for its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(request).encode() + b"\n")
+        data = _receive(conn)
+    if not data:
+        raise ValueError(f"No reply from {socket_path}")
+    return ForkReply.model_validate_json(data)
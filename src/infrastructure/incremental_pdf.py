@@ -0,0 +1,564 @@
+import difflib
+import hashlib
+import io
+import os
+import re
+from pydantic import BaseModel
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+LinkKey = Tuple[Tuple[float, ...], Optional[int], str]  # rect, target page, rest
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class PageFingerprint(BaseModel):
+    """
+    What a page shows, independent of the file it sits in: text decoded
+    through the font's ToUnicode map (subset glyph ids differ between
+    builds), fonts by base name, form XObjects by content hash. Link
+    targets are page indices within the same file.
+    """
+
+    content: str  # sha1 of the normalized content stream
+    links: List[LinkKey] = []
+
+
+class PageAlignment(BaseModel):
+    kept: List[Tuple[int, int]]  # (new index, old index), 0-based, unchanged
+    replaced: List[Tuple[int, int]]  # new page written over the old page's object
+    added: List[int]  # new pages that get new objects
+    dropped: List[int]  # old pages left out of the page tree
+
+
+class PagePlan(BaseModel):
+    """
+    What a build put on each page, recorded next to the PDF so that a later
+    update can tell which pages to draw before drawing any: a signature per
+    page (of the input that draws it), the page each link id leads to, and
+    a digest of everything else that shapes the drawing (settings, drawing
+    code, fonts). `file` is the sha1 of the PDF the plan describes.
+    """
+
+    file: str = ""
+    environment: str
+    pages: List[str]
+    links: List[int]  # 1-based target page per link id, in id order
+
+
+class UpdateReport(BaseModel):
+    path: str
+    original_bytes: int
+    appended_bytes: int
+    pages: int  # in the updated document
+    kept: int
+    replaced: int
+    added: int
+    dropped: int
+    objects: int  # objects written to the update section
+
+
+# --- SECTION B: PURE LOGIC ---
+class PageAligner:
+    """
+    Matches the pages of a new build to those of the file on disk, in order
+    (difflib over content fingerprints). A matched page is kept only when its
+    links still point at the matching pages; otherwise it is replaced in
+    place. Unmatched runs are paired up position by position as
+    replacements, the rest added or dropped.
+    """
+
+    def process(
+        self, old: List[PageFingerprint], new: List[PageFingerprint]
+    ) -> PageAlignment:
+        matcher = difflib.SequenceMatcher(
+            None, [p.content for p in old], [p.content for p in new], autojunk=False
+        )
+        pairs: List[Tuple[int, int]] = []
+        replaced: Set[int] = set()
+        added: List[int] = []
+        dropped: List[int] = []
+        for tag, i0, i1, j0, j1 in matcher.get_opcodes():
+            if tag == "equal":
+                pairs += zip(range(j0, j1), range(i0, i1))
+                continue
+            n = min(i1 - i0, j1 - j0)
+            pairs += zip(range(j0, j0 + n), range(i0, i0 + n))
+            replaced.update(range(j0, j0 + n))
+            added += range(j0 + n, j1)
+            dropped += range(i0 + n, i1)
+
+        old_of = dict(pairs)
+        for j, i in pairs:
+            if j in replaced:
+                continue
+            moved = [
+                (rect, old_of.get(target) if target is not None else None, rest)
+                for rect, target, rest in new[j].links
+            ]
+            if moved != old[i].links:
+                replaced.add(j)
+
+        return PageAlignment(
+            kept=[(j, i) for j, i in pairs if j not in replaced],
+            replaced=[(j, i) for j, i in pairs if j in replaced],
+            added=added,
+            dropped=dropped,
+        )
+
+
+class PlanAligner:
+    """
+    Aligns two page plans the way PageAligner aligns fingerprints, before
+    either document is drawn: pages with the same signature are kept, the
+    others replaced, added or dropped. Returns None when signatures cannot
+    tell, so the caller compares rendered pages instead: the environment
+    changed, or a link id now leads to another page (a kept page would still
+    point at the old one).
+    """
+
+    def process(self, old: PagePlan, new: PagePlan) -> Optional[PageAlignment]:
+        if old.environment != new.environment:
+            return None
+        if new.links[: len(old.links)] != old.links:
+            return None
+        matcher = difflib.SequenceMatcher(None, old.pages, new.pages, autojunk=False)
+        alignment = PageAlignment(kept=[], replaced=[], added=[], dropped=[])
+        for tag, i0, i1, j0, j1 in matcher.get_opcodes():
+            if tag == "equal":
+                alignment.kept += zip(range(j0, j1), range(i0, i1))
+                continue
+            n = min(i1 - i0, j1 - j0)
+            alignment.replaced += zip(range(j0, j0 + n), range(i0, i0 + n))
+            alignment.added += range(j0 + n, j1)
+            alignment.dropped += range(i0 + n, i1)
+        return alignment
+
+
+def xref_section(offsets: Dict[int, int]) -> bytes:
+    """
+    Classic xref table, one subsection per run of consecutive numbers. It
+    opens with the free-list head (object 0), as readers that guess at
+    misnumbered tables expect every section to start at 0.
+    """
+    lines = [b"xref\n0 1\n0000000000 65535 f \n"]
+    numbers = sorted(offsets)
+    start = 0
+    while start < len(numbers):
+        end = start + 1
+        while end < len(numbers) and numbers[end] == numbers[end - 1] + 1:
+            end += 1
+        lines.append(b"%d %d\n" % (numbers[start], end - start))
+        lines += [b"%010d 00000 n \n" % offsets[n] for n in numbers[start:end]]
+        start = end
+    return b"".join(lines)
+
+
+# --- SECTION C: WORKFLOW ---
+_TOKENS = re.compile(
+    rb"/(?P<font>[A-Za-z0-9]+)\s+(?P<size>[0-9.]+)\s+Tf"
+    rb"|(?P<string>\((?:\\.|[^\\)])*\))"
+    rb"|/(?P<xobject>[A-Za-z0-9]+)\s+Do",
+    re.S,
+)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_BFCHAR = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>")
+
+
+def _raw(dictionary: DictionaryObject, key: str):
+    return dictionary.raw_get(key) if key in dictionary else None
+
+
+def _unescape(literal: bytes) -> bytes:
+    out = bytearray()
+    i = 1
+    while i < len(literal) - 1:
+        c = literal[i : i + 1]
+        if c == b"\\":
+            nxt = literal[i + 1 : i + 2]
+            octal = re.match(rb"[0-7]{1,3}", literal[i + 1 : i + 4])
+            if octal:
+                out.append(int(octal.group(), 8) & 0xFF)
+                i += 1 + len(octal.group())
+                continue
+            out += _ESCAPES.get(nxt, nxt)
+            i += 2
+            continue
+        out += c
+        i += 1
+    return bytes(out)
+
+
+def _serialize(obj, ref: Callable[[int], int]) -> bytes:
+    """PDF syntax for `obj` with every reference renumbered through `ref`."""
+    if isinstance(obj, IndirectObject):
+        return b"%d 0 R" % ref(obj.idnum)
+    if isinstance(obj, DictionaryObject):
+        data = obj._data if isinstance(obj, StreamObject) else None
+        items = [
+            (key, value)
+            for key, value in obj.items()
+            if not (data is not None and key == "/Length")
+        ]
+        if data is not None:
+            items.append((NameObject("/Length"), NumberObject(len(data))))
+        body = b"".join(
+            _serialize(key, ref) + b" " + _serialize(value, ref)
+            for key, value in items
+        )
+        text = b"<<" + body + b">>"
+        if data is not None:
+            text += b"\nstream\n" + data + b"\nendstream"
+        return text
+    if isinstance(obj, ArrayObject):
+        return b"[" + b" ".join(_serialize(v, ref) for v in obj) + b"]"
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer)
+    return buffer.getvalue()
+
+
+class PdfRevision:
+    """The latest revision of a PDF, read lazily, with page fingerprints."""
+
+    def __init__(self, data: bytes):
+        self.reader = PdfReader(io.BytesIO(data))
+        self.page_ids = [p.indirect_reference.idnum for p in self.reader.pages]
+        self._index = {idnum: i for i, idnum in enumerate(self.page_ids)}
+        self._unicode: Dict[int, Dict[int, str]] = {}
+        self._forms: Dict[int, str] = {}
+
+    def fingerprints(self) -> List[PageFingerprint]:
+        return [self.fingerprint(page) for page in self.reader.pages]
+
+    def fingerprint(self, page) -> PageFingerprint:
+        resources = page.get("/Resources") or DictionaryObject()
+        fonts = resources.get("/Font") or DictionaryObject()
+        xobjects = resources.get("/XObject") or DictionaryObject()
+        contents = page.get_contents()
+        data = contents.get_data() if contents is not None else b""
+
+        parts = []
+        cmap: Dict[int, str] = {}
+        pos = 0
+        for m in _TOKENS.finditer(data):
+            parts.append(data[pos : m.start()])
+            pos = m.end()
+            if m.group("font"):
+                font = _raw(fonts, "/" + m.group("font").decode())
+                if font is None:
+                    parts.append(m.group())
+                    continue
+                cmap = self._font_unicode(font)
+                base = str(font.get_object().get("/BaseFont", ""))
+                name = base.split("+", 1)[-1]
+                parts.append(b"/%s %s Tf" % (name.encode(), m.group("size")))
+            elif m.group("string"):
+                raw = _unescape(m.group("string"))
+                if cmap:
+                    text = "".join(
+                        cmap.get(int.from_bytes(raw[k : k + 2], "big"), "?")
+                        for k in range(0, len(raw) - 1, 2)
+                    )
+                    parts.append(text.encode("utf-8", "surrogatepass"))
+                else:
+                    parts.append(raw)
+            else:
+                form = _raw(xobjects, "/" + m.group("xobject").decode())
+                parts.append(
+                    self._form_hash(form).encode() + b" Do"
+                    if form is not None
+                    else m.group()
+                )
+        parts.append(data[pos:])
+
+        links = []
+        for annot in page.get("/Annots") or []:
+            annot = annot.get_object()
+            rect = tuple(round(float(v), 2) for v in annot.get("/Rect", []))
+            target = None
+            rest = []
+            dest = annot.get("/Dest")
+            if isinstance(dest, ArrayObject) and dest:
+                if isinstance(dest[0], IndirectObject):
+                    target = self._index.get(dest[0].idnum)
+                rest = [str(v) for v in dest[1:]]
+            elif dest is not None:
+                rest = [str(dest)]  # named destination
+            action = annot.get("/A")
+            if action is not None:
+                rest.append(str(action.get_object().get("/URI", "")))
+            links.append((rect, target, " ".join(rest)))
+        return PageFingerprint(
+            content=hashlib.sha1(b"".join(parts)).hexdigest(), links=links
+        )
+
+    def _font_unicode(self, font) -> Dict[int, str]:
+        idnum = font.idnum if isinstance(font, IndirectObject) else id(font)
+        cmap = self._unicode.get(idnum)
+        if cmap is None:
+            cmap = {}
+            to_unicode = font.get_object().get("/ToUnicode")
+            if to_unicode is not None:
+                text = to_unicode.get_object().get_data()
+                for cid, uni in _BFCHAR.findall(text):
+                    cmap[int(cid, 16)] = bytes.fromhex(uni.decode()).decode(
+                        "utf-16-be", "replace"
+                    )
+            self._unicode[idnum] = cmap
+        return cmap
+
+    def _form_hash(self, form) -> str:
+        idnum = form.idnum if isinstance(form, IndirectObject) else id(form)
+        if idnum not in self._forms:
+            self._forms[idnum] = hashlib.sha1(
+                _serialize(form.get_object(), lambda n: 0)
+            ).hexdigest()[:12]
+        return self._forms[idnum]
+
+    def reachable(self, roots: List) -> Set[int]:
+        """Object numbers reachable from `roots` without passing through pages."""
+        seen: Set[int] = set()
+        stack = list(roots)
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, IndirectObject):
+                if obj.idnum in seen or obj.idnum in self._index:
+                    continue
+                seen.add(obj.idnum)
+                stack.append(obj.get_object())
+            elif isinstance(obj, DictionaryObject):
+                stack += [v for k, v in obj.items() if k != "/Parent"]
+            elif isinstance(obj, ArrayObject):
+                stack += list(obj)
+        return seen
+
+
+def plan_path(pdf_path: str) -> str:
+    return os.path.splitext(pdf_path)[0] + ".plan.json"
+
+
+def environment_digest(paths: Iterable[str], values: Dict[str, Any]) -> str:
+    """
+    sha1 over the bytes of `paths` (a directory stands for the .py files in
+    it) and the repr of `values`, in a stable order. Files count by base
+    name and content, so a moved checkout keeps its digest.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.endswith(".py")
+            )
+        else:
+            files.append(path)
+    digest = hashlib.sha1(repr(sorted(values.items())).encode())
+    for path in files:
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def read_plan(pdf_path: str, data: bytes) -> Optional[PagePlan]:
+    """The plan recorded for `pdf_path`, or None when there is none or it
+    describes other bytes than `data` (the file was rewritten since)."""
+    try:
+        with open(plan_path(pdf_path)) as f:
+            plan = PagePlan.model_validate_json(f.read())
+    except (OSError, ValueError):
+        return None
+    return plan if plan.file == hashlib.sha1(data).hexdigest() else None
+
+
+def write_plan(pdf_path: str, plan: PagePlan):
+    """Records `plan` next to `pdf_path`, bound to the file's current bytes."""
+    with open(pdf_path, "rb") as f:
+        file = hashlib.sha1(f.read()).hexdigest()
+    with open(plan_path(pdf_path), "w") as f:
+        f.write(plan.model_copy(update={"file": file}).model_dump_json())
+
+
+def _startxref(data: bytes) -> int:
+    pos = data.rfind(b"startxref", max(0, len(data) - 1024))
+    if pos < 0:
+        raise ValueError("No startxref: not a PDF, or truncated")
+    return int(data[pos + 9 :].split()[0])
+
+
+class IncrementalWriter:
+    """
+    Brings a PDF on disk up to date with a new build of the same document by
+    appending an incremental-update section: only replaced and new pages,
+    the objects they need that the file does not already hold (compared by
+    their bytes, so an unchanged grid form or font is reused), a new page
+    tree when pages were added or dropped, and a new xref and trailer
+    pointing back at the previous one. The original bytes are never
+    rewritten, so the appended size follows the changed pages.
+
+    Fonts are subset per build: a replaced page whose glyph set or order
+    differs brings its own copy of the subset fonts, written once per update.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def update(
+        self, new_data: bytes, alignment: Optional[PageAlignment] = None
+    ) -> UpdateReport:
+        """
+        Appends what `new_data` changes. With `alignment` (from PlanAligner)
+        pages are not compared: kept pages may be blank in `new_data`.
+        """
+        with open(self.path, "rb") as f:
+            old_data = f.read()
+        old = PdfRevision(old_data)
+        new = PdfRevision(new_data)
+        if alignment is None:
+            alignment = PageAligner().process(old.fingerprints(), new.fingerprints())
+        section, objects = self._section(old_data, old, new, alignment)
+        if section:
+            self._append(len(old_data), section)
+        return UpdateReport(
+            path=self.path,
+            original_bytes=len(old_data),
+            appended_bytes=len(section),
+            pages=len(new.page_ids),
+            kept=len(alignment.kept),
+            replaced=len(alignment.replaced),
+            added=len(alignment.added),
+            dropped=len(alignment.dropped),
+            objects=objects,
+        )
+
+    def _append(self, length: int, section: bytes):
+        # A failed write is cut off again, so the file stays a valid PDF
+        with open(self.path, "r+b") as f:
+            try:
+                f.seek(length)
+                f.write(section)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.truncate(length)
+                raise
+
+    def _section(
+        self,
+        old_data: bytes,
+        old: PdfRevision,
+        new: PdfRevision,
+        alignment: PageAlignment,
+    ) -> Tuple[bytes, int]:
+        if not (alignment.replaced or alignment.added or alignment.dropped):
+            return b"", 0
+
+        trailer = old.reader.trailer
+        next_id = int(trailer["/Size"])
+        root = trailer.raw_get("/Root")
+        catalog = root.get_object()
+        pages_ref = catalog.raw_get("/Pages")
+        new_pages_id = new.reader.trailer["/Root"].raw_get("/Pages").idnum
+
+        # Page objects: replaced pages keep their number, added pages get one
+        target: Dict[int, int] = {}
+        for j, i in alignment.kept + alignment.replaced:
+            target[new.page_ids[j]] = old.page_ids[i]
+        for j in alignment.added:
+            target[new.page_ids[j]] = next_id
+            next_id += 1
+
+        # Objects the file already holds, by their bytes
+        resources = [_raw(p, "/Resources") for p in old.reader.pages]
+        existing: Dict[bytes, int] = {}
+        for idnum in sorted(old.reachable(resources)):
+            existing.setdefault(
+                _serialize(old.reader.get_object(idnum), lambda n: n), idnum
+            )
+
+        body: Dict[int, bytes] = {}
+        copied: Dict[int, int] = {}
+        active: Set[int] = set()
+
+        def ref(idnum: int) -> int:
+            if idnum in target:
+                return target[idnum]
+            if idnum == new_pages_id:
+                return pages_ref.idnum
+            if idnum not in copied:
+                if idnum in active:
+                    raise ValueError(f"Reference cycle through object {idnum}")
+                active.add(idnum)
+                text = _serialize(new.reader.get_object(idnum), ref)
+                active.discard(idnum)
+                nonlocal next_id
+                if text in existing:
+                    copied[idnum] = existing[text]
+                else:
+                    copied[idnum] = next_id
+                    body[next_id] = text
+                    existing[text] = next_id
+                    next_id += 1
+            return copied[idnum]
+
+        for j in [j for j, _ in alignment.replaced] + alignment.added:
+            page = new.reader.pages[j]
+            page_obj = DictionaryObject(
+                {k: v for k, v in page.items() if k != "/Parent"}
+            )
+            text = _serialize(page_obj, ref)
+            body[target[new.page_ids[j]]] = (
+                text[:-2] + b"/Parent %d 0 R>>" % pages_ref.idnum
+            )
+
+        order = [target[idnum] for idnum in new.page_ids]
+        if order != old.page_ids:
+            old_tree = pages_ref.get_object()
+            tree = DictionaryObject(
+                {k: v for k, v in old_tree.items() if k not in ("/Kids", "/Count")}
+            )
+            body[pages_ref.idnum] = (
+                _serialize(tree, lambda n: n)[:-2]
+                + b"/Kids["
+                + b" ".join(b"%d 0 R" % n for n in order)
+                + b"]/Count %d>>" % len(order)
+            )
+            # The catalog opens on the first page: point it at the new one
+            opening = catalog.get("/OpenAction")
+            if (
+                isinstance(opening, ArrayObject)
+                and opening
+                and isinstance(opening[0], IndirectObject)
+                and opening[0].idnum != order[0]
+            ):
+                action = ArrayObject(opening)
+                action[0] = IndirectObject(order[0], 0, None)
+                updated = DictionaryObject(catalog.items())
+                updated[NameObject("/OpenAction")] = action
+                body[root.idnum] = _serialize(updated, lambda n: n)
+
+        out = bytearray(b"\n")
+        offsets = {}
+        base = len(old_data)
+        for idnum in sorted(body):
+            offsets[idnum] = base + len(out)
+            out += b"%d 0 obj\n" % idnum + body[idnum] + b"\nendobj\n"
+        xref_at = base + len(out)
+        out += xref_section(offsets)
+        trailer_obj = DictionaryObject(
+            {k: v for k, v in trailer.items() if k not in ("/Size", "/Prev")}
+        )
+        out += (
+            b"trailer\n"
+            + _serialize(trailer_obj, lambda n: n)[:-2]
+            + b"/Size %d/Prev %d>>\n" % (next_id, _startxref(old_data))
+            + b"startxref\n%d\n%%%%EOF\n" % xref_at
+        )
+        return bytes(out), len(body)
@@ -30,6 +30,16 @@ class PDFInterface(ABC):
     def line(self, x1, y1, x2, y2):
         pass
 
+    @abstractmethod
+    def fill_rects(self, rects):
+        """Fill many (x, y, w, h) rects as one path."""
+        pass
+
+    @abstractmethod
+    def stroke_segments(self, segments):
+        """Stroke many (x1, y1, x2, y2) segments as one path."""
+        pass
+
     @abstractmethod
     def circle(self, x, y, r, style=""):
         pass
@@ -42,6 +52,16 @@ class PDFInterface(ABC):
     def output(self, name):
         pass
 
+    @abstractmethod
+    def output_bytes(self) -> bytes:
+        """Serialize without closing the document (see `redraw_page`)."""
+        pass
+
+    @abstractmethod
+    def redraw_page(self, page_no: int):
+        """Clear page `page_no`; the next `add_page()` draws it again in place."""
+        pass
+
     @abstractmethod
     def add_link(self):
         pass
@@ -54,6 +74,14 @@ class PDFInterface(ABC):
     def link(self, x, y, w, h, link):
         pass
 
+    @abstractmethod
+    def link_areas(self, areas, links):
+        """
+        `link(*areas[i], links[i])` for many (x, y, w, h) areas; None links are
+        skipped. Repeating the same areas and links on other pages is cheap.
+        """
+        pass
+
     @abstractmethod
     def set_font(self, family, style="", size=0):
         pass
@@ -66,6 +94,50 @@ class PDFInterface(ABC):
     def cell(self, w, h=0, txt="", border=0, ln=0, align="", fill=False, link=""):
         pass
 
+    @abstractmethod
+    def text_cells(self, xs, ys, w, h, texts, links=None, align=""):
+        """
+        Bulk equivalent of `set_xy(xs[i], ys[i]); cell(w, h, texts[i], link=links[i])`
+        for many single-line cells sharing the current font, size and colour.
+        """
+        pass
+
+    @abstractmethod
+    def begin_shared(self):
+        """
+        Start recording drawing operations into a reusable block instead of the
+        current page. Blocks carry no links; add those per page.
+        """
+        pass
+
+    @abstractmethod
+    def end_shared(self):
+        """Stop recording and return a handle for `use_shared()`."""
+        pass
+
+    @abstractmethod
+    def use_shared(self, handle):
+        """Paint a recorded block on the current page."""
+        pass
+
+    @abstractmethod
+    def shared_block(self, key, draw):
+        """Record `draw()` as a shared block once per key; returns its handle."""
+        pass
+
+    @abstractmethod
+    def replay(self, key, draw):
+        """
+        Call `draw()` and remember the bytes it wrote. A later call with the same
+        key, starting from the same graphics state, appends them without drawing.
+        """
+        pass
+
+    @abstractmethod
+    def clear_replays(self):
+        """Forget recorded blocks once the values they were drawn from change."""
+        pass
+
     @abstractmethod
     def multi_cell(
         self, w, h, txt, border=0, align="J", fill=False, dry_run=False, output=""
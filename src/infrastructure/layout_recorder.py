@@ -0,0 +1,209 @@
+from typing import Dict, List, Tuple
+from src.diagnostics.layout_check import LayoutBox
+from src.infrastructure.interfaces import PDFInterface
+from src.infrastructure.pdf_adapter import FPDFAdapter
+
+
+class LayoutRecorder(PDFInterface):
+    """
+    A PDFInterface that draws nothing: it records the box of every element the
+    workers place, for `LayoutChecker`. Text is measured with the draft
+    adapter's fonts (core glyphs carrying the TTF advance widths, so widths and
+    wrapping match the embedded build) and is positioned exactly as
+    `FPDFAdapter.cell` positions it. Cell widths come from the adapter's glyph
+    run cache; `multi_cell` wraps each (font, size, width, text) once through
+    fpdf2's line breaking and reuses the lines afterwards.
+
+    Shared blocks are page backgrounds (the grid) and are not drawn; replayed
+    blocks (instruction text) are drawn every time so each page gets its boxes,
+    from the cached wrapping.
+    """
+
+    CAP_HEIGHT = 0.7  # em, see LayoutBox
+
+    def __init__(self, format=(1620, 2160)):
+        self.width, self.height = format
+        # Measurement only: one blank page for multi_cell's dry runs, never output
+        self.measure = FPDFAdapter(format=format, draft=True)
+        self.measure.add_page()
+        self.boxes: List[LayoutBox] = []
+        self.page = 0
+        self._links = 0
+        # (family, style, size, w, h, align, text) -> wrapped lines
+        self._wrapped: Dict[Tuple, List[str]] = {}
+
+    # --- Pages and state ---
+    def add_page(self):
+        self.page += 1
+        self.measure.set_xy(self.measure.pdf.l_margin, self.measure.pdf.t_margin)
+
+    def page_no(self):
+        return self.page
+
+    def redraw_page(self, page_no: int):
+        self.boxes = [b for b in self.boxes if b.page != page_no]
+        self.page = page_no - 1
+
+    def set_fill_color(self, r, g=None, b=None):
+        pass
+
+    def set_draw_color(self, r, g=None, b=None):
+        pass
+
+    def set_text_color(self, r, g=None, b=None):
+        pass
+
+    def set_line_width(self, width):
+        pass
+
+    def add_font(self, family, style="", fname=""):
+        self.measure.add_font(family, style, fname)
+
+    def set_font(self, family, style="", size=0):
+        self.measure.set_font(family, style, size)
+
+    def set_xy(self, x, y):
+        self.measure.set_xy(x, y)
+
+    def set_auto_page_break(self, auto, margin=0):
+        pass
+
+    def set_margin(self, margin):
+        self.measure.set_margin(margin)
+
+    # --- Shapes ---
+    def _box(self, kind, x, y, w, h, **extra):
+        self.boxes.append(
+            LayoutBox(page=self.page, kind=kind, x=x, y=y, w=w, h=h, **extra)
+        )
+
+    def rect(self, x, y, w, h, style=""):
+        self._box("shape", x, y, w, h)
+
+    def line(self, x1, y1, x2, y2):
+        self._box("line", min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1))
+
+    def circle(self, x, y, r, style=""):
+        self._box("shape", x - r, y - r, 2 * r, 2 * r)
+
+    def polygon(self, points, style=""):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self._box("shape", min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+    def fill_rects(self, rects):
+        pass
+
+    def stroke_segments(self, segments):
+        pass
+
+    # --- Text and links ---
+    def add_link(self):
+        self._links += 1
+        return self._links
+
+    def set_link(self, link, page=None, x=None, y=None):
+        pass
+
+    def link(self, x, y, w, h, link):
+        self._box("link", x, y, w, h)
+
+    def link_areas(self, areas, links):
+        for (x, y, w, h), link in zip(areas, links):
+            if link is not None:
+                self._box("link", x, y, w, h)
+
+    def _text(self, x, y, w, h, text, link, align, link_h=None):
+        pdf = self.measure.pdf
+        text_w = self.measure.text_width(text)
+        if align == "C":
+            dx = (w - text_w) / 2
+        elif align == "R":
+            dx = w - pdf.c_margin - text_w
+        else:
+            dx = pdf.c_margin
+        baseline = y + 0.5 * h + 0.3 * pdf.font_size
+        cap = self.CAP_HEIGHT * pdf.font_size
+        self._box(
+            "text", x + dx, baseline - cap, text_w, cap, text=text, cell_x=x, cell_w=w
+        )
+        if link:
+            link_h = pdf.font_size if link_h is None else link_h
+            self._box("link", x + dx, y + 0.5 * (h - link_h), text_w, link_h)
+
+    def cell(self, w, h=0, txt="", border=0, ln=0, align="", fill=False, link=""):
+        pdf = self.measure.pdf
+        x, y = pdf.x, pdf.y
+        if w == 0:
+            w = pdf.w - pdf.r_margin - x
+        if txt:
+            self._text(x, y, w, h, txt, link, align)
+        if ln == 0:
+            pdf.x = x + w
+        else:
+            pdf.x = pdf.l_margin if ln == 1 else x
+            pdf.y = y + h
+
+    def text_cells(self, xs, ys, w, h, texts, links=None, align=""):
+        # Link rects clipped to the row, as in FPDFAdapter.text_cells
+        link_h = min(self.measure.pdf.font_size, h)
+        for i, text in enumerate(texts):
+            link = links[i] if links is not None else None
+            self._text(xs[i], ys[i], w, h, text, link, align, link_h)
+        self.measure.set_xy(xs[-1] + w, ys[-1])
+
+    def _wrap(self, w, h, txt, align) -> List[str]:
+        pdf = self.measure.pdf
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, w, h, align, txt)
+        lines = self._wrapped.get(key)
+        if lines is None:
+            lines = self._wrapped[key] = self.measure.multi_cell(
+                w, h, txt, align=align, dry_run=True, output="LINES"
+            )
+        return lines
+
+    def multi_cell(
+        self, w, h, txt, border=0, align="J", fill=False, dry_run=False, output=""
+    ):
+        if dry_run:
+            if output == "LINES":
+                return list(self._wrap(w, h, txt, align))
+            return self.measure.multi_cell(
+                w, h, txt, align=align, dry_run=True, output=output
+            )
+        pdf = self.measure.pdf
+        x, y = pdf.x, pdf.y
+        lines = self._wrap(w, h, txt, align)
+        # Wrapped lines fill the block: one box per line, the block's width
+        cap = self.CAP_HEIGHT * pdf.font_size
+        for i, line in enumerate(lines):
+            if line:
+                baseline = y + (i + 0.5) * h + 0.3 * pdf.font_size
+                self._box("text", x, baseline - cap, w, cap, text=line)
+        pdf.set_xy(x, y + len(lines) * h)
+
+    # --- Blocks ---
+    def begin_shared(self):
+        pass
+
+    def end_shared(self):
+        return None
+
+    def use_shared(self, handle):
+        pass
+
+    def shared_block(self, key, draw):
+        return key
+
+    def replay(self, key, draw):
+        draw()
+
+    def clear_replays(self):
+        pass
+
+    # --- Output ---
+    def output(self, name):
+        raise ValueError("LayoutRecorder is headless: it has no PDF to write")
+
+    def output_bytes(self) -> bytes:
+        raise ValueError("LayoutRecorder is headless: it has no PDF to write")
@@ -0,0 +1,153 @@
+import re
+import zlib
+from pydantic import BaseModel
+from typing import Dict, List, Tuple
+
+# Objects per object stream: a reader inflates a whole stream to reach one
+OBJECTS_PER_STREAM = 100
+
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_SIZE = re.compile(rb"/Size\s+\d+")
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class PackReport(BaseModel):
+    original_bytes: int
+    packed_bytes: int
+    packed: int  # objects moved into object streams
+    kept: int  # stream objects written as they were
+    object_streams: int
+
+
+# --- SECTION B: PURE LOGIC ---
+def xref_stream_rows(
+    entries: Dict[int, Tuple[int, int, int]], size: int
+) -> bytes:
+    """
+    Cross-reference stream rows with /W [1 4 2]: (1, offset, 0) for an object
+    in the file, (2, object stream, index) for one packed into a stream,
+    free entries for the numbers in between.
+    """
+    rows = bytearray()
+    for n in range(size):
+        kind, a, b = entries.get(n, (0, 0, 65535 if n == 0 else 0))
+        rows += kind.to_bytes(1, "big")
+        rows += a.to_bytes(4, "big") + b.to_bytes(2, "big")
+    return bytes(rows)
+
+
+# --- SECTION C: WORKFLOW ---
+def _startxref(data: bytes) -> int:
+    pos = data.rfind(b"startxref", max(0, len(data) - 1024))
+    if pos < 0:
+        raise ValueError("No startxref: not a PDF, or truncated")
+    return int(data[pos + 9 :].split()[0])
+
+
+class ObjectStreamPacker:
+    """
+    Rewrites a PDF with a classic xref table (fpdf2's output) so that every
+    object without a stream (page dicts with their inline link annotations,
+    resource dicts, fonts' dicts, the catalog) sits in a compressed object
+    stream, and the xref table becomes a compressed xref stream (PDF 1.5).
+    Content streams, font files and forms are copied byte for byte.
+
+    Page dicts are most of a journal file once the page content is
+    compressed and shared, and they repeat the same keys and link
+    annotations page after page, so they deflate well. Encrypted files and
+    files already using xref streams are returned unchanged.
+    """
+
+    def process(self, data: bytes) -> Tuple[bytes, PackReport]:
+        xref_at = _startxref(data)
+        if not data.startswith(b"xref", xref_at):
+            return data, self._report(data, data, 0, 0, 0)
+        trailer_at = data.index(b"trailer", xref_at)
+        trailer_end = data.index(b"startxref", trailer_at)
+        trailer = data[trailer_at + 7 : trailer_end].strip()
+        if b"/Encrypt" in trailer or b"/Prev" in trailer:
+            return data, self._report(data, data, 0, 0, 0)
+
+        offsets = {}
+        lines = data[xref_at + 4 : trailer_at].split(b"\n")
+        first = 0
+        for line in lines:
+            line = line.strip()
+            entry = _XREF_ENTRY.match(line)
+            if entry is None:
+                if line:
+                    first = int(line.split()[0])
+                continue
+            if entry.group(3) == b"n":
+                offsets[first] = int(entry.group(1))
+            first += 1
+
+        order = sorted(offsets, key=offsets.get)
+        ends = [offsets[n] for n in order[1:]] + [xref_at]
+        header = data[: offsets[order[0]]]
+        if header[:8] in (b"%PDF-1.3", b"%PDF-1.4"):
+            header = b"%PDF-1.5" + header[8:]
+
+        out = bytearray(header)
+        entries: Dict[int, Tuple[int, int, int]] = {}
+        packed: List[Tuple[int, bytes]] = []
+        for n, end in zip(order, ends):
+            chunk = data[offsets[n] : end].rstrip()
+            prefix = b"%d 0 obj" % n
+            if not chunk.startswith(prefix) or not chunk.endswith(b"endobj"):
+                raise ValueError(f"Object {n} is not where the xref table puts it")
+            if chunk.endswith(b"endstream\nendobj"):
+                entries[n] = (1, len(out), 0)
+                out += chunk + b"\n"
+            else:
+                packed.append((n, chunk[len(prefix) : -6].strip()))
+
+        next_id = max(offsets) + 1
+        streams = 0
+        for start in range(0, len(packed), OBJECTS_PER_STREAM):
+            group = packed[start : start + OBJECTS_PER_STREAM]
+            stream_id = next_id
+            next_id += 1
+            index = []
+            bodies = bytearray()
+            for i, (n, body) in enumerate(group):
+                index.append(b"%d %d" % (n, len(bodies)))
+                bodies += body + b"\n"
+                entries[n] = (2, stream_id, i)
+            head = b" ".join(index) + b"\n"
+            content = zlib.compress(head + bytes(bodies), 9)
+            entries[stream_id] = (1, len(out), 0)
+            out += (
+                b"%d 0 obj\n<</Type /ObjStm /N %d /First %d /Filter /FlateDecode"
+                b" /Length %d>>\nstream\n"
+                % (stream_id, len(group), len(head), len(content))
+                + content
+                + b"\nendstream\nendobj\n"
+            )
+            streams += 1
+
+        xref_id = next_id
+        entries[xref_id] = (1, len(out), 0)
+        rows = zlib.compress(xref_stream_rows(entries, xref_id + 1), 9)
+        rest = _SIZE.sub(b"", trailer.strip()[2:-2]).strip()
+        xref_start = len(out)
+        out += (
+            b"%d 0 obj\n<</Type /XRef /Size %d /W [1 4 2] %s /Filter /FlateDecode"
+            b" /Length %d>>\nstream\n" % (xref_id, xref_id + 1, rest, len(rows))
+            + rows
+            + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref_start
+        )
+        packed_data = bytes(out)
+        return packed_data, self._report(
+            data, packed_data, len(packed), len(offsets) - len(packed), streams
+        )
+
+    @staticmethod
+    def _report(data, packed_data, packed, kept, streams) -> PackReport:
+        return PackReport(
+            original_bytes=len(data),
+            packed_bytes=len(packed_data),
+            packed=packed,
+            kept=kept,
+            object_streams=streams,
+        )
@@ -1,14 +1,381 @@
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set
+from fontTools.ttLib import TTFont
 from fpdf import FPDF
+from fpdf.annotations import AnnotationDict
+from fpdf.enums import PDFResourceType, TextMode, XPos, YPos
+from fpdf.fonts import CoreFont
+from fpdf.output import OutputProducer, _dimensions_to_mediabox
+from fpdf.syntax import Name, PDFArray, PDFContentStream, PDFObject
+from fpdf.syntax import create_dictionary_string as pdf_dict
+from fpdf.util import escape_parens
+from src.diagnostics.link_lint import LinkLinter, LinkLintInput, LinkLintReport
+from src.diagnostics.tracer import span
+from src.infrastructure.content_dedup import ContentDedupReport, RepeatedContentFinder
 from src.infrastructure.interfaces import PDFInterface
+from src.infrastructure.object_streams import ObjectStreamPacker
+
+
+# FPDF.cell's deprecated `ln` values as (new_x, new_y)
+_LN_POSITIONS = {
+    0: (XPos.RIGHT, YPos.TOP),
+    1: (XPos.LMARGIN, YPos.NEXT),
+    2: (XPos.LEFT, YPos.NEXT),
+}
+
+
+def _ttf_char_widths(fname, fallback, encoding):
+    """
+    Advance widths of a TTF in 1/1000 em, keyed like a core font's `cw` table:
+    by the single-byte code (as a latin-1 char) the text is encoded to.
+    """
+    font = TTFont(fname, lazy=True)
+    cmap = font.getBestCmap()
+    hmtx = font["hmtx"]
+    scale = 1000 / font["head"].unitsPerEm
+    widths = dict(fallback)
+    for code in range(256):
+        try:
+            char = bytes([code]).decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        glyph = cmap.get(ord(char))
+        if glyph is not None:
+            widths[chr(code)] = round(hmtx[glyph][0] * scale)
+    font.close()
+    return widths
+
+
+class _SharedResources:
+    """
+    Resource dictionary of a recorded block. fpdf2 fills in form XObject
+    resources through this hook once fonts and images have object ids.
+    """
+
+    def __init__(self, resources):
+        self.resources = resources
+
+    def get_resource_dictionary(self, gfx, patterns, shadings, fonts, images):
+        parts = []
+        font_ids = sorted(i for t, i in self.resources if t == PDFResourceType.FONT)
+        if font_ids:
+            refs = "".join(f"/F{i} {fonts[i].id} 0 R" for i in font_ids)
+            parts.append(f"/Font<<{refs}>>")
+        xobject_ids = sorted(
+            i for t, i in self.resources if t == PDFResourceType.X_OBJECT
+        )
+        if xobject_ids:
+            refs = "".join(f"/I{i} {images[i].id} 0 R" for i in xobject_ids)
+            parts.append(f"/XObject<<{refs}>>")
+        return "<<" + "".join(parts) + ">>"
+
+
+class _PendingStream(PDFContentStream):
+    """
+    A compressed page stream still being deflated on the output thread pool.
+    It takes its object id in page order right away; the bytes are collected
+    when the stream is serialized, by which time the pool has usually moved on.
+    """
+
+    def __init__(self, future):
+        super().__init__(contents=b"")
+        self.filter = Name("FlateDecode")
+        self._future = future
+
+    def _resolve(self):
+        if self._future is not None:
+            self._contents = self._future.result()
+            self.length = len(self._contents)
+            self._future = None
+
+    def content_stream(self):
+        self._resolve()
+        return self._contents
+
+    def serialize(self, obj_dict=None, _security_handler=None):
+        self._resolve()
+        return super().serialize(obj_dict, _security_handler)
+
+
+# AnnotationDict fields a plain internal link leaves unset
+_LINK_UNSET = (
+    "a",
+    "c",
+    "contents",
+    "d_a",
+    "f_s",
+    "f_t",
+    "ink_list",
+    "m",
+    "name",
+    "p",
+    "quad_points",
+    "t",
+    "v",
+)
+
+
+def _annotation_string(annot, security_handler, obj_id):
+    """
+    `AnnotationDict.serialize()` for the internal links that make up most of
+    a journal page dict, without its `dir()` walk; same bytes. Anything else
+    goes through fpdf2.
+    """
+    dest = annot.dest
+    if (
+        security_handler is None
+        and type(annot) is AnnotationDict
+        and hasattr(dest, "page_ref")
+        and all(getattr(annot, key) is None for key in _LINK_UNSET)
+    ):
+        return (
+            f"<</Border {annot.border}\n/Dest {dest.serialize()}\n/F {int(annot.f)}"
+            f"\n/Rect {annot.rect}\n/Subtype {annot.subtype.serialize()}"
+            f"\n/Type {annot.type.serialize()}>>"
+        )
+    return annot.serialize(_security_handler=security_handler, _obj_id=obj_id)
+
+
+class _SharedLink(PDFObject):
+    """
+    A link annotation on several pages (see FPDFAdapter.link_areas), written
+    once as an indirect object that each page's /Annots array references.
+    """
+
+    def __init__(self, annot, strings):
+        super().__init__()
+        self.annot = annot
+        self.strings = strings
+
+    def serialize(self, obj_dict=None, _security_handler=None):
+        string = self.strings.get(id(self.annot))
+        if string is None:
+            string = _annotation_string(self.annot, None, None)
+            self.strings[id(self.annot)] = string
+        return f"{self.id} 0 obj\n{string}\nendobj"
+
+
+class _LinkArray(PDFArray):
+    def __init__(self, annots, strings, refs):
+        super().__init__(annots)
+        # id(annot) -> serialized, for one output: pages can share annotations
+        # (see FPDFAdapter.link_areas) and their destinations are fixed by then
+        self.strings = strings
+        # id(annot) -> object id of the shared ones
+        self.refs = refs
+
+    def serialize(self, _security_handler=None, _obj_id=None):
+        if _security_handler is not None:
+            return (
+                "["
+                + "\n".join(
+                    _annotation_string(annot, _security_handler, _obj_id)
+                    for annot in self
+                )
+                + "]"
+            )
+        strings = self.strings
+        refs = self.refs
+        parts = []
+        for annot in self:
+            ref = refs.get(id(annot))
+            if ref is not None:
+                parts.append(f"{ref} 0 R")
+                continue
+            string = strings.get(id(annot))
+            if string is None:
+                string = strings[id(annot)] = _annotation_string(annot, None, None)
+            parts.append(string)
+        return "[" + "\n".join(parts) + "]"
+
+
+class _ReusableOutputProducer(OutputProducer):
+    """
+    fpdf2 swaps every page's raw contents for its compressed stream while
+    serializing, which closes the document. This producer puts the raw bytes
+    back afterwards and keeps the compressed streams, so the next output only
+    compresses the pages that were redrawn in between.
+
+    Only page streams go to the thread pool: zlib releases the GIL, so with
+    more than one core they deflate while the main thread subsets fonts and
+    serializes. Subsetting itself is serial (fontTools holds the GIL).
+    Each stage is a tracer span inside output.finalize, whose self time is
+    the serialization: output.pages, output.compress (one per page, on the
+    pool threads) and output.resources (font subsetting and images).
+    """
+
+    def __init__(self, fpdf, streams, level=-1, threads=1, object_streams=False):
+        super().__init__(fpdf)
+        # page index -> (raw contents, zlib level, PDFContentStream)
+        self.streams = streams
+        self.level = level
+        self.threads = threads
+        self.object_streams = object_streams
+        self.pool = None
+
+    def _deflate(self, index, raw):
+        with span("output.compress", page=index):
+            return zlib.compress(raw, self.level)
+
+    def _content_stream(self, index, raw):
+        if not self.fpdf.compress:
+            return PDFContentStream(contents=raw)
+        if self.threads <= 1:
+            stream = PDFContentStream(contents=b"")
+            stream.filter = Name("FlateDecode")
+            stream._contents = self._deflate(index, raw)
+            stream.length = len(stream._contents)
+            return stream
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(self.threads, "pdf-output")
+        return _PendingStream(self.pool.submit(self._deflate, index, raw))
+
+    def _add_pages(self, _slice=slice(0, None)):
+        # Same as OutputProducer._add_pages, with the content streams cached
+        fpdf = self.fpdf
+        self.raw_contents = {}
+        self.raw_annots = {}
+        annot_strings = {}
+        annot_refs = {}
+        page_objs = []
+        with span("output.pages"):
+            pages = list(self._iter_pages_in_order())[_slice]
+            # Annotations on more than one page become one indirect object
+            # each; encrypted strings are keyed to their object, so not then
+            seen, shared = set(), set()
+            if fpdf._security_handler is None:
+                for page_obj in pages:
+                    for annot in page_obj.annots:
+                        key = id(annot)
+                        if key in seen:
+                            shared.add(key)
+                        else:
+                            seen.add(key)
+            for page_obj in pages:
+                if fpdf.pdf_version > "1.3" and fpdf.allow_images_transparency:
+                    page_obj.group = pdf_dict(
+                        {"/Type": "/Group", "/S": "/Transparency", "/CS": "/DeviceRGB"},
+                        field_join=" ",
+                    )
+                if page_obj.dimensions() != fpdf.default_page_dimensions:
+                    page_obj.media_box = _dimensions_to_mediabox(
+                        page_obj.dimensions()
+                    )
+                self._add_pdf_obj(page_obj, "pages")
+                page_objs.append(page_obj)
+
+                index = page_obj.index()
+                raw = page_obj.contents
+                cached = self.streams.get(index)
+                if cached is None or cached[0] is not raw or cached[1] != self.level:
+                    cached = (raw, self.level, self._content_stream(index, raw))
+                    self.streams[index] = cached
+                self.raw_contents[index] = raw
+                self._add_pdf_obj(cached[2], "pages")
+                page_obj.contents = cached[2]
+
+                self.raw_annots[index] = page_obj.annots
+                if page_obj.annots:
+                    for annot in page_obj.annots:
+                        key = id(annot)
+                        if key in shared and key not in annot_refs:
+                            annot_refs[key] = self._add_pdf_obj(
+                                _SharedLink(annot, annot_strings), "pages"
+                            )
+                    page_obj.annots = _LinkArray(
+                        page_obj.annots, annot_strings, annot_refs
+                    )
+        return page_objs
+
+    def _insert_resources(self, page_objs):
+        with span("output.resources"):
+            super()._insert_resources(page_objs)
+
+    def bufferize(self):
+        # fpdf2 flags a form XObject once it has an object id and skips it on
+        # later outputs, which would leave pages pointing at other objects
+        for _, xobject in self.fpdf._resource_catalog.form_xobjects:
+            xobject._registered = False
+        try:
+            with span("output.finalize"):
+                buffer = super().bufferize()
+            if self.object_streams and self.fpdf.compress:
+                with span("output.object_streams"):
+                    buffer, _ = ObjectStreamPacker().process(bytes(buffer))
+            return buffer
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            for page_obj in self.fpdf.pages.values():
+                page_obj.contents = self.raw_contents[page_obj.index()]
+                page_obj.annots = self.raw_annots[page_obj.index()]
 
 
 class FPDFAdapter(PDFInterface):
-    def __init__(self, orientation="P", unit="pt", format=(1620, 2160)):
+    def __init__(
+        self,
+        orientation="P",
+        unit="pt",
+        format=(1620, 2160),
+        draft=False,
+        compress_level=-1,
+        output_threads=None,
+        object_streams=False,
+    ):
         self.pdf = FPDF(orientation=orientation, unit=unit, format=format)
         self.pdf.set_auto_page_break(False)
+        # Draft: uncompressed streams, core fonts instead of embedded subsets
+        self.draft = draft
+        if draft:
+            self.pdf.set_compression(False)
+            # Core fonts are declared WinAnsiEncoding: covers curly quotes & co.
+            self.pdf.core_fonts_encoding = "windows-1252"
+        # (family, style, size_pt, text) -> (escaped glyph string, width in user units)
+        self._glyph_runs = {}
+        self.glyph_hits = 0
+        self.glyph_misses = 0
+        self._shared_start = None
+        self._shared_state = None
+        self._shared_blocks = {}  # key -> handle, see shared_block()
+        # zlib level (-1: zlib's default, 6) and deflate threads for page
+        # streams; None means one thread per CPU
+        self.compress_level = compress_level
+        self.output_threads = output_threads
+        # Pack page dicts, annotations and resources into compressed object
+        # streams on output (PDF 1.5, see ObjectStreamPacker). bujo.update
+        # appends to classic xref tables, so only for files it won't patch
+        self.object_streams = object_streams
+        # page index -> (raw contents, level, compressed stream), see output_bytes()
+        self._streams = {}
+        # page index -> graphics state add_page() started from, see redraw_page()
+        self._page_states = {}
+        # (key, state before) -> (bytes, resources, state after), see replay()
+        self._replays = {}
+        self.replay_hits = 0
+        # (areas, links) -> link annotations, see link_areas()
+        self._link_batches = {}
+        # Result of the last hoist_repeated_content() pass
+        self.dedup_report = None
+        self.link_report = None
+
+    _PAGE_STATE = (
+        "font_family",
+        "font_style",
+        "font_size_pt",
+        "current_font",
+        "underline",
+        "line_width",
+        "draw_color",
+        "fill_color",
+        "text_color",
+    )
 
     def add_page(self):
-        self.pdf.add_page()
+        pdf = self.pdf
+        self._page_states[pdf.page + 1] = [getattr(pdf, a) for a in self._PAGE_STATE]
+        pdf.add_page()
 
     def set_fill_color(self, r, g=None, b=None):
         if g is None:
@@ -43,14 +410,75 @@ class FPDFAdapter(PDFInterface):
     def line(self, x1, y1, x2, y2):
         self.pdf.line(x1, y1, x2, y2)
 
+    def fill_rects(self, rects):
+        # One path of `re` subpaths and a single fill, instead of `re f` per rect
+        if not rects:
+            return
+        pdf = self.pdf
+        k, h = pdf.k, pdf.h
+        pdf._out(
+            "\n".join(
+                f"{x * k:.2f} {(h - y) * k:.2f} {w * k:.2f} {-rh * k:.2f} re"
+                for x, y, w, rh in rects
+            )
+            + "\nf"
+        )
+
+    def stroke_segments(self, segments):
+        # One path of `m l` subpaths and a single stroke, instead of `m l S` each
+        if not segments:
+            return
+        pdf = self.pdf
+        k, h = pdf.k, pdf.h
+        pdf._out(
+            "\n".join(
+                f"{x1 * k:.2f} {(h - y1) * k:.2f} m {x2 * k:.2f} {(h - y2) * k:.2f} l"
+                for x1, y1, x2, y2 in segments
+            )
+            + "\nS"
+        )
+
     def circle(self, x, y, r, style=""):
         self.pdf.ellipse(x - r, y - r, 2 * r, 2 * r, style)
 
     def polygon(self, points, style=""):
         self.pdf.polygon(points, style=style)
 
+    def _producer(self, fpdf):
+        threads = self.output_threads or os.cpu_count() or 1
+        return _ReusableOutputProducer(
+            fpdf, self._streams, self.compress_level, threads, self.object_streams
+        )
+
     def output(self, name):
-        self.pdf.output(name)
+        self.pdf.output(name, output_producer_class=self._producer)
+
+    def output_bytes(self) -> bytes:
+        """
+        Serializes the document without closing it: pages can still be
+        redrawn afterwards, and unchanged pages reuse their compressed stream.
+        """
+        self.pdf.buffer = bytearray()
+        producer = self._producer(self.pdf)
+        try:
+            return bytes(producer.bufferize())
+        finally:
+            self.pdf.buffer = bytearray()
+
+    def redraw_page(self, page_no: int):
+        """Clear page `page_no` (1-based); the next add_page() draws it again."""
+        page = self.pdf.pages[page_no]
+        page.contents = bytearray()
+        page.annots = PDFArray()
+        # Drawing it again registers the XObjects it still uses
+        self.pdf._resource_catalog.resources_per_page.pop(
+            (page_no, PDFResourceType.X_OBJECT), None
+        )
+        # Start from the state the page was first drawn from, so an unchanged
+        # page redraws to the same bytes
+        for attr, value in zip(self._PAGE_STATE, self._page_states[page_no]):
+            setattr(self.pdf, attr, value)
+        self.pdf.page = page_no - 1
 
     def add_link(self):
         return self.pdf.add_link()
@@ -68,6 +496,28 @@ class FPDFAdapter(PDFInterface):
     def link(self, x, y, w, h, link):
         self.pdf.link(x, y, w, h, link)
 
+    def link_areas(self, areas, links):
+        # Annotations are never modified, so pages with the same areas and
+        # links share the objects; output writes each one once, by reference
+        key = (tuple(areas), tuple(links))
+        annots = self._link_batches.get(key)
+        if annots is None:
+            pdf = self.pdf
+            k = pdf.k
+            annots = self._link_batches[key] = [
+                AnnotationDict(
+                    "Link",
+                    x=x * k,
+                    y=pdf.h_pt - y * k,
+                    width=w * k,
+                    height=h * k,
+                    dest=pdf.links[link],
+                )
+                for (x, y, w, h), link in zip(areas, links)
+                if link is not None
+            ]
+        self.pdf.pages[self.pdf.page].annots.extend(annots)
+
     def set_font(self, family, style="", size=0):
         self.pdf.set_font(family, style, size)
 
@@ -75,7 +525,391 @@ class FPDFAdapter(PDFInterface):
         self.pdf.set_xy(x, y)
 
     def cell(self, w, h=0, txt="", border=0, ln=0, align="", fill=False, link=""):
-        self.pdf.cell(w, h, txt, border, ln, align, fill, link)
+        if border or fill or not txt or align not in ("", "L", "C", "R"):
+            self._fpdf_cell(w, h, txt, border, ln, align, fill, link)
+            return
+        pdf = self.pdf
+        if (
+            not pdf.font_family
+            or pdf.auto_page_break
+            or pdf.text_shaping
+            or pdf.underline
+            or pdf.strikethrough
+            or pdf.char_spacing
+            or pdf.font_stretching != 100
+            or pdf.text_mode != TextMode.FILL
+            or pdf._fallback_font_ids
+            or pdf._record_text_quad_points
+        ):
+            self._fpdf_cell(w, h, txt, border, ln, align, fill, link)
+            return
+
+        # Plain single-run cell: same operators and link rect as FPDF.cell, but the
+        # glyph encoding and width come from the run cache.
+        font = pdf.current_font
+        k = pdf.k
+        encoded, text_w = self._glyph_run(txt)
+        if w == 0:
+            w = pdf.w - pdf.r_margin - pdf.x
+        if align == "C":
+            dx = (w - text_w) / 2
+        elif align == "R":
+            dx = w - pdf.c_margin - text_w
+        else:
+            dx = pdf.c_margin
+
+        if not pdf.current_font_is_set_on_page:
+            pdf._out(pdf._set_font_for_page(font, pdf.font_size_pt))
+        x, y = pdf.x, pdf.y
+        text_op = (
+            f"BT {(x + dx) * k:.2f} "
+            f"{(pdf.h - y - 0.5 * h - 0.3 * pdf.font_size) * k:.2f} Td"
+        )
+        if pdf.text_color != pdf.fill_color:
+            color = pdf.text_color.serialize().lower()
+            pdf._out(f"q {text_op} {color} ({encoded}) Tj ET Q")
+        else:
+            pdf._out(f"{text_op} ({encoded}) Tj ET")
+        if link:
+            pdf.link(
+                x + dx, y + 0.5 * h - 0.5 * pdf.font_size, text_w, pdf.font_size, link
+            )
+
+        pdf._lasth = h or pdf.font_size
+        if ln == 0:
+            pdf.x = x + w
+        else:
+            pdf.x = pdf.l_margin if ln == 1 else x
+            pdf.y = y + h
+
+    def _fpdf_cell(self, w, h, txt, border, ln, align, fill, link):
+        # new_x/new_y rather than the deprecated ln, which warns on every call
+        new_x, new_y = _LN_POSITIONS[ln]
+        self.pdf.cell(
+            w, h, txt, border, align=align, fill=fill, link=link, new_x=new_x, new_y=new_y
+        )
+
+    def glyph_cache_summary(self) -> str:
+        lookups = self.glyph_hits + self.glyph_misses
+        rate = 100 * self.glyph_hits / lookups if lookups else 0.0
+        return (
+            f"Glyph run cache: {self.glyph_hits}/{lookups} hits ({rate:.1f}%), "
+            f"{len(self._glyph_runs)} distinct runs"
+        )
+
+    def text_cells(self, xs, ys, w, h, texts, links=None, align=""):
+        # One BT/ET text object with absolutely positioned runs, and one batch of
+        # link annotations, instead of a full cell() round trip per string.
+        # Text origins match FPDF.cell exactly. Link rects do too, except that
+        # they are clipped to the cell height so rows on a tight pitch don't
+        # share tap targets.
+        pdf = self.pdf
+        if not texts:
+            return
+        if not pdf.font_family:
+            raise ValueError("No font set, call set_font() before text_cells()")
+
+        font = pdf.current_font
+        k = pdf.k
+        page_h = pdf.h
+        size_pt = pdf.font_size_pt
+        font_size = pdf.font_size
+        c_margin = pdf.c_margin
+        baseline = 0.5 * h + 0.3 * font_size
+        link_h = min(font_size, h)
+
+        if not pdf.current_font_is_set_on_page:
+            pdf._out(pdf._set_font_for_page(font, size_pt))
+
+        runs = []
+        annots = []
+        for i, text in enumerate(texts):
+            encoded, text_w = self._glyph_run(text)
+            if align == "C":
+                dx = (w - text_w) / 2
+            elif align == "R":
+                dx = w - c_margin - text_w
+            else:
+                dx = c_margin
+            x = xs[i] + dx
+            y = ys[i]
+            runs.append(
+                f"1 0 0 1 {x * k:.2f} {(page_h - y - baseline) * k:.2f} Tm "
+                f"({encoded}) Tj"
+            )
+
+            link = links[i] if links is not None else None
+            if link:
+                annots.append(
+                    AnnotationDict(
+                        "Link",
+                        x=x * k,
+                        y=pdf.h_pt - (y + 0.5 * h - 0.5 * link_h) * k,
+                        width=text_w * k,
+                        height=link_h * k,
+                        dest=pdf.links[link],
+                    )
+                )
+
+        color_op = ""
+        if pdf.text_color != pdf.fill_color:
+            color_op = pdf.text_color.serialize().lower() + " "
+        pdf._out(f"q {color_op}BT {' '.join(runs)} ET Q")
+        pdf.pages[pdf.page].annots.extend(annots)
+        pdf.set_xy(xs[-1] + w, ys[-1])
+
+    def text_width(self, text) -> float:
+        """Width of `text` in the current font and size, through the run cache."""
+        return self._glyph_run(text)[1]
+
+    def _glyph_run(self, text):
+        """Escaped glyph string and width of `text` in the current font and size."""
+        pdf = self.pdf
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, text)
+        run = self._glyph_runs.get(key)
+        if run is not None:
+            self.glyph_hits += 1
+            return run
+        self.glyph_misses += 1
+        # Picking the glyphs also registers them in the font subset, so a cached
+        # run stays valid for the rest of the document.
+        font = pdf.current_font
+        text = pdf.normalize_text(text)
+        width = font.get_text_width(text, pdf.font_size_pt, None)[1] / pdf.k
+        run = (self._encode_text(font, text), width)
+        self._glyph_runs[key] = run
+        return run
+
+    @staticmethod
+    def _encode_text(font, text):
+        if font.type == "core":
+            return escape_parens(text)
+        subset = font.subset
+        mapped = "".join(chr(c) for c in map(subset.pick, map(ord, text)) if c)
+        return font.escape_text(mapped)
+
+    def begin_shared(self):
+        # Recording appends to the current page and is cut out again in
+        # end_shared(). The tracked graphics state is cleared so the block sets
+        # every colour, width and font it uses instead of inheriting them.
+        pdf = self.pdf
+        if self._shared_start is not None:
+            raise RuntimeError("begin_shared() called while already recording")
+        self._shared_start = len(pdf.pages[pdf.page].contents)
+        self._shared_state = (
+            pdf.draw_color,
+            pdf.fill_color,
+            pdf.text_color,
+            pdf.line_width,
+            pdf.current_font_is_set_on_page,
+        )
+        pdf.draw_color = pdf.fill_color = pdf.text_color = None
+        pdf.line_width = -1
+        pdf.current_font_is_set_on_page = False
+
+    def end_shared(self):
+        pdf = self.pdf
+        if self._shared_start is None:
+            raise RuntimeError("end_shared() called without begin_shared()")
+        contents = pdf.pages[pdf.page].contents
+        stream = bytes(contents[self._shared_start :])
+        del contents[self._shared_start :]
+        (
+            pdf.draw_color,
+            pdf.fill_color,
+            pdf.text_color,
+            pdf.line_width,
+            pdf.current_font_is_set_on_page,
+        ) = self._shared_state
+        self._shared_start = self._shared_state = None
+        return self._register_form(stream)
+
+    def _register_form(self, stream: bytes) -> int:
+        """A page-sized form XObject drawing `stream`; returns its handle."""
+        pdf = self.pdf
+        catalog = pdf._resource_catalog
+        xobject = PDFContentStream(contents=stream, compress=pdf.compress)
+        xobject._blend_group = _SharedResources(
+            catalog.scan_stream(stream.decode("latin-1"))
+        )
+        xobject._registered = False
+        xobject.type = Name("XObject")
+        xobject.subtype = Name("Form")
+        xobject.b_box = PDFArray([0, 0, pdf.w_pt, pdf.h_pt])
+        index = catalog.next_xobject_index
+        catalog.next_xobject_index += 1
+        catalog.form_xobjects.append((index, xobject))
+        return index
+
+    def link_table(self, only: Optional[Set[int]] = None):
+        """
+        Per page, the (x, y, w, h) of every link annotation in page units and
+        its destination page (None for URLs). Annotations shared between pages
+        (`link_areas`) are parsed once. Pages not in `only` (page numbers) are
+        left empty.
+        """
+        pdf = self.pdf
+        k, page_h = pdf.k, pdf.h_pt
+        parsed = {}
+        pages = []
+        for n in sorted(pdf.pages):
+            entries = []
+            if only is not None and n not in only:
+                pages.append(entries)
+                continue
+            for annot in pdf.pages[n].annots:
+                entry = parsed.get(id(annot))
+                if entry is None:
+                    x0, y0, x1, y1 = (float(v) for v in annot.rect[1:-1].split())
+                    dest = getattr(annot, "dest", None)
+                    entry = parsed[id(annot)] = (
+                        (x0 / k, (page_h - y1) / k, (x1 - x0) / k, (y1 - y0) / k),
+                        getattr(dest, "page_number", None),
+                    )
+                entries.append(entry)
+            pages.append(entries)
+        return pages
+
+    def link_targets(self) -> List[int]:
+        """The page each link id leads to, in id order (0: not set yet)."""
+        links = self.pdf.links
+        return [links[n].page_number for n in sorted(links)]
+
+    def lint_links(self, only: Optional[Set[int]] = None) -> LinkLintReport:
+        """
+        Checks the link areas drawn so far: overlaps, off-page, empty, dead.
+        With `only`, just those pages, e.g. the ones a watch mode redrew.
+        """
+        self.link_report = LinkLinter().process(
+            LinkLintInput(
+                width=self.pdf.w, height=self.pdf.h, pages=self.link_table(only)
+            )
+        )
+        return self.link_report
+
+    def hoist_repeated_content(self) -> ContentDedupReport:
+        """
+        Post-pass over the finished pages: operator runs that repeat across
+        pages move into shared form XObjects and the pages draw them with
+        `Do`. Works on any page kind without templates; run it after the last
+        page is drawn and before output.
+        """
+        pdf = self.pdf
+        numbers = sorted(pdf.pages)
+        before = [bytes(pdf.pages[n].contents) for n in numbers]
+        plan = RepeatedContentFinder().process(before)
+        handles = [self._register_form(form) for form in plan.forms]
+        catalog = pdf._resource_catalog
+        rewritten = 0
+        for n, pieces in zip(numbers, plan.pages):
+            if pieces is None:
+                continue
+            parts = []
+            for piece in pieces:
+                if isinstance(piece, int):
+                    parts.append(b"/I%d Do" % handles[piece])
+                    catalog.add(PDFResourceType.X_OBJECT, handles[piece], n)
+                else:
+                    parts.append(piece)
+            pdf.pages[n].contents = bytearray(b"".join(parts))
+            rewritten += 1
+        self.dedup_report = ContentDedupReport(
+            pages=len(numbers),
+            pages_rewritten=rewritten,
+            forms=len(plan.forms),
+            uses=plan.uses,
+            bytes_before=sum(map(len, before)),
+            bytes_after=sum(len(pdf.pages[n].contents) for n in numbers)
+            + sum(map(len, plan.forms)),
+        )
+        return self.dedup_report
+
+    def use_shared(self, handle):
+        pdf = self.pdf
+        pdf._out(f"/I{handle} Do")
+        pdf._resource_catalog.add(PDFResourceType.X_OBJECT, handle, pdf.page)
+
+    def prune_shared_blocks(self) -> int:
+        """
+        Drops the shared blocks no page draws any more, directly or through
+        another block, so they aren't written. After redrawn pages switched
+        to blocks recorded from new values, the old ones would stay in the
+        file. Returns how many were dropped.
+        """
+        catalog = self.pdf._resource_catalog
+        forms = dict(catalog.form_xobjects)
+        live = set()
+        for (_, kind), handles in catalog.resources_per_page.items():
+            if kind == PDFResourceType.X_OBJECT:
+                live.update(handles)
+        pending = list(live)
+        while pending:
+            resources = getattr(forms.get(pending.pop()), "_blend_group", None)
+            if not isinstance(resources, _SharedResources):
+                continue
+            for kind, handle in resources.resources:
+                if kind == PDFResourceType.X_OBJECT and handle not in live:
+                    live.add(handle)
+                    pending.append(handle)
+        dead = {h for h in self._shared_blocks.values() if h not in live}
+        if dead:
+            self._shared_blocks = {
+                key: h for key, h in self._shared_blocks.items() if h not in dead
+            }
+            catalog.form_xobjects = [
+                (h, xobject) for h, xobject in catalog.form_xobjects if h not in dead
+            ]
+        return len(dead)
+
+    def shared_block(self, key, draw):
+        handle = self._shared_blocks.get(key)
+        if handle is None:
+            self.begin_shared()
+            draw()
+            handle = self._shared_blocks[key] = self.end_shared()
+        return handle
+
+    _REPLAY_STATE = (
+        "draw_color",
+        "fill_color",
+        "text_color",
+        "line_width",
+        "font_family",
+        "font_style",
+        "font_size_pt",
+        "current_font",
+        "current_font_is_set_on_page",
+        "x",
+        "y",
+    )
+
+    def replay(self, key, draw):
+        pdf = self.pdf
+        before = tuple(getattr(pdf, a) for a in self._REPLAY_STATE)
+        recorded = self._replays.get((key, before))
+        page = pdf.pages[pdf.page]
+        if recorded is not None:
+            stream, resources, after = recorded
+            page.contents += stream
+            for resource_type, index in resources:
+                pdf._resource_catalog.add(resource_type, index, pdf.page)
+            for attr, value in zip(self._REPLAY_STATE, after):
+                setattr(pdf, attr, value)
+            self.replay_hits += 1
+            return
+        start = len(page.contents)
+        annots = len(page.annots)
+        draw()
+        if len(page.annots) != annots:
+            # Links live outside the content stream: this block can't be replayed
+            return
+        stream = bytes(page.contents[start:])
+        resources = pdf._resource_catalog.scan_stream(stream.decode("latin-1"))
+        after = tuple(getattr(pdf, a) for a in self._REPLAY_STATE)
+        self._replays[(key, before)] = (stream, resources, after)
+
+    def clear_replays(self):
+        self._replays.clear()
 
     def multi_cell(
         self, w, h, txt, border=0, align="J", fill=False, dry_run=False, output=""
@@ -84,9 +918,6 @@ class FPDFAdapter(PDFInterface):
             w, h, txt, border, align, fill, dry_run=dry_run, output=output
         )
 
-    def add_font(self, family, style, fname):
-        self.pdf.add_font(family, style, fname)
-
     def set_auto_page_break(self, auto, margin=0):
         self.pdf.set_auto_page_break(auto, margin)
 
@@ -114,4 +945,17 @@ class FPDFAdapter(PDFInterface):
         return self.pdf.page_no()
 
     def add_font(self, family, style="", fname="", uni=False):
+        if self.draft:
+            self._add_draft_font(family, style, fname)
+            return
         self.pdf.add_font(family, style, fname)
+
+    def _add_draft_font(self, family, style, fname):
+        # Helvetica glyphs measured with the TTF's advance widths: wrapping,
+        # alignment and link rects come out exactly as in the embedded build.
+        pdf = self.pdf
+        style = "".join(sorted(style.upper()))
+        font = CoreFont(len(pdf.fonts) + 1, "helvetica" + style, style)
+        font.cw = _ttf_char_widths(fname, font.cw, pdf.core_fonts_encoding)
+        font.fontkey = family.lower() + style
+        pdf.fonts[font.fontkey] = font
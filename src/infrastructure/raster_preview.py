@@ -0,0 +1,349 @@
+import math
+import struct
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+from src.infrastructure.layout_recorder import LayoutRecorder
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def encode_png(width: int, height: int, pixels: bytes, level: int = 6) -> bytes:
+    """8-bit RGB PNG, no row filters: zlib alone does well on flat wireframes."""
+    stride = width * 3
+    raw = bytearray((stride + 1) * height)  # filter byte 0 opens every row
+    for row in range(height):
+        start = row * (stride + 1) + 1
+        raw[start : start + stride] = pixels[row * stride : (row + 1) * stride]
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        _PNG_SIGNATURE
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(bytes(raw), level))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def decode_png(data: bytes) -> Tuple[int, int, bytearray]:
+    """(width, height, RGB pixels) of a PNG written by `encode_png`."""
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+    pos = len(_PNG_SIGNATURE)
+    header = None
+    compressed = []
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            compressed.append(body)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise ValueError("PNG has no IHDR chunk")
+    width, height, depth, color_type, _, _, interlace = header
+    if (depth, color_type, interlace) != (8, 2, 0):
+        raise ValueError("Only 8-bit RGB, non-interlaced previews can be read")
+    raw = zlib.decompress(b"".join(compressed))
+    stride = width * 3
+    pixels = bytearray(stride * height)
+    for row in range(height):
+        start = row * (stride + 1)
+        if raw[start] != 0:
+            raise ValueError("Row filters are not supported: not a preview PNG")
+        pixels[row * stride : (row + 1) * stride] = raw[start + 1 : start + 1 + stride]
+    return width, height, pixels
+
+
+class PixelCanvas:
+    """
+    An RGB image in a bytearray. Everything is drawn as horizontal spans,
+    each one slice assignment, so pages render at Python speed without
+    NumPy. Coordinates are pixels; spans cover the pixels whose centres
+    fall inside the shape.
+    """
+
+    def __init__(self, width: int, height: int, background=(255, 255, 255)):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(background) * (width * height))
+
+    def fill(self, x0: int, y0: int, x1: int, y1: int, color: bytes):
+        """Pixels [x0, x1) x [y0, y1), clipped to the image."""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        stride = self.width * 3
+        if x0 == 0 and x1 == self.width:
+            self.pixels[y0 * stride : y1 * stride] = color * (self.width * (y1 - y0))
+            return
+        span = color * (x1 - x0)
+        for start in range(y0 * stride + x0 * 3, y1 * stride, stride):
+            self.pixels[start : start + len(span)] = span
+
+    def fill_box(self, x: float, y: float, w: float, h: float, color: bytes):
+        """A box in pixel floats, at least one pixel each way."""
+        x0, y0 = round(x), round(y)
+        self.fill(x0, y0, max(round(x + w), x0 + 1), max(round(y + h), y0 + 1), color)
+
+    def outline_box(
+        self, x: float, y: float, w: float, h: float, t: int, color: bytes
+    ):
+        """Stroke of width `t` centred on the box edges."""
+        x0, y0, x1, y1 = round(x), round(y), round(x + w), round(y + h)
+        a, b = t // 2, t - t // 2
+        self.fill(x0 - a, y0 - a, x1 + b, y0 + b, color)
+        self.fill(x0 - a, y1 - a, x1 + b, y1 + b, color)
+        self.fill(x0 - a, y0 - a, x0 + b, y1 + b, color)
+        self.fill(x1 - a, y0 - a, x1 + b, y1 + b, color)
+
+    def fill_polygon(self, points: List[Tuple[float, float]], color: bytes):
+        """Even-odd scanline fill."""
+        ys = [p[1] for p in points]
+        edges = list(zip(points, points[1:] + points[:1]))
+        row0 = max(math.ceil(min(ys) - 0.5), 0)
+        row1 = min(math.floor(max(ys) - 0.5), self.height - 1)
+        for row in range(row0, row1 + 1):
+            yc = row + 0.5
+            crossings = sorted(
+                x1 + (yc - y1) * (x2 - x1) / (y2 - y1)
+                for (x1, y1), (x2, y2) in edges
+                if (y1 <= yc < y2) or (y2 <= yc < y1)
+            )
+            for xa, xb in zip(crossings[::2], crossings[1::2]):
+                self.fill(round(xa), row, round(xb), row + 1, color)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, t: int, color: bytes):
+        if x1 == x2 or y1 == y2:
+            half = t / 2
+            left, top = min(x1, x2) - half, min(y1, y2) - half
+            self.fill_box(left, top, abs(x2 - x1) + t, abs(y2 - y1) + t, color)
+            return
+        # A diagonal is a thin quad
+        length = math.hypot(x2 - x1, y2 - y1)
+        nx, ny = -(y2 - y1) / length * t / 2, (x2 - x1) / length * t / 2
+        self.fill_polygon(
+            [
+                (x1 + nx, y1 + ny),
+                (x2 + nx, y2 + ny),
+                (x2 - nx, y2 - ny),
+                (x1 - nx, y1 - ny),
+            ],
+            color,
+        )
+
+    def disc(self, cx: float, cy: float, r: float, color: bytes, inner: float = 0.0):
+        """Filled circle, or a ring when `inner` > 0."""
+        if r < 0.5:
+            self.fill_box(cx - 0.5, cy - 0.5, 1, 1, color)
+            return
+        row0, row1 = max(math.floor(cy - r), 0), min(math.ceil(cy + r), self.height)
+        for row in range(row0, row1):
+            dy = row + 0.5 - cy
+            if abs(dy) > r:
+                continue
+            half = math.sqrt(r * r - dy * dy)
+            x0, x1 = round(cx - half), round(cx + half)
+            if abs(dy) < inner:
+                gap = math.sqrt(inner * inner - dy * dy)
+                self.fill(x0, row, round(cx - gap), row + 1, color)
+                self.fill(round(cx + gap), row, x1, row + 1, color)
+            else:
+                self.fill(x0, row, max(x1, x0 + 1), row + 1, color)
+
+
+class RasterPreview(LayoutRecorder):
+    """
+    A PDFInterface that paints pages into `PixelCanvas` images instead of a
+    PDF, for quick visual checks: rects, lines, polygons, circles and grid
+    dots are drawn for real at `scale`, text cells as their measured boxes
+    (the recorder's boxes, tinted with the text colour) and link areas as
+    outlines painted over the page.
+
+    Shared blocks are recorded as paint operations once and replayed on
+    every page that uses them, like the PDF's form XObjects.
+    `finish_page()` returns the current image, or hands each finished page
+    to `on_page(page_no, canvas)` as `add_page()` moves on.
+    """
+
+    LINK_COLOR = (230, 0, 120)
+    TEXT_TINT = 0.5  # text box colour, from white (0) to the text colour (1)
+
+    def __init__(
+        self,
+        format=(1620, 2160),
+        scale: float = 0.5,
+        on_page: Optional[Callable[[int, PixelCanvas], None]] = None,
+    ):
+        super().__init__(format=format)
+        if scale <= 0:
+            raise ValueError(f"Preview scale must be positive, got {scale}")
+        self.scale = scale
+        self.on_page = on_page
+        self.canvas: Optional[PixelCanvas] = None
+        self._fill = bytes((0, 0, 0))
+        self._draw = bytes((0, 0, 0))
+        self._text_color = bytes((0, 0, 0))
+        self._line_px = 1
+        self._hot_zones: List[Tuple[float, float, float, float]] = []
+        self._blocks: Dict[object, List[Tuple[str, tuple]]] = {}
+        self._recording: Optional[List[Tuple[str, tuple]]] = None
+
+    # --- Pages and state ---
+    def add_page(self):
+        self.finish_page()
+        super().add_page()
+        self.canvas = PixelCanvas(
+            max(round(self.width * self.scale), 1),
+            max(round(self.height * self.scale), 1),
+        )
+
+    def finish_page(self) -> Optional[PixelCanvas]:
+        """Paints the link outlines and returns the page; None if none is open."""
+        canvas = self.canvas
+        if canvas is None:
+            return None
+        color = bytes(self.LINK_COLOR)
+        for x, y, w, h in self._hot_zones:
+            canvas.outline_box(x, y, w, h, 1, color)
+        self._hot_zones = []
+        self.canvas = None
+        if self.on_page is not None:
+            self.on_page(self.page, canvas)
+        return canvas
+
+    def redraw_page(self, page_no: int):
+        self.finish_page()
+        super().redraw_page(page_no)
+
+    @staticmethod
+    def _rgb(r, g, b) -> bytes:
+        if g is None:
+            g = b = r
+        return bytes((int(r), int(g), int(b)))
+
+    def set_fill_color(self, r, g=None, b=None):
+        self._fill = self._rgb(r, g, b)
+
+    def set_draw_color(self, r, g=None, b=None):
+        self._draw = self._rgb(r, g, b)
+
+    def set_text_color(self, r, g=None, b=None):
+        self._text_color = self._rgb(r, g, b)
+
+    def set_line_width(self, width):
+        self._line_px = max(1, round(width * self.scale))
+
+    # --- Painting ---
+    def _paint(self, op: str, *args):
+        # Inside a shared block: record for use_shared(), otherwise draw now
+        if self._recording is not None:
+            self._recording.append((op, args))
+        elif self.canvas is not None:
+            getattr(self.canvas, op)(*args)
+
+    def _style(self, style: str):
+        style = style.upper()
+        return "F" in style, "D" in style or "F" not in style
+
+    def rect(self, x, y, w, h, style=""):
+        s = self.scale
+        fill, stroke = self._style(style)
+        if fill:
+            self._paint("fill_box", x * s, y * s, w * s, h * s, self._fill)
+        if stroke:
+            self._paint(
+                "outline_box", x * s, y * s, w * s, h * s, self._line_px, self._draw
+            )
+
+    def line(self, x1, y1, x2, y2):
+        s = self.scale
+        self._paint("line", x1 * s, y1 * s, x2 * s, y2 * s, self._line_px, self._draw)
+
+    def circle(self, x, y, r, style=""):
+        s = self.scale
+        fill, stroke = self._style(style)
+        if fill:
+            self._paint("disc", x * s, y * s, r * s, self._fill)
+        if stroke:
+            half = self._line_px / 2
+            self._paint(
+                "disc", x * s, y * s, r * s + half, self._draw, max(r * s - half, 0)
+            )
+
+    def polygon(self, points, style=""):
+        s = self.scale
+        scaled = [(px * s, py * s) for px, py in points]
+        fill, stroke = self._style(style)
+        if fill:
+            self._paint("fill_polygon", scaled, self._fill)
+        if stroke:
+            for (x1, y1), (x2, y2) in zip(scaled, scaled[1:] + scaled[:1]):
+                self._paint("line", x1, y1, x2, y2, self._line_px, self._draw)
+
+    def fill_rects(self, rects):
+        s = self.scale
+        for x, y, w, h in rects:
+            self._paint("fill_box", x * s, y * s, w * s, h * s, self._fill)
+
+    def stroke_segments(self, segments):
+        s = self.scale
+        for x1, y1, x2, y2 in segments:
+            self._paint(
+                "line", x1 * s, y1 * s, x2 * s, y2 * s, self._line_px, self._draw
+            )
+
+    def _box(self, kind, x, y, w, h, **extra):
+        s = self.scale
+        if kind == "text":
+            tint = bytes(
+                round(255 - (255 - c) * self.TEXT_TINT) for c in self._text_color
+            )
+            self._paint("fill_box", x * s, y * s, w * s, h * s, tint)
+        elif kind == "link":
+            self._hot_zones.append((x * s, y * s, w * s, h * s))
+
+    # --- Blocks ---
+    def begin_shared(self):
+        self._recording = []
+
+    def end_shared(self):
+        handle = ("block", len(self._blocks))
+        self._blocks[handle] = self._recording
+        self._recording = None
+        return handle
+
+    def use_shared(self, handle):
+        if self.canvas is None:
+            return
+        for op, args in self._blocks[handle]:
+            getattr(self.canvas, op)(*args)
+
+    def shared_block(self, key, draw):
+        if key not in self._blocks:
+            self._recording = []
+            try:
+                draw()
+            finally:
+                self._blocks[key] = self._recording
+                self._recording = None
+        return key
+
+    # --- Output ---
+    def output(self, name):
+        raise ValueError("RasterPreview writes PNGs per page: use finish_page()")
+
+    def output_bytes(self) -> bytes:
+        raise ValueError("RasterPreview writes PNGs per page: use finish_page()")
@@ -0,0 +1,290 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from pydantic import BaseModel
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.infrastructure.raster_preview import PixelCanvas, decode_png, encode_png
+from src.workers.grid_styles import GridGeometry, Rect, Segment
+
+# reMarkable Paper Pro portrait page, in pixels
+DEVICE_SIZE = (1620, 2160)
+# templates.json icon, a glyph of the device's icon font
+_ICON_CODE = "\ue9fe"
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class TemplateLayer(BaseModel):
+    """Static shapes under the grid in one colour, e.g. a navigation rail."""
+
+    color: Tuple[int, int, int]
+    rects: List[Rect] = []
+    segments: List[Segment] = []
+    line_width: float = 1.0
+
+
+class TemplateInput(BaseModel):
+    """One static page background: paper, layers, grid and guide lines."""
+
+    name: str  # file stem, e.g. "bujo-daily"
+    label: str  # shown on the device, e.g. "Bujo Daily"
+    width: int
+    height: int
+    paper: Tuple[int, int, int]
+    color: Tuple[int, int, int]  # grid
+    line_width: float
+    geometry: GridGeometry
+    guides: List[Segment] = []  # e.g. the toolbar edge of the safe zone
+    layers: List[TemplateLayer] = []  # drawn between paper and grid
+
+
+class TemplateExport(BaseModel):
+    """What an export wrote: the slim PDF and which template each page uses."""
+
+    pdf: str  # file name, next to the templates
+    category: str
+    templates: List[str]  # names, in order of first use
+    pages: List[Optional[str]]  # template per page; None: page has no background
+
+
+# --- SECTION B: PURE LOGIC ---
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _hex(color: Tuple[int, int, int]) -> str:
+    return "#%02x%02x%02x" % tuple(color)
+
+
+class TemplateSvgLogic:
+    """
+    A template as SVG at device pixels: the paper, then per layer and for
+    the grid all rects as one filled path and all segments as one stroked
+    path, like the PDF draws them.
+    """
+
+    def process(self, data: TemplateInput) -> str:
+        w, h = _num(data.width), _num(data.height)
+        parts = [
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{w}" height="{h}" viewBox="0 0 {w} {h}">',
+            f'<rect width="{w}" height="{h}" fill="{_hex(data.paper)}"/>',
+        ]
+        for layer in data.layers:
+            parts += self._paths(layer.rects, [layer.segments], layer)
+        grid = TemplateLayer(color=data.color, line_width=data.line_width)
+        parts += self._paths(
+            data.geometry.rects, [data.geometry.segments, data.guides], grid
+        )
+        parts.append("</svg>")
+        return "\n".join(parts) + "\n"
+
+    def _paths(
+        self, rects: List[Rect], segment_runs: List[List[Segment]], style: TemplateLayer
+    ) -> List[str]:
+        paths = []
+        if rects:
+            d = "".join(
+                f"M{_num(x)} {_num(y)}h{_num(rw)}v{_num(rh)}h{_num(-rw)}z"
+                for x, y, rw, rh in rects
+            )
+            paths.append(f'<path fill="{_hex(style.color)}" d="{d}"/>')
+        for segments in segment_runs:
+            if not segments:
+                continue
+            d = "".join(
+                f"M{_num(x1)} {_num(y1)}L{_num(x2)} {_num(y2)}"
+                for x1, y1, x2, y2 in segments
+            )
+            paths.append(
+                f'<path fill="none" stroke="{_hex(style.color)}" '
+                f'stroke-width="{_num(style.line_width)}" d="{d}"/>'
+            )
+        return paths
+
+
+# --- SECTION C: WORKFLOW ---
+class TemplateCollector:
+    """
+    Collects page backgrounds while a document is drawn: workers with a
+    collector hand it their paper, grid and static layers (the planner's
+    rail) instead of drawing them. Pages with the same background share one
+    template.
+    """
+
+    def __init__(self, prefix: str, width: int, height: int, guides=()):
+        self.prefix = prefix
+        self.width = width
+        self.height = height
+        self.guides = list(guides)
+        self.templates: Dict[tuple, TemplateInput] = {}
+        self.pages: Dict[int, str] = {}  # page number -> template name
+
+    def add_page(
+        self,
+        page: int,
+        kind: str,
+        key: tuple,
+        geometry: GridGeometry,
+        paper: Tuple[int, int, int],
+        color: Tuple[int, int, int],
+        line_width: float,
+        layers: Sequence[TemplateLayer] = (),
+    ) -> str:
+        template = self.templates.get(key)
+        if template is None:
+            taken = {t.name for t in self.templates.values()}
+            name = f"{self.prefix}-{kind}"
+            n = 2
+            while name in taken:
+                name, n = f"{self.prefix}-{kind}-{n}", n + 1
+            template = self.templates[key] = TemplateInput(
+                name=name,
+                label=name.replace("-", " ").title(),
+                width=self.width,
+                height=self.height,
+                paper=tuple(paper),
+                color=tuple(color),
+                line_width=line_width,
+                geometry=geometry,
+                guides=self.guides,
+                layers=list(layers),
+            )
+        self.pages[page] = template.name
+        return template.name
+
+    def export(self, page_count: int, pdf_name: str, category: str) -> TemplateExport:
+        return TemplateExport(
+            pdf=pdf_name,
+            category=category,
+            templates=[t.name for t in self.templates.values()],
+            pages=[self.pages.get(page) for page in range(1, page_count + 1)],
+        )
+
+
+def render_template_png(data: TemplateInput) -> bytes:
+    canvas = PixelCanvas(data.width, data.height, background=data.paper)
+    for layer in data.layers:
+        _paint(canvas, layer.rects, layer.segments, layer.color, layer.line_width)
+    _paint(
+        canvas,
+        data.geometry.rects,
+        data.geometry.segments + data.guides,
+        data.color,
+        data.line_width,
+    )
+    return encode_png(data.width, data.height, canvas.pixels)
+
+
+def _paint(canvas: PixelCanvas, rects, segments, color, line_width):
+    color = bytes(color)
+    for x, y, w, h in rects:
+        canvas.fill_box(x, y, w, h, color)
+    t = max(1, round(line_width))
+    for x1, y1, x2, y2 in segments:
+        canvas.line(x1, y1, x2, y2, t, color)
+
+
+def write_templates(
+    templates: List[TemplateInput], export: TemplateExport, out_dir: str
+) -> List[str]:
+    """
+    Writes NAME.svg and NAME.png per template, a templates.json in the
+    device's format (to merge into /usr/share/remarkable/templates) and
+    pages.json mapping the slim PDF's pages to templates.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    svg = TemplateSvgLogic()
+    paths = []
+    for template in templates:
+        path = os.path.join(out_dir, template.name + ".svg")
+        with open(path, "w") as f:
+            f.write(svg.process(template))
+        paths.append(path)
+        path = os.path.join(out_dir, template.name + ".png")
+        with open(path, "wb") as f:
+            f.write(render_template_png(template))
+        paths.append(path)
+    manifest = {
+        "templates": [
+            {
+                "name": t.label,
+                "filename": t.name,
+                "iconCode": _ICON_CODE,
+                "categories": [export.category],
+                "landscape": t.width > t.height,
+            }
+            for t in templates
+        ]
+    }
+    for name, data in (
+        ("templates.json", manifest),
+        ("pages.json", export.model_dump()),
+    ):
+        path = os.path.join(out_dir, name)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        paths.append(path)
+    return paths
+
+
+def validate_export(out_dir: str, size: Tuple[int, int] = DEVICE_SIZE) -> List[str]:
+    """
+    Offline checks of an export directory; returns the problems found.
+    Every template needs a well-formed SVG and a readable PNG at the device
+    size, and every page of the slim PDF a known template.
+    """
+    problems = []
+    try:
+        with open(os.path.join(out_dir, "templates.json")) as f:
+            entries = json.load(f)["templates"]
+        with open(os.path.join(out_dir, "pages.json")) as f:
+            export = TemplateExport.model_validate(json.load(f))
+    except (OSError, ValueError, KeyError) as e:
+        return [f"Unreadable manifest: {e}"]
+
+    width, height = size
+    names = set()
+    for entry in entries:
+        name = entry.get("filename", "")
+        names.add(name)
+        for key in ("name", "filename", "iconCode", "categories"):
+            if key not in entry:
+                problems.append(f"templates.json entry {name!r} lacks {key!r}")
+        svg_path = os.path.join(out_dir, name + ".svg")
+        try:
+            root = ET.parse(svg_path).getroot()
+            if (root.get("width"), root.get("height")) != (str(width), str(height)):
+                problems.append(
+                    f"{name}.svg is {root.get('width')}x{root.get('height')}, "
+                    f"not {width}x{height}"
+                )
+        except (OSError, ET.ParseError) as e:
+            problems.append(f"{name}.svg: {e}")
+        try:
+            with open(os.path.join(out_dir, name + ".png"), "rb") as f:
+                png_w, png_h, _ = decode_png(f.read())
+            if (png_w, png_h) != (width, height):
+                problems.append(f"{name}.png is {png_w}x{png_h}, not {width}x{height}")
+        except (OSError, ValueError) as e:
+            problems.append(f"{name}.png: {e}")
+
+    for page, name in enumerate(export.pages, start=1):
+        if name is not None and name not in names:
+            problems.append(f"page {page} uses unknown template {name!r}")
+    pdf_path = os.path.join(out_dir, export.pdf)
+    if not os.path.exists(pdf_path):
+        problems.append(f"{export.pdf} is missing")
+    else:
+        try:
+            pages = len(PdfReader(pdf_path).pages)
+        except (OSError, PdfReadError) as e:
+            problems.append(f"{export.pdf}: {e}")
+            pages = len(export.pages)
+        if pages != len(export.pages):
+            problems.append(
+                f"{export.pdf} has {pages} pages, pages.json lists {len(export.pages)}"
+            )
+    return problems
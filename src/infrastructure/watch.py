@@ -0,0 +1,185 @@
+import ast
+import copy
+import importlib
+import inspect
+import os
+import tempfile
+import time
+from pydantic import BaseModel
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class RebuildReport(BaseModel):
+    paths: List[str]  # files whose change triggered the rebuild
+    changed_names: List[str]  # config constants with a new value
+    kinds: List[str]  # page kinds re-rendered
+    pages: int  # pages re-rendered
+    full: bool  # whole document rebuilt
+    seconds: float
+    link_issues: Optional[int] = None  # lint of the re-rendered pages; None: off
+
+
+# --- SECTION B: PURE LOGIC ---
+class ConfigDiff:
+    """Names of the constants whose value differs between two snapshots."""
+
+    def process(self, before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+        names = set(before) | set(after)
+        return sorted(
+            name
+            for name in names
+            if name not in before or name not in after or before[name] != after[name]
+        )
+
+
+def config_snapshot(module: ModuleType) -> Dict[str, Any]:
+    # Config modules hold UPPER_CASE constants; copy so later edits can't alias
+    return {
+        name: copy.deepcopy(value)
+        for name, value in vars(module).items()
+        if name.isupper() and not isinstance(value, ModuleType)
+    }
+
+
+def config_references(
+    modules: Iterable[ModuleType], alias: str = "config"
+) -> Set[str]:
+    """Every `config.NAME` read in the source of `modules`."""
+    names = set()
+    for module in modules:
+        tree = ast.parse(inspect.getsource(module))
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == alias
+            ):
+                names.add(node.attr)
+    return names
+
+
+# --- SECTION C: WORKFLOW ---
+def reload_config(module: ModuleType) -> List[str]:
+    """
+    Re-executes a config module in place and returns the changed names.
+    On a syntax or runtime error the previous values are put back and the
+    error is raised, so a half-saved file never reaches the workers.
+    """
+    before = config_snapshot(module)
+    try:
+        importlib.reload(module)
+    except Exception:
+        for name in set(config_snapshot(module)) - set(before):
+            delattr(module, name)
+        for name, value in before.items():
+            setattr(module, name, value)
+        raise
+    return ConfigDiff().process(before, config_snapshot(module))
+
+
+def atomic_write(path: str, data: bytes):
+    """Readers see either the old file or the new one, never a partial write."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=".tmp-", suffix=os.path.splitext(path)[1]
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class FileWatcher:
+    """
+    Polls modification times of files and directory trees. Polling keeps the
+    watch mode dependency-free and behaves the same on every platform.
+    """
+
+    def __init__(self, paths: Iterable[str], interval_s: float = 0.1):
+        self.paths = list(paths)
+        self.interval_s = interval_s
+        self._mtimes = self._scan()
+
+    def _scan(self) -> Dict[str, float]:
+        mtimes = {}
+        for path in self.paths:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    for name in files:
+                        self._stat(os.path.join(root, name), mtimes)
+            else:
+                self._stat(path, mtimes)
+        return mtimes
+
+    @staticmethod
+    def _stat(path: str, mtimes: Dict[str, float]):
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass  # missing or mid-save: picked up on a later scan
+
+    def poll(self) -> List[str]:
+        mtimes = self._scan()
+        changed = sorted(
+            path
+            for path in set(mtimes) | set(self._mtimes)
+            if mtimes.get(path) != self._mtimes.get(path)
+        )
+        self._mtimes = mtimes
+        return changed
+
+    def wait(self) -> List[str]:
+        """Blocks until something changed and the burst of writes settled."""
+        while True:
+            changed = self.poll()
+            if changed:
+                break
+            time.sleep(self.interval_s)
+        while True:
+            time.sleep(self.interval_s)
+            more = self.poll()
+            if not more:
+                return changed
+            changed = sorted(set(changed) | set(more))
+
+
+def watch_loop(
+    watcher: FileWatcher,
+    on_change: Callable[[List[str]], RebuildReport],
+    log: Callable[[str], None] = print,
+):
+    log(f"Watching {', '.join(watcher.paths)} (Ctrl-C to stop)")
+    try:
+        while True:
+            paths = watcher.wait()
+            try:
+                report = on_change(paths)
+            except Exception as e:
+                log(f"Rebuild failed, keeping the previous output: {e}")
+                continue
+            log(format_rebuild(report))
+    except KeyboardInterrupt:
+        log("Watch stopped")
+
+
+def format_rebuild(report: RebuildReport) -> str:
+    what = "full rebuild" if report.full else f"{report.pages} pages"
+    kinds = ""
+    if report.kinds and not report.full:
+        kinds = f" ({', '.join(report.kinds)})"
+    names = ""
+    if report.changed_names:
+        names = f"; changed: {', '.join(report.changed_names)}"
+    links = ""
+    if report.link_issues:
+        links = f"; {report.link_issues} link issues"
+    return f"{what}{kinds} in {report.seconds * 1000:.0f} ms{names}{links}"
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 
 class ToolbarSide(str, Enum):
@@ -9,6 +9,13 @@ class ToolbarSide(str, Enum):
     NONE = "none"
 
 
+class Region(BaseModel):
+    x: float
+    y: float
+    w: float
+    h: float
+
+
 class SafeZone(BaseModel):
     x: float
     y: float
@@ -58,3 +65,18 @@ class LayoutManager:
                 toolbar_width=0,
                 side=ToolbarSide.NONE,
             )
+
+    @staticmethod
+    def toolbar_regions(
+        safe_zone: SafeZone, canvas_width: float, canvas_height: float
+    ) -> List[Region]:
+        """The canvas strips outside the safe zone (where the toolbar sits)."""
+        regions = []
+        if safe_zone.x > 0:
+            regions.append(Region(x=0, y=0, w=safe_zone.x, h=canvas_height))
+        right = safe_zone.x + safe_zone.w
+        if right < canvas_width:
+            regions.append(
+                Region(x=right, y=0, w=canvas_width - right, h=canvas_height)
+            )
+        return regions
@@ -0,0 +1,235 @@
+import math
+from abc import ABC, abstractmethod
+from pydantic import BaseModel
+from typing import Callable, Dict, List, Optional, Tuple
+
+Rect = Tuple[float, float, float, float]  # x, y, w, h
+Segment = Tuple[float, float, float, float]  # x1, y1, x2, y2
+Box = Tuple[float, float, float, float]  # left, top, right, bottom
+
+
+# --- SECTION A: DATA CONTRACTS ---
+class GridGeometry(BaseModel):
+    """
+    Everything one grid style draws. Filled rects go out as a single path and
+    one `f`, segments as a single path and one `S`, whatever their number.
+    """
+
+    rects: List[Rect] = []
+    segments: List[Segment] = []
+
+
+# --- SECTION B: PURE LOGIC ---
+class GridStyle(ABC):
+    """
+    Geometry of one grid style over the coordinates `GridCalculator` laid out.
+    `xs` and `ys` are the grid columns and rows, `pitch` their spacing; styles
+    that are not square (isometric, hex) use the outer box and the pitch.
+    """
+
+    @abstractmethod
+    def geometry(
+        self, xs: List[float], ys: List[float], pitch: float, params: dict
+    ) -> GridGeometry:
+        pass
+
+
+GRID_STYLES: Dict[str, GridStyle] = {}
+
+
+def register_grid_style(name: str) -> Callable[[type], type]:
+    def register(cls: type) -> type:
+        GRID_STYLES[name] = cls()
+        return cls
+
+    return register
+
+
+def get_grid_style(name: str) -> GridStyle:
+    try:
+        return GRID_STYLES[name]
+    except KeyError:
+        known = ", ".join(sorted(GRID_STYLES))
+        raise ValueError(f"Unknown grid style {name!r}; known: {known}") from None
+
+
+def _box(xs: List[float], ys: List[float]) -> Box:
+    return xs[0], ys[0], xs[-1], ys[-1]
+
+
+def _rows(xs: List[float], ys: List[float]) -> List[Segment]:
+    left, _, right, _ = _box(xs, ys)
+    return [(left, y, right, y) for y in ys]
+
+
+def _columns(xs: List[float], ys: List[float]) -> List[Segment]:
+    _, top, _, bottom = _box(xs, ys)
+    return [(x, top, x, bottom) for x in xs]
+
+
+def _inside(segment: Segment, box: Box) -> Optional[Tuple[float, float]]:
+    """Liang-Barsky: the parameter range [t0, t1] of a segment inside a box."""
+    x1, y1, x2, y2 = segment
+    left, top, right, bottom = box
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in (
+        (-dx, x1 - left),
+        (dx, right - x1),
+        (-dy, y1 - top),
+        (dy, bottom - y1),
+    ):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return None
+    return t0, t1
+
+
+def _at(segment: Segment, t0: float, t1: float) -> Segment:
+    x1, y1, x2, y2 = segment
+    dx, dy = x2 - x1, y2 - y1
+    return x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy
+
+
+def clip_segment(segment: Segment, box: Box) -> Optional[Segment]:
+    """The part of a segment inside a box; None when nothing is left."""
+    inside = _inside(segment, box)
+    return None if inside is None else _at(segment, *inside)
+
+
+def subtract_regions(segments: List[Segment], boxes: List[Box]) -> List[Segment]:
+    """The parts of each segment outside every box (masked grid lines)."""
+    result = []
+    for segment in segments:
+        cuts = sorted(
+            t for t in (_inside(segment, box) for box in boxes) if t is not None
+        )
+        if not cuts:
+            result.append(segment)
+            continue
+        t = 0.0
+        for t0, t1 in cuts:
+            if t0 > t:
+                result.append(_at(segment, t, t0))
+            t = max(t, t1)
+        if t < 1.0:
+            result.append(_at(segment, t, 1.0))
+    return result
+
+
+@register_grid_style("dots")
+class DotStyle(GridStyle):
+    def geometry(self, xs, ys, pitch, params):
+        d = params["dot_size"]
+        rows = params.get("rows")  # per column, when part of the grid is masked
+        if rows is None:
+            return GridGeometry(
+                rects=[(x - d / 2, y - d / 2, d, d) for x in xs for y in ys]
+            )
+        return GridGeometry(
+            rects=[
+                (x - d / 2, ys[j] - d / 2, d, d)
+                for x, column in zip(xs, rows)
+                for j in column
+            ]
+        )
+
+
+@register_grid_style("lined")
+class LinedStyle(GridStyle):
+    def geometry(self, xs, ys, pitch, params):
+        return GridGeometry(segments=_rows(xs, ys))
+
+
+@register_grid_style("squared")
+class SquaredStyle(GridStyle):
+    def geometry(self, xs, ys, pitch, params):
+        return GridGeometry(segments=_rows(xs, ys) + _columns(xs, ys))
+
+
+@register_grid_style("cornell")
+class CornellStyle(GridStyle):
+    """
+    Ruled note area, a cue column on the left and an unruled summary area at
+    the bottom, both sized in grid cells.
+    """
+
+    def geometry(self, xs, ys, pitch, params):
+        if not xs or not ys:
+            return GridGeometry()  # too small for a single rule
+        left, top, right, bottom = _box(xs, ys)
+        summary_rows = min(params["cornell_summary_cells"], len(ys) - 1)
+        rules = ys[: len(ys) - summary_rows]
+        summary_y = rules[-1]
+        cue_x = xs[min(params["cornell_cue_cells"], len(xs) - 1)]
+        return GridGeometry(
+            segments=[(left, y, right, y) for y in rules]
+            + ([(cue_x, top, cue_x, summary_y)] if summary_y > top else [])
+        )
+
+
+@register_grid_style("isometric")
+class IsometricStyle(GridStyle):
+    """
+    Triangle grid: horizontal rows pitch * sqrt(3) / 2 apart and two families
+    of lines at +-60 degrees through the row points, clipped to the grid box.
+    """
+
+    def geometry(self, xs, ys, pitch, params):
+        box = left, top, right, bottom = _box(xs, ys)
+        row_h = pitch * math.sqrt(3) / 2
+        rows = int((bottom - top) // row_h)
+        segments = [
+            (left, top + j * row_h, right, top + j * row_h) for j in range(rows + 1)
+        ]
+
+        # A 60-degree line through (x, top) reaches the bottom run / sqrt(3) over
+        height = bottom - top
+        run = height / math.sqrt(3)
+        first = -math.ceil(run / pitch)
+        last = math.ceil((right - left) / pitch) + math.ceil(run / pitch)
+        for i in range(first, last + 1):
+            x = left + i * pitch
+            for candidate in ((x, top, x + run, bottom), (x, top, x - run, bottom)):
+                clipped = clip_segment(candidate, box)
+                if clipped is not None and clipped[1] != clipped[3]:
+                    segments.append(clipped)
+        return GridGeometry(segments=segments)
+
+
+@register_grid_style("hex")
+class HexStyle(GridStyle):
+    """
+    Pointy-top hexagons `pitch` wide, rows offset by half a cell. Edges shared
+    by two cells are emitted once; only cells fully inside the box are drawn.
+    """
+
+    def geometry(self, xs, ys, pitch, params):
+        left, top, right, bottom = _box(xs, ys)
+        side = pitch / math.sqrt(3)
+        corners = [
+            (side * math.cos(math.radians(a)), side * math.sin(math.radians(a)))
+            for a in range(30, 360, 60)
+        ]
+        edges = {}
+        row = 0
+        cy = top + side
+        while cy + side <= bottom:
+            offset = pitch / 2 if row % 2 else 0.0
+            cx = left + pitch / 2 + offset
+            while cx + pitch / 2 <= right:
+                points = [(round(cx + dx, 2), round(cy + dy, 2)) for dx, dy in corners]
+                for a, b in zip(points, points[1:] + points[:1]):
+                    edges.setdefault(tuple(sorted((a, b))), (a[0], a[1], b[0], b[1]))
+                cx += pitch
+            cy += 1.5 * side
+            row += 1
+        return GridGeometry(segments=list(edges.values()))
@@ -1,6 +1,9 @@
+from bisect import bisect_left, bisect_right
 from pydantic import BaseModel
 from src.infrastructure.interfaces import PDFInterface
-from typing import List
+from src.layout.layout_manager import Region
+from src.workers.grid_styles import GridGeometry, get_grid_style, subtract_regions
+from typing import Dict, List, Tuple
 
 
 # --- SECTION A: DATA CONTRACTS ---
@@ -13,6 +16,19 @@ class GridInput(BaseModel):
     align_mode: str = "CENTER"
     absolute_offset_x: int = 0
     absolute_offset_y: int = 0
+    # Draft builds draw a line every `guide_every` grid cells instead of dots
+    draft: bool = False
+    guide_every: int = 5
+    # A name registered in src.workers.grid_styles
+    style: str = "dots"
+    line_width: float = 1.0  # stroked styles
+    cornell_cue_cells: int = 6
+    cornell_summary_cells: int = 8
+    # Record the grid once as a form XObject instead of inline on every page
+    shared: bool = False
+    # Areas the page draws over (same coordinates as the grid): no dots or
+    # lines are drawn inside them
+    exclusions: List[Region] = []
 
 
 class GridOutput(BaseModel):
@@ -122,22 +138,142 @@ class GridCalculator:
             dot_size=data.dot_radius * 2,
         )
 
+    def guides(
+        self, x_coords: List[float], y_coords: List[float], every: int
+    ) -> List[Tuple[float, float, float, float]]:
+        """Sparse guide lines (x1, y1, x2, y2) over the grid, edges included."""
+        if not x_coords or not y_coords:
+            return []
+        xs = x_coords[::every]
+        if xs[-1] != x_coords[-1]:
+            xs.append(x_coords[-1])
+        ys = y_coords[::every]
+        if ys[-1] != y_coords[-1]:
+            ys.append(y_coords[-1])
+        top, bottom = y_coords[0], y_coords[-1]
+        left, right = x_coords[0], x_coords[-1]
+        return [(x, top, x, bottom) for x in xs] + [(left, y, right, y) for y in ys]
+
+    def visible_rows(
+        self, x_coords: List[float], y_coords: List[float], exclusions: List[Region]
+    ) -> List[List[int]]:
+        """
+        Per grid column, the row indices whose dot lies outside every exclusion.
+        Each region blocks a block of indices found by bisection and cleared as
+        a slice, so the cost grows with regions and columns, not with dots.
+        """
+        blocked: List[List[Tuple[int, int]]] = [[] for _ in x_coords]
+        for region in exclusions:
+            i0 = bisect_left(x_coords, region.x)
+            i1 = bisect_right(x_coords, region.x + region.w)
+            j0 = bisect_left(y_coords, region.y)
+            j1 = bisect_right(y_coords, region.y + region.h)
+            if j0 < j1:
+                for i in range(i0, i1):
+                    blocked[i].append((j0, j1))
+
+        all_rows = list(range(len(y_coords)))
+        rows = []
+        for spans in blocked:
+            if not spans:
+                rows.append(all_rows)
+                continue
+            keep = bytearray(b"\x01" * len(y_coords))
+            for j0, j1 in spans:
+                keep[j0:j1] = bytes(j1 - j0)
+            rows.append([j for j in all_rows if keep[j]])
+        return rows
+
 
 # --- SECTION C: WORKFLOW ---
 class GridWorker:
     def __init__(self, pdf: PDFInterface):
         self.pdf = pdf
         self.logic = GridCalculator()
+        # GridInput JSON -> geometry, masks included: one entry per page kind
+        self._geometry: Dict[str, GridGeometry] = {}
+        # Layout fields -> coordinates; masks don't move the dots, so every
+        # page of a document shares one entry
+        self._outputs: Dict[tuple, GridOutput] = {}
 
-    def draw_grid(self, data: GridInput, color_dots: tuple):
-        output = self.logic.calculate(data)
+    def calculate(self, data: GridInput) -> GridOutput:
+        """`GridCalculator.calculate`, once per distinct canvas and pitch."""
+        key = (
+            data.canvas_width,
+            data.canvas_height,
+            data.grid_size,
+            data.dot_radius,
+            data.align_mode,
+            data.absolute_offset_x,
+            data.absolute_offset_y,
+        )
+        output = self._outputs.get(key)
+        if output is None:
+            output = self._outputs[key] = self.logic.calculate(data)
+        return output
 
-        self.pdf.set_fill_color(*color_dots)
-        d = output.dot_size
+    def draw_grid(self, data: GridInput, color_dots: tuple):
+        output = self.calculate(data)
+        if not output.x_coords or not output.y_coords:
+            return output
+        # Every page with the same grid gets the same bytes: draw them once
+        key = ("grid", data.model_dump_json(), tuple(color_dots))
 
-        for x in output.x_coords:
-            for y in output.y_coords:
-                # Center the dot on the coordinate
-                self.pdf.rect(x - d / 2, y - d / 2, d, d, "F")
+        def draw():
+            self._draw_style(data, output, color_dots)
 
+        if data.shared:
+            self.pdf.use_shared(self.pdf.shared_block(key, draw))
+        else:
+            self.pdf.replay(key, draw)
         return output
+
+    def _draw_style(self, data: GridInput, output: GridOutput, color: tuple):
+        if data.draft:
+            self.draw_guides(output.x_coords, output.y_coords, data.guide_every, color)
+            return
+
+        geometry = self.geometry(data, output)
+        if geometry.rects:
+            self.pdf.set_fill_color(*color)
+            self.pdf.fill_rects(geometry.rects)
+        if geometry.segments:
+            self.pdf.set_draw_color(*color)
+            self.pdf.set_line_width(data.line_width)
+            self.pdf.stroke_segments(geometry.segments)
+
+    def geometry(self, data: GridInput, output: GridOutput) -> GridGeometry:
+        key = data.model_dump_json()
+        geometry = self._geometry.get(key)
+        if geometry is not None:
+            return geometry
+        params = {
+            "dot_size": output.dot_size,
+            "cornell_cue_cells": data.cornell_cue_cells,
+            "cornell_summary_cells": data.cornell_summary_cells,
+        }
+        if data.exclusions:
+            params["rows"] = self.logic.visible_rows(
+                output.x_coords, output.y_coords, data.exclusions
+            )
+        geometry = get_grid_style(data.style).geometry(
+            output.x_coords, output.y_coords, data.grid_size, params
+        )
+        if data.exclusions and geometry.segments:
+            boxes = [(r.x, r.y, r.x + r.w, r.y + r.h) for r in data.exclusions]
+            geometry.segments = subtract_regions(geometry.segments, boxes)
+        self._geometry[key] = geometry
+        return geometry
+
+    def draw_guides(
+        self, x_coords: List[float], y_coords: List[float], every: int, color: tuple
+    ):
+        # Hairline fills rather than strokes: leaves draw colour and line width alone
+        self.pdf.set_fill_color(*color)
+        t = 0.5
+        self.pdf.fill_rects(
+            [
+                (x1 - t / 2, y1 - t / 2, x2 - x1 + t, y2 - y1 + t)
+                for x1, y1, x2, y2 in self.logic.guides(x_coords, y_coords, every)
+            ]
+        )